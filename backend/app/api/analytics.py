@@ -0,0 +1,46 @@
+"""
+API endpoints for analytics across sessions.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+
+from app.models.analytics import SeasonAnalytics
+from app.services.analytics_service import get_season_analytics
+from app.utils.worker_affinity import local_worker
+
+router = APIRouter()
+
+
+@router.get("/season", response_model=SeasonAnalytics)
+async def season_analytics(
+    session_ids: Optional[List[str]] = Query(None, description="Sessions to include (default: all)"),
+    include_live: bool = Query(True, description="Include live in-memory sessions"),
+    include_archived: bool = Query(True, description="Include archived session snapshots")
+) -> SeasonAnalytics:
+    """
+    Get hot zones and team statistics aggregated over several sessions.
+
+    Unlike the other endpoints this one is not bound to X-Session-ID. In
+    multi-worker mode live sessions are spread over the worker processes,
+    so only archived sessions can be aggregated (include_live=false).
+
+    Args:
+        session_ids: Optional list of session IDs
+        include_live: Include live in-memory sessions
+        include_archived: Include archived session snapshots
+
+    Returns:
+        SeasonAnalytics: Merged aggregates
+    """
+    if include_live and local_worker() is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="Live sessions are spread over workers in multi-worker mode; use include_live=false"
+        )
+    try:
+        return await run_in_threadpool(
+            get_season_analytics, session_ids, include_live, include_archived
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Sessions not found: {', '.join(e.args[0])}")
@@ -1,19 +1,34 @@
 """
 API endpoints for event management.
 """
-from fastapi import APIRouter, HTTPException, Header
-from typing import Optional, List
-from app.models.event import EventCreate, EventResponse, EventStats
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response
+from typing import Literal, Optional, List
+from app.models.event import EventCreate, EventResponse, EventStats, EventDelta
 from app.services.event_service import (
-    create_event,
-    get_events,
+    ingest_event,
+    get_events_json,
+    get_events_page_json,
+    decode_page_cursor,
+    parse_event_fields,
+    EVENT_FIELDS,
     delete_event,
     get_event_stats,
-    clear_session
+    get_event_changes,
+    clear_session,
+    resolve_time_window
 )
+from app.services.index_service import FILTER_SYNTAX, parse_event_filter
+from app.services.materializer_service import get_materialized
 
 router = APIRouter()
 
+# Page size when a cursor is sent without a limit
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 def get_session_id(x_session_id: Optional[str] = Header(None, alias="X-Session-ID")) -> str:
     """
@@ -28,38 +43,114 @@ def get_session_id(x_session_id: Optional[str] = Header(None, alias="X-Session-I
     return x_session_id or "default"
 
 
-@router.post("", response_model=EventResponse, status_code=201)
+@router.post(
+    "",
+    response_model=EventResponse,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": EventCreate.model_json_schema()}}
+        }
+    }
+)
 async def create_event_endpoint(
-    event: EventCreate,
+    request: Request,
     session_id: str = Header(..., alias="X-Session-ID")
 ):
     """
     Create a new event.
     
+    The EventCreate body is validated from the raw bytes straight into the
+    stored event (see event_service.ingest_event).
+    
     Args:
-        event: Event data to create
+        request: Request whose body is an EventCreate JSON object
         session_id: Session identifier from header
         
     Returns:
         EventResponse: Created event
     """
-    return create_event(session_id, event)
+    body = await request.body()
+    return Response(content=ingest_event(session_id, body), status_code=201, media_type="application/json")
 
 
 @router.get("", response_model=List[EventResponse])
 async def get_events_endpoint(
+    start_time: Optional[float] = Query(None, ge=0, description="Window start in seconds"),
+    end_time: Optional[float] = Query(None, ge=0, description="Window end in seconds (exclusive)"),
+    last_seconds: Optional[float] = Query(None, gt=0, description="Only events in the last N seconds of match time"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (enables pagination)"),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the previous page's {NEXT_CURSOR_HEADER} header"),
+    order: Literal["asc", "desc"] = Query("asc", description="Match time order (ties by event ID)"),
+    fields: str = Query("", description=f"Comma-separated fields to include ({', '.join(EVENT_FIELDS)}); id is always included"),
+    filter_: str = Query("", alias="filter", description=FILTER_SYNTAX),
     session_id: str = Header(..., alias="X-Session-ID")
 ):
     """
-    Get all events for a session.
+    Get events for a session sorted by match time, optionally within a time window.
+    
+    With a limit or cursor the response is one page, by keyset on
+    (time_in_second, id); the next page's cursor is returned in the
+    X-Next-Cursor header, which is absent on the last page. Pages do not
+    shift when events are tagged or deleted between requests.
+    
+    A filter such as `team:Home,event_type:Shot|Corner` is resolved on the
+    session's bitmap index.
     
     Args:
+        start_time: Window start in seconds
+        end_time: Window end in seconds (exclusive)
+        last_seconds: Only events in the last N seconds of match time
+        limit: Page size
+        cursor: Cursor of the next page
+        order: 'asc' (kick-off first) or 'desc' (latest first)
+        fields: Fields to include (all if empty)
+        filter_: Filter on indexed fields
         session_id: Session identifier from header
         
     Returns:
-        List[EventResponse]: List of events
+        List[EventResponse]: List of events (only the selected fields)
     """
-    return get_events(session_id)
+    try:
+        selected = parse_event_fields(fields)
+        after = decode_page_cursor(cursor) if cursor else None
+        event_filter = parse_event_filter(filter_)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    start, end = resolve_time_window(session_id, start_time, end_time, last_seconds)
+    # Pre-encoded JSON; response_model is kept for the OpenAPI schema only
+    if limit is None and after is None and order == "asc" and selected is None and event_filter is None:
+        return Response(content=get_events_json(session_id, start, end), media_type="application/json")
+    
+    if limit is None and after is not None:
+        limit = DEFAULT_PAGE_SIZE
+    content, next_cursor = get_events_page_json(
+        session_id, after, limit, order == "desc", selected, start, end, event_filter
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else None
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router.get("/changes", response_model=EventDelta)
+async def get_event_changes_endpoint(
+    since: int = Query(0, ge=0, description="Cursor returned by the previous sync"),
+    epoch: Optional[str] = Query(None, max_length=64, description="Epoch returned with the cursor"),
+    session_id: str = Header(..., alias="X-Session-ID")
+):
+    """
+    Get event changes since a cursor.
+    
+    Args:
+        since: Cursor returned by the previous sync (0 for a full load)
+        epoch: Epoch returned with the cursor; a different one forces a reset
+        session_id: Session identifier from header
+        
+    Returns:
+        EventDelta: Appended events, deleted IDs, stats and the new cursor
+    """
+    return get_event_changes(session_id, since, epoch)
 
 
 @router.delete("/{event_id}", status_code=204)
@@ -85,18 +176,39 @@ async def delete_event_endpoint(
 
 @router.get("/stats", response_model=List[EventStats])
 async def get_event_stats_endpoint(
+    start_time: Optional[float] = Query(None, ge=0, description="Window start in seconds"),
+    end_time: Optional[float] = Query(None, ge=0, description="Window end in seconds (exclusive)"),
+    last_seconds: Optional[float] = Query(None, gt=0, description="Only events in the last N seconds of match time"),
+    filter_: str = Query("", alias="filter", description=FILTER_SYNTAX),
     session_id: str = Header(..., alias="X-Session-ID")
 ):
     """
-    Get event statistics per team.
+    Get event statistics per team, optionally within a time window.
+    
+    Whole-match stats are served from the background-materialized view when
+    it is current; filtered stats are counted on the session's bitmap index.
     
     Args:
+        start_time: Window start in seconds
+        end_time: Window end in seconds (exclusive)
+        last_seconds: Only events in the last N seconds of match time
+        filter_: Filter on indexed fields
         session_id: Session identifier from header
         
     Returns:
         List[EventStats]: Statistics for each team
     """
-    return get_event_stats(session_id)
+    try:
+        event_filter = parse_event_filter(filter_)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if start_time is None and end_time is None and last_seconds is None and event_filter is None:
+        materialized, payload = get_materialized(session_id, 'stats')
+        if materialized:
+            return Response(content=payload, media_type="application/json")
+    start, end = resolve_time_window(session_id, start_time, end_time, last_seconds)
+    return get_event_stats(session_id, start, end, event_filter)
 
 
 @router.delete("", status_code=204)
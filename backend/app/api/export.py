@@ -2,15 +2,28 @@
 API endpoints for data export.
 """
 from fastapi import APIRouter, Header, Response, HTTPException, Query
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 import pandas as pd
 
 from app.services.event_service import get_events_dataframe
+from app.services.state_manager import get_state_manager
+from app.services.snapshot_service import events_to_table
 from app.services.export_service import (
+    ARROW_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    PRECOMPRESSED_MEDIA_TYPES,
     export_to_csv,
     export_to_xml,
-    export_to_zip
+    export_to_zip,
+    export_to_arrow,
+    export_to_parquet,
+    iter_buffer
 )
+from app.services.export_job_service import ExportQueueFullError, get_export_queue
+from app.models.export import ExportJobRequest, ExportJobState, ExportJobStatus
+from app.utils.http_range import RangeNotSatisfiableError, iter_file, parse_range
+from app.utils.worker_affinity import owns_session
 
 router = APIRouter()
 
@@ -115,6 +128,256 @@ async def export_zip(
         content=zip_buffer.read(),
         media_type="application/zip",
         headers={
-            "Content-Disposition": f'attachment; filename="{file_name}.zip"'
+            "Content-Disposition": f'attachment; filename="{file_name}.zip"',
+            **_precompressed_headers("application/zip")
         }
     )
+
+
+def _get_event_table(session_id: str):
+    session_state = get_state_manager().get_session(session_id)
+    if session_state is None or not session_state.events:
+        raise HTTPException(
+            status_code=400,
+            detail="No events found for this session"
+        )
+    with session_state.lock:
+        events = list(session_state.events)
+    # Plain event table: the snapshot metadata (session ID, stopwatch) stays internal
+    return events_to_table(events)
+
+
+def _precompressed_headers(media_type: str) -> dict:
+    # GZipMiddleware passes responses with a Content-Encoding through untouched
+    if media_type in PRECOMPRESSED_MEDIA_TYPES:
+        return {"Content-Encoding": "identity"}
+    return {}
+
+
+def _stream_buffer(buffer, media_type: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        iter_buffer(buffer),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(buffer.size),
+            **_precompressed_headers(media_type)
+        }
+    )
+
+
+@router.post("/arrow")
+async def export_arrow(
+    session_id: str = Header(..., alias="X-Session-ID"),
+    filename: Optional[str] = Query(None, description="Optional filename for download")
+):
+    """
+    Export events as an Arrow IPC file with dictionary-encoded categories.
+    
+    Args:
+        session_id: Session identifier from header
+        filename: Optional filename for download
+        
+    Returns:
+        StreamingResponse: Arrow IPC file response
+    """
+    buffer = export_to_arrow(_get_event_table(session_id))
+    return _stream_buffer(buffer, ARROW_MEDIA_TYPE, filename or "events.arrow")
+
+
+@router.post("/parquet")
+async def export_parquet(
+    session_id: str = Header(..., alias="X-Session-ID"),
+    filename: Optional[str] = Query(None, description="Optional filename for download")
+):
+    """
+    Export events as a Parquet file with dictionary-encoded categories.
+    
+    Args:
+        session_id: Session identifier from header
+        filename: Optional filename for download
+        
+    Returns:
+        StreamingResponse: Parquet file response
+    """
+    buffer = export_to_parquet(_get_event_table(session_id))
+    return _stream_buffer(buffer, PARQUET_MEDIA_TYPE, filename or "events.parquet")
+
+
+def _require_export_queue():
+    export_queue = get_export_queue()
+    if export_queue is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Export queue is not running"
+        )
+    return export_queue
+
+
+def _get_job(job_id: str):
+    job = _require_export_queue().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Export job not found (it may have expired)"
+        )
+    return job
+
+
+@router.post("/jobs", response_model=ExportJobStatus, status_code=202)
+async def submit_export_job(
+    request: ExportJobRequest,
+    session_id: Optional[str] = Header(None, alias="X-Session-ID")
+) -> ExportJobStatus:
+    """
+    Queue an export to be built in the background.
+    
+    Poll GET /jobs/{job_id} for progress and download the result from its
+    download_url once the job is done. Several sessions (e.g. a whole
+    matchday) are bundled into one ZIP with a file per session.
+    
+    Args:
+        request: Format, sessions and filename
+        session_id: Session exported when request.session_ids is not set
+        
+    Returns:
+        ExportJobStatus: Queued job
+    """
+    export_queue = _require_export_queue()
+    session_ids = request.session_ids or ([session_id] if session_id else [])
+    if not session_ids:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide session_ids or the X-Session-ID header"
+        )
+    state_manager = get_state_manager()
+    # In multi-worker mode other workers' sessions are not in this process
+    foreign = [sid for sid in session_ids if not owns_session(sid)]
+    if foreign:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Sessions served by another worker: {', '.join(foreign)}; "
+                "in multi-worker mode submit one job per session with its X-Session-ID"
+            )
+        )
+    missing = [sid for sid in session_ids if state_manager.get_session(sid) is None]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Sessions not found: {', '.join(missing)}"
+        )
+    
+    try:
+        job = export_queue.submit(session_ids, request.format, request.filename)
+    except ExportQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return job.to_status()
+
+
+@router.get("/jobs", response_model=List[ExportJobStatus])
+async def list_export_jobs() -> List[ExportJobStatus]:
+    """
+    List export jobs whose results have not expired.
+    
+    In multi-worker mode only the jobs of the worker serving X-Session-ID
+    are listed.
+    
+    Returns:
+        List[ExportJobStatus]: Jobs, oldest first
+    """
+    return [job.to_status() for job in _require_export_queue().list_jobs()]
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobStatus)
+async def get_export_job(job_id: str) -> ExportJobStatus:
+    """
+    Get an export job's status and progress.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        ExportJobStatus: Current status
+    """
+    return _get_job(job_id).to_status()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_export_job(job_id: str):
+    """
+    Cancel an export job, or delete its result.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        dict: Success message
+    """
+    if not _require_export_queue().cancel(job_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Export job not found (it may have expired)"
+        )
+    return {"message": "Export job cancelled"}
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(
+    job_id: str,
+    range_header: Optional[str] = Header(None, alias="Range")
+):
+    """
+    Download a finished export, honouring a single byte range.
+    
+    Args:
+        job_id: Job identifier
+        range_header: Optional Range header (e.g. bytes=1048576-) to resume
+        
+    Returns:
+        StreamingResponse: Whole result (200) or the requested range (206)
+    """
+    job = _get_job(job_id)
+    if job.state != ExportJobState.DONE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Export job is {job.state.value}"
+        )
+    
+    size = job.size
+    headers = {
+        "Content-Disposition": f'attachment; filename="{job.filename}"',
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{job.job_id}"',
+        **_precompressed_headers(job.media_type)
+    }
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiableError:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    
+    # Opened now: the sweeper deleting the result at expiry cannot cut the download
+    try:
+        chunks = iter_file(job.path, start, end)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail="Export result not found (it may have expired)"
+        )
+    return StreamingResponse(
+        chunks,
+        status_code=status_code,
+        media_type=job.media_type,
+        headers=headers
+    )
@@ -0,0 +1,66 @@
+"""
+API endpoints for data import.
+"""
+from fastapi import APIRouter, File, Header, HTTPException, Query, UploadFile
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional
+
+from app.models.event import Team
+from app.services.import_service import import_events, parse_csv, parse_xml
+
+router = APIRouter()
+
+
+async def _load(session_id: str, parse, replace: bool) -> Dict[str, Any]:
+    try:
+        df = await run_in_threadpool(parse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if df.empty:
+        raise HTTPException(status_code=400, detail="No events found in file")
+
+    imported = await run_in_threadpool(import_events, session_id, df, replace)
+    return {"session_id": session_id, "imported": imported, "replaced": replace}
+
+
+@router.post("/csv")
+async def import_csv(
+    file: UploadFile = File(..., description="CSV export"),
+    replace: bool = Query(False, description="Replace the session's events instead of appending"),
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
+    """
+    Import events from a CSV export.
+    
+    Args:
+        file: Uploaded CSV file
+        replace: Replace the session's events instead of appending
+        session_id: Session identifier from header
+        
+    Returns:
+        dict: Number of imported events
+    """
+    return await _load(session_id, lambda: parse_csv(file.file), replace)
+
+
+@router.post("/xml")
+async def import_xml(
+    file: UploadFile = File(..., description="LiveTagPRO XML export"),
+    team: Optional[Team] = Query(None, description="Team for instances without a Team label"),
+    replace: bool = Query(False, description="Replace the session's events instead of appending"),
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
+    """
+    Import events from a LiveTagPRO XML export.
+    
+    Args:
+        file: Uploaded XML file
+        team: Team for instances without a Team label
+        replace: Replace the session's events instead of appending
+        session_id: Session identifier from header
+        
+    Returns:
+        dict: Number of imported events
+    """
+    default_team = team.value if team else None
+    return await _load(session_id, lambda: parse_xml(file.file, default_team), replace)
@@ -0,0 +1,172 @@
+"""
+API endpoints for session snapshots and archives.
+"""
+import os
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from typing import List, Dict, Any
+
+from app.models.session import SessionOverview
+from app.services.state_manager import get_state_manager
+from app.services.session_service import OVERVIEW_FIELDS, get_session_overview_json, parse_fields
+from app.services.snapshot_service import (
+    SNAPSHOT_MEDIA_TYPE,
+    session_to_table,
+    table_to_bytes,
+    table_from_bytes,
+    save_snapshot,
+    load_snapshot,
+    restore_session,
+    get_archive_dir,
+    archive_path,
+    list_archived_sessions
+)
+
+router = APIRouter()
+
+
+def _require_archive_dir() -> str:
+    directory = get_archive_dir()
+    if not directory:
+        raise HTTPException(
+            status_code=503,
+            detail="Session archive is not configured (set EVENT_TAGGER_ARCHIVE_DIR)"
+        )
+    return directory
+
+
+@router.get("/state", response_model=SessionOverview, response_model_exclude_none=True)
+async def get_session_state(
+    fields: str = Query(
+        "",
+        description=f"Comma-separated parts to include ({', '.join(OVERVIEW_FIELDS)}); all if empty"
+    ),
+    session_id: str = Header(..., alias="X-Session-ID")
+):
+    """
+    Get events, stats, stopwatch status and hot zones in one request.
+
+    All parts are read under one acquisition of the session lock, so they
+    are consistent with each other. The version can be used as the cursor
+    for GET /api/events/changes.
+
+    Args:
+        fields: Comma-separated parts to include (all if empty)
+        session_id: Session identifier from header
+
+    Returns:
+        SessionOverview: Selected parts of the session state
+    """
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Pre-encoded JSON; response_model is kept for the OpenAPI schema only
+    return Response(content=get_session_overview_json(session_id, selected), media_type="application/json")
+
+
+@router.get("/snapshot")
+async def download_snapshot(
+    session_id: str = Header(..., alias="X-Session-ID")
+):
+    """
+    Download a snapshot of the whole session as an Arrow IPC file.
+
+    Args:
+        session_id: Session identifier from header
+
+    Returns:
+        Response: Arrow IPC file
+    """
+    session_state = get_state_manager().get_session(session_id)
+    if session_state is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    content = table_to_bytes(session_to_table(session_state))
+    return Response(
+        content=content,
+        media_type=SNAPSHOT_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{session_id}.arrow"'
+        }
+    )
+
+
+@router.post("/restore")
+async def upload_snapshot(
+    request: Request,
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
+    """
+    Replace the session's state with an uploaded Arrow snapshot.
+
+    Args:
+        request: Request whose body is an Arrow IPC file
+        session_id: Session identifier from header
+
+    Returns:
+        dict: Restored session summary
+    """
+    try:
+        table = table_from_bytes(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    session_state = restore_session(table, session_id)
+    return {"session_id": session_id, "events": len(session_state.events)}
+
+
+@router.post("/archive")
+async def archive_session(
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
+    """
+    Save the session to the server-side archive.
+
+    Args:
+        session_id: Session identifier from header
+
+    Returns:
+        dict: Archived session summary
+    """
+    directory = _require_archive_dir()
+    session_state = get_state_manager().get_session(session_id)
+    if session_state is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    path = archive_path(directory, session_id)
+    n_events = save_snapshot(session_state, path)
+    return {"session_id": session_id, "events": n_events, "size_bytes": os.path.getsize(path)}
+
+
+@router.get("/archive")
+async def list_archive() -> List[Dict[str, Any]]:
+    """
+    List archived sessions.
+
+    Returns:
+        List[dict]: Archived session IDs with size and archive time
+    """
+    return list_archived_sessions(_require_archive_dir())
+
+
+@router.post("/archive/{archived_session_id}/restore")
+async def restore_archived_session(
+    archived_session_id: str,
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
+    """
+    Load an archived session into the current session.
+
+    Args:
+        archived_session_id: Session ID of the archive to load
+        session_id: Target session identifier from header
+
+    Returns:
+        dict: Restored session summary
+    """
+    path = archive_path(_require_archive_dir(), archived_session_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Archived session not found")
+
+    session_state = restore_session(load_snapshot(path), session_id)
+    return {"session_id": session_id, "events": len(session_state.events)}
@@ -1,8 +1,9 @@
 """
 API endpoints for stopwatch functionality.
 """
-from fastapi import APIRouter, Header
-from app.models.session import StopwatchStatus
+from typing import Optional
+from fastapi import APIRouter, Header, Query
+from app.models.session import Period, StopwatchStatus
 from app.services.stopwatch_service import (
     start_stopwatch as start_stopwatch_service,
     stop_stopwatch as stop_stopwatch_service,
@@ -16,18 +17,20 @@ router = APIRouter()
 
 @router.post("/start", response_model=StopwatchStatus)
 async def start_stopwatch(
+    period: Optional[Period] = Query(None, description="Period to start; a new period restarts the clock at its kick-off time"),
     session_id: str = Header(..., alias="X-Session-ID")
 ):
     """
     Start the stopwatch for a session.
     
     Args:
+        period: Period to start (keeps the current one if omitted)
         session_id: Session identifier from header
         
     Returns:
         StopwatchStatus: Updated stopwatch status
     """
-    return start_stopwatch_service(session_id)
+    return start_stopwatch_service(session_id, period)
 
 
 @router.post("/stop", response_model=StopwatchStatus)
@@ -1,89 +1,126 @@
 """
 API endpoints for visualization generation.
 """
-from fastapi import APIRouter, Header, HTTPException
-from typing import Dict, Any, Optional
-import pandas as pd
+import re
+
+from fastapi import APIRouter, Header, HTTPException, Response, Query
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Any, Literal, Optional
 
 from app.services.event_service import (
-    get_events_dataframe,
-    get_hot_zone
+    get_hot_zone,
+    resolve_time_window
+)
+from app.services.index_service import FILTER_SYNTAX, parse_event_filter
+from app.utils.data_viz import plot_pitch, plot_pitch_areas
+from app.utils.momentum_chart import make_momentum_chart_plotly
+from app.services.timeseries_service import get_momentum
+from app.services.materializer_service import get_materialized, is_default_heatmap
+from app.services.visualization_service import (
+    get_divergent_chart,
+    get_heatmap,
+    get_pitch_summary,
+    get_pitch_template
 )
-from app.utils.data_viz import plot_pitch, plot_pitch_areas, create_grid
-from app.utils.divergent_chart import make_divergent_chart_plotly
+from app.services.render_service import (
+    IMAGE_FORMATS,
+    RenderUnavailableError,
+    build_heatmap_spec,
+    get_cached_image,
+    render
+)
+from app.models.render import PizzaRenderRequest, RadarRenderRequest
 
 
 router = APIRouter()
 
 
-def _prepare_stats_dataframe(session_id: str) -> pd.DataFrame:
+@router.post("/divergent-chart")
+async def generate_divergent_chart(
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
     """
-    Prepare statistics DataFrame for divergent chart.
+    Generate divergent bar chart comparing teams.
+    
+    Served from the background-materialized chart when it is current;
+    otherwise concurrent requests for the same session version share one
+    computation.
     
     Args:
-        session_id: Session identifier
+        session_id: Session identifier from header
         
     Returns:
-        pd.DataFrame: DataFrame with team, variable, value, fraction columns
-    """
-    df = get_events_dataframe(session_id)
-    
-    if df.empty:
-        return pd.DataFrame(columns=['team', 'variable', 'value', 'fraction'])
-    
-    # Calculate stats per team
-    stats = {}
-    for team in df['team'].unique():
-        team_df = df.loc[df['team'] == team, :]
-        stats[team] = {
-            'Goal': team_df['shot_outcome'].isin(['Goal']).sum(),
-            'Shots': len(team_df.loc[team_df['shot_outcome'] != 'None']),
-            'SoT': team_df['shot_outcome'].isin(['Goal', 'Save', 'Post']).sum(),
-            'CrossAtt': len(team_df.loc[team_df['cross_outcome'] != 'None']),
-            'CrossCmpl': len(team_df[team_df['cross_outcome'] == 'Completed']),
-            'Transitions': len(team_df[team_df['event_type'] == 'Transition'])
-        }
-    
-    # Convert to DataFrame
-    stats_df = pd.DataFrame(stats).T.reset_index(names=['team'])
-    stats_df = stats_df.melt(id_vars=['team'], var_name='variable', value_name='value')
-    
-    # Calculate fractions
-    total_by_variable = stats_df.groupby('variable')['value'].sum()
-    stats_df = stats_df.merge(
-        total_by_variable.rename('total'),
-        left_on='variable',
-        right_index=True
-    )
-    stats_df['fraction'] = stats_df['value'] / stats_df['total']
-    stats_df = stats_df.drop(columns=['total'])
+        dict: Plotly figure dictionary (JSON-serializable)
+    """
+    materialized, payload = get_materialized(session_id, 'divergent_chart')
+    if materialized:
+        if payload is None:
+            raise HTTPException(
+                status_code=400,
+                detail="No events found for this session"
+            )
+        return Response(content=payload, media_type="application/json")
+    
+    chart_dict = await run_in_threadpool(get_divergent_chart, session_id)
+    
+    if chart_dict is None:
+        raise HTTPException(
+            status_code=400,
+            detail="No events found for this session"
+        )
     
-    return stats_df
+    return chart_dict
 
 
-@router.post("/divergent-chart")
-async def generate_divergent_chart(
+@router.get("/momentum")
+async def get_momentum_data(
+    window_minutes: int = Query(5, ge=1, le=45, description="Window length in minutes"),
+    rolling_windows: int = Query(3, ge=1, description="Windows per rolling sum"),
+    alpha: float = Query(0.3, gt=0, le=1, description="Momentum smoothing factor"),
     session_id: str = Header(..., alias="X-Session-ID")
 ) -> Dict[str, Any]:
     """
-    Generate divergent bar chart comparing teams.
+    Get per-team shots, crosses and transitions per time window with rolling
+    sums and exponentially weighted momentum.
+    
+    Args:
+        window_minutes: Window length in minutes
+        rolling_windows: Number of windows in each rolling sum
+        alpha: EWM smoothing factor for the momentum line
+        session_id: Session identifier from header
+        
+    Returns:
+        dict: Window start minutes, per-team series and net momentum
+    """
+    return get_momentum(session_id, window_minutes, rolling_windows, alpha)
+
+
+@router.post("/momentum-chart")
+async def generate_momentum_chart(
+    window_minutes: int = Query(5, ge=1, le=45, description="Window length in minutes"),
+    alpha: float = Query(0.3, gt=0, le=1, description="Momentum smoothing factor"),
+    session_id: str = Header(..., alias="X-Session-ID")
+) -> Dict[str, Any]:
+    """
+    Generate momentum chart comparing teams over time.
     
     Args:
+        window_minutes: Window length in minutes
+        alpha: EWM smoothing factor for the momentum line
         session_id: Session identifier from header
         
     Returns:
         dict: Plotly figure dictionary (JSON-serializable)
     """
-    df = _prepare_stats_dataframe(session_id)
+    momentum = get_momentum(session_id, window_minutes, alpha=alpha)
     
-    if df.empty:
+    if not momentum['teams']:
         raise HTTPException(
             status_code=400,
             detail="No events found for this session"
         )
     
-    chart_dict = make_divergent_chart_plotly(df)
-    return chart_dict
+    return make_momentum_chart_plotly(momentum)
 
 
 @router.post("/heatmap")
@@ -93,53 +130,70 @@ async def generate_heatmap(
     field_length: float = 120,
     field_width: float = 80,
     event_type: Optional[str] = None,
+    start_time: Optional[float] = Query(None, ge=0, description="Window start in seconds"),
+    end_time: Optional[float] = Query(None, ge=0, description="Window end in seconds (exclusive)"),
+    last_seconds: Optional[float] = Query(None, gt=0, description="Only events in the last N seconds of match time"),
+    filter_: str = Query("", alias="filter", description=FILTER_SYNTAX),
     session_id: str = Header(..., alias="X-Session-ID")
 ) -> Dict[str, Any]:
     """
     Generate heatmap visualization of events on pitch.
     
+    The default grid over the whole match is served from the
+    background-materialized heatmap when it is current. Otherwise,
+    concurrent requests with the same parameters and session version share
+    one computation.
+    
     Args:
         rows: Number of rows in the grid
         columns: Number of columns in the grid
         field_length: Field length in meters
         field_width: Field width in meters
         event_type: Optional event type filter (e.g., 'Transition', 'Corner', etc.)
+        start_time: Window start in seconds
+        end_time: Window end in seconds (exclusive)
+        last_seconds: Only events in the last N seconds of match time
+        filter_: Filter on indexed fields (e.g. 'team:Home,event_type:Shot')
         session_id: Session identifier from header
         
     Returns:
         dict: Plotly figure dictionary (JSON-serializable)
     """
+    try:
+        event_filter = parse_event_filter(filter_)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         field_dimen = (field_length, field_width)
         
-        # Get hot zone data, optionally filtered by event type
-        hot_zone = get_hot_zone(session_id, event_type=event_type)
+        whole_match = (
+            event_type is None and start_time is None and end_time is None
+            and last_seconds is None and event_filter is None
+        )
+        if whole_match and is_default_heatmap(rows, columns, field_length, field_width):
+            materialized, payload = get_materialized(session_id, 'heatmap')
+            if materialized:
+                if payload is None:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="No zone data found for this session"
+                    )
+                return Response(content=payload, media_type="application/json")
+        
+        # Resolve the time window first so the flight key holds absolute times
+        start, end = resolve_time_window(session_id, start_time, end_time, last_seconds)
+        figure = await run_in_threadpool(
+            get_heatmap, session_id, rows, columns, field_dimen, event_type, start, end, event_filter
+        )
         
-        if not hot_zone:
+        if figure is None:
             raise HTTPException(
                 status_code=400,
                 detail="No zone data found for this session"
             )
         
-        # Create pitch with areas
-        fig, zone_dict = plot_pitch_areas(
-            n_rows=rows,
-            n_cols=columns,
-            field_dimen=field_dimen,
-            show_numbers=False
-        )
-        
-        # Create heatmap grid
-        fig = create_grid(
-            cell_centers=zone_dict,
-            hot_dict=hot_zone,
-            rows=rows,
-            columns=columns,
-            field_dimen=field_dimen,
-            fig=fig
-        )
-        
-        return fig.to_dict()
+        return figure
     except HTTPException:
         raise
     except Exception as e:
@@ -158,6 +212,10 @@ async def get_pitch_data(
     columns: int = 3,
     field_length: float = 120,
     field_width: float = 80,
+    mode: Literal["figure", "data"] = Query(
+        "figure",
+        description="'data' returns compact arrays only; draw the pitch from /pitch-template"
+    ),
     session_id: Optional[str] = Header(None, alias="X-Session-ID")
 ) -> Dict[str, Any]:
     """
@@ -168,13 +226,18 @@ async def get_pitch_data(
         columns: Number of columns in the grid
         field_length: Field length in meters
         field_width: Field width in meters
+        mode: 'figure' for the full Plotly figure, 'data' for the compact summary
         session_id: Optional session identifier from header
         
     Returns:
-        dict: Pitch figure dictionary with zone information
+        dict: Pitch figure dictionary with zone information, or the compact
+        summary (see visualization_service.get_pitch_summary)
     """
     field_dimen = (field_length, field_width)
     
+    if mode == "data":
+        return get_pitch_summary(session_id, rows, columns, field_dimen)
+    
     # Create pitch with areas
     fig, zone_dict = plot_pitch_areas(
         n_rows=rows,
@@ -195,3 +258,198 @@ async def get_pitch_data(
         "columns": columns,
         "field_dimen": list(field_dimen)
     }
+
+
+@router.get("/pitch-template")
+async def get_pitch_template_endpoint(
+    rows: int = Query(3, ge=1, le=12),
+    columns: int = Query(3, ge=1, le=12),
+    field_length: float = Query(120, gt=0, le=200),
+    field_width: float = Query(80, gt=0, le=200),
+    show_numbers: bool = True,
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding")
+) -> Response:
+    """
+    Get the empty pitch figure for a grid configuration.
+    
+    The figure is session-independent, so it is served from a precompressed
+    cache and may be cached by the client.
+    
+    Args:
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        field_length: Field length in meters
+        field_width: Field width in meters
+        show_numbers: Whether to show zone numbers
+        accept_encoding: Accept-Encoding header used to pick a variant
+        
+    Returns:
+        Response: Plotly figure JSON
+    """
+    payload = get_pitch_template(rows, columns, field_length, field_width, show_numbers)
+    return payload.to_response(
+        accept_encoding,
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
+
+
+ImageFormat = Literal["png", "svg"]
+
+# SHA-256 hex, tagged with its worker in multi-worker mode
+DIGEST_PATTERN = re.compile(r'^(w[0-9]+-)?[0-9a-f]{64}$')
+
+# Content-addressed images never change
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _image_response(digest: str, media_type: str, image: bytes, if_none_match: Optional[str]) -> Response:
+    """Serve an image under its digest, answering revalidations with 304."""
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMAGE_CACHE_CONTROL,
+        "Content-Location": f"/api/visualization/render/{digest}"
+    }
+    if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=image, media_type=media_type, headers=headers)
+
+
+async def _render_response(
+    kind: str,
+    spec: Dict[str, Any],
+    fmt: str,
+    dpi: int,
+    if_none_match: Optional[str]
+) -> Response:
+    """Render on the pool (from a worker thread) and build the response."""
+    try:
+        digest, image = await run_in_threadpool(render, kind, spec, fmt, dpi)
+    except RenderUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        # Chart data the renderer rejected
+        raise HTTPException(status_code=400, detail=str(e))
+    return _image_response(digest, IMAGE_FORMATS[fmt], image, if_none_match)
+
+
+@router.post("/render/heatmap")
+async def render_heatmap_image(
+    rows: int = Query(3, ge=1, le=12),
+    columns: int = Query(3, ge=1, le=12),
+    event_type: Optional[str] = None,
+    start_time: Optional[float] = Query(None, ge=0, description="Window start in seconds"),
+    end_time: Optional[float] = Query(None, ge=0, description="Window end in seconds (exclusive)"),
+    last_seconds: Optional[float] = Query(None, gt=0, description="Only events in the last N seconds of match time"),
+    filter_: str = Query("", alias="filter", description=FILTER_SYNTAX),
+    title: str = Query("", max_length=200),
+    format: ImageFormat = "png",
+    dpi: int = Query(100, ge=50, le=300, description="Resolution of PNG output"),
+    session_id: str = Header(..., alias="X-Session-ID"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+) -> Response:
+    """
+    Render the session's zone heatmap as a static image (mplsoccer).
+    
+    Images are cached by the zone counts they show, so unchanged data is
+    served without rendering. The response ETag is the image digest, also
+    retrievable from GET /render/{digest}.
+    
+    Args:
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        event_type: Optional event type filter
+        start_time: Window start in seconds
+        end_time: Window end in seconds (exclusive)
+        last_seconds: Only events in the last N seconds of match time
+        filter_: Filter on indexed fields
+        title: Image title
+        format: Image format (png or svg)
+        dpi: Resolution of PNG output
+        session_id: Session identifier from header
+        if_none_match: ETag of a copy the client already has
+        
+    Returns:
+        Response: Encoded image
+    """
+    try:
+        event_filter = parse_event_filter(filter_)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    start, end = resolve_time_window(session_id, start_time, end_time, last_seconds)
+    spec = build_heatmap_spec(session_id, rows, columns, event_type, start, end, title, event_filter)
+    if spec is None:
+        raise HTTPException(
+            status_code=400,
+            detail="No zone data found for this session"
+        )
+    return await _render_response("heatmap", spec, format, dpi, if_none_match)
+
+
+@router.post("/render/pizza")
+async def render_pizza_image(
+    request: PizzaRenderRequest,
+    format: ImageFormat = "png",
+    dpi: int = Query(100, ge=50, le=300, description="Resolution of PNG output"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+) -> Response:
+    """
+    Render a pizza plot as a static image.
+    
+    Args:
+        request: Labels, percentiles and titles
+        format: Image format (png or svg)
+        dpi: Resolution of PNG output
+        if_none_match: ETag of a copy the client already has
+        
+    Returns:
+        Response: Encoded image
+    """
+    return await _render_response("pizza", request.model_dump(), format, dpi, if_none_match)
+
+
+@router.post("/render/radar")
+async def render_radar_image(
+    request: RadarRenderRequest,
+    format: ImageFormat = "png",
+    dpi: int = Query(100, ge=50, le=300, description="Resolution of PNG output"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+) -> Response:
+    """
+    Render a radar chart as a static image.
+    
+    Args:
+        request: Axis labels and traces
+        format: Image format (png or svg)
+        dpi: Resolution of PNG output
+        if_none_match: ETag of a copy the client already has
+        
+    Returns:
+        Response: Encoded image
+    """
+    return await _render_response("radar", request.model_dump(), format, dpi, if_none_match)
+
+
+@router.get("/render/{digest}")
+async def get_rendered_image(
+    digest: str,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+) -> Response:
+    """
+    Get a previously rendered image by digest.
+    
+    Args:
+        digest: Image digest (the ETag of a render response)
+        if_none_match: ETag of a copy the client already has
+        
+    Returns:
+        Response: Encoded image
+    """
+    if not DIGEST_PATTERN.match(digest):
+        raise HTTPException(status_code=400, detail="Invalid image digest")
+    entry = get_cached_image(digest)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Image not found (render it again)")
+    media_type, image = entry
+    return _image_response(digest, media_type, image, if_none_match)
@@ -0,0 +1,101 @@
+"""
+Admin command line for session snapshots.
+
+Usage (from the backend directory):
+    python -m app.cli snapshot SESSION_ID match.arrow [--url http://localhost:8000]
+    python -m app.cli restore SESSION_ID match.arrow [--url http://localhost:8000]
+    python -m app.cli inspect match.arrow
+    python -m app.cli list ARCHIVE_DIR
+"""
+import argparse
+import sys
+import urllib.error
+import urllib.request
+from typing import List, Optional
+
+from app.services.snapshot_service import (
+    SNAPSHOT_MEDIA_TYPE,
+    get_snapshot_metadata,
+    list_archived_sessions,
+    load_snapshot
+)
+
+DEFAULT_URL = "http://localhost:8000"
+
+
+def _request(url: str, session_id: str, method: str = "GET", data: Optional[bytes] = None) -> bytes:
+    headers = {"X-Session-ID": session_id}
+    if data is not None:
+        headers["Content-Type"] = SNAPSHOT_MEDIA_TYPE
+    request = urllib.request.Request(url, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.read()
+    except urllib.error.HTTPError as e:
+        raise SystemExit(f"Server returned {e.code}: {e.read().decode('utf-8', 'replace')}")
+
+
+def snapshot(args):
+    """Download a live session from a running server to a file."""
+    content = _request(f"{args.url}/api/sessions/snapshot", args.session_id)
+    with open(args.path, "wb") as f:
+        f.write(content)
+    print(f"Saved session {args.session_id} to {args.path} ({len(content)} bytes)")
+
+
+def restore(args):
+    """Upload a snapshot file into a session on a running server."""
+    with open(args.path, "rb") as f:
+        content = f.read()
+    _request(f"{args.url}/api/sessions/restore", args.session_id, method="POST", data=content)
+    print(f"Restored {args.path} into session {args.session_id}")
+
+
+def inspect(args):
+    """Print a summary of a snapshot file."""
+    table = load_snapshot(args.path)
+    metadata = get_snapshot_metadata(table)
+    print(f"session_id:   {metadata['session_id']}")
+    print(f"events:       {table.num_rows}")
+    print(f"created_at:   {metadata['created_at']}")
+    print(f"stopwatch:    {metadata['stopwatch']['elapsed_time']:.1f}s"
+          f"{' (running)' if metadata['stopwatch']['running'] else ''}")
+    print(f"hot_zones:    {metadata['hot_zones']}")
+
+
+def list_archive(args):
+    """List snapshots in an archive directory."""
+    for archive in list_archived_sessions(args.directory):
+        print(f"{archive['session_id']}\t{archive['size_bytes']}\t{archive['archived_at']}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Event Tagger session snapshot tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_snapshot = subparsers.add_parser("snapshot", help="Download a session snapshot")
+    parser_snapshot.add_argument("session_id")
+    parser_snapshot.add_argument("path")
+    parser_snapshot.add_argument("--url", default=DEFAULT_URL)
+    parser_snapshot.set_defaults(func=snapshot)
+
+    parser_restore = subparsers.add_parser("restore", help="Upload a snapshot into a session")
+    parser_restore.add_argument("session_id")
+    parser_restore.add_argument("path")
+    parser_restore.add_argument("--url", default=DEFAULT_URL)
+    parser_restore.set_defaults(func=restore)
+
+    parser_inspect = subparsers.add_parser("inspect", help="Summarize a snapshot file")
+    parser_inspect.add_argument("path")
+    parser_inspect.set_defaults(func=inspect)
+
+    parser_list = subparsers.add_parser("list", help="List archived snapshots")
+    parser_list.add_argument("directory")
+    parser_list.set_defaults(func=list_archive)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
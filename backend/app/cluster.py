@@ -0,0 +1,283 @@
+"""
+Multi-worker deployment with session affinity.
+
+Session state lives in each process's memory (see app/services/state_manager.py),
+so all requests for one X-Session-ID must reach the same process. This module
+starts one uvicorn worker per core, each listening on its own Unix socket, and
+serves a front router that hashes X-Session-ID to pick the worker. Every match
+keeps a single consistent view while all cores serve traffic.
+
+Each worker is told its index and the worker count (app.utils.worker_affinity):
+it recovers only its own sessions from the shared journal directory, and tags
+export job IDs and image digests with its index so polling and downloads are
+routed back to it. Limits of this mode:
+    - an export job can only include sessions owned by the accepting worker,
+      and GET /api/export/jobs lists that worker's jobs only
+    - /api/analytics/season aggregates archived sessions only (include_live=false)
+
+Usage (from the backend directory):
+    python -m app.cluster --workers 4 --host 0.0.0.0 --port 8000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import itertools
+import time
+from typing import List, Optional
+
+import uvicorn
+
+from app.utils.worker_affinity import (
+    WORKER_COUNT_ENV,
+    WORKER_INDEX_ENV,
+    split_owner_key,
+    worker_for_session
+)
+
+logger = logging.getLogger(__name__)
+
+SESSION_HEADER = b"x-session-id"
+
+# Hop-by-hop headers that must not be forwarded between connections
+HOP_BY_HOP_HEADERS = {
+    b"connection", b"keep-alive", b"proxy-connection", b"transfer-encoding",
+    b"te", b"trailer", b"upgrade", b"content-length"
+}
+
+# Response headers the front server sets itself; relaying the worker's
+# copies would send them twice
+FRONT_RESPONSE_HEADERS = {b"date", b"server"}
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Paths whose next segment is an ID tagged with its owning worker (see
+# app.utils.worker_affinity.owner_key): export jobs and rendered images
+OWNER_KEY_PATHS = ("/api/export/jobs/", "/api/visualization/render/")
+
+
+class SessionAffinityRouter:
+    """
+    ASGI app forwarding each request to the worker that owns its session.
+
+    Requests for an export job or rendered image go to the worker named in
+    its ID. Requests bound to no session (pitch templates, archived
+    analytics) are spread round-robin. Requests are forwarded as HTTP/1.0
+    over the worker's Unix socket so the response body is delimited by
+    connection close and can be streamed back without re-chunking.
+    """
+
+    def __init__(self, socket_paths: List[str]):
+        self.socket_paths = socket_paths
+        self._next_worker = itertools.cycle(range(len(socket_paths)))
+
+    def worker_for_request(self, scope) -> int:
+        """
+        Pick the worker for a request.
+
+        Args:
+            scope: ASGI HTTP scope
+
+        Returns:
+            int: Worker index
+        """
+        n_workers = len(self.socket_paths)
+        path = scope["path"]
+        for prefix in OWNER_KEY_PATHS:
+            if path.startswith(prefix):
+                owner, _ = split_owner_key(path[len(prefix):].split("/", 1)[0])
+                if owner is not None and owner < n_workers:
+                    return owner
+        for name, value in scope["headers"]:
+            if name == SESSION_HEADER:
+                return worker_for_session(value.decode("latin-1"), n_workers)
+        return next(self._next_worker)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise RuntimeError(f"Unsupported scope type: {scope['type']}")
+
+        socket_path = self.socket_paths[self.worker_for_request(scope)]
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+        except OSError as e:
+            logger.error("Worker unavailable at %s: %s", socket_path, e)
+            await self._send_error(send, 502, b"Worker unavailable")
+            return
+
+        try:
+            writer.write(self._build_request(scope, bytes(body)))
+            await writer.drain()
+            await self._relay_response(reader, send)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _build_request(scope, body: bytes) -> bytes:
+        """Serialize the ASGI request as an HTTP/1.0 request."""
+        target = scope.get("raw_path") or scope["path"].encode("utf-8")
+        if scope.get("query_string"):
+            target += b"?" + scope["query_string"]
+
+        lines = [scope["method"].encode("latin-1") + b" " + target + b" HTTP/1.0"]
+        for name, value in scope["headers"]:
+            if name not in HOP_BY_HOP_HEADERS:
+                lines.append(name + b": " + value)
+        lines.append(b"content-length: " + str(len(body)).encode("latin-1"))
+        return b"\r\n".join(lines) + b"\r\n\r\n" + body
+
+    @staticmethod
+    async def _relay_response(reader: asyncio.StreamReader, send):
+        """Stream the worker's response back to the client."""
+        status_line = await reader.readline()
+        parts = status_line.split(b" ", 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            await SessionAffinityRouter._send_error(send, 502, b"Invalid worker response")
+            return
+
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name in FRONT_RESPONSE_HEADERS:
+                continue
+            if name not in HOP_BY_HOP_HEADERS or name == b"content-length":
+                headers.append((name, value.strip()))
+
+        await send({"type": "http.response.start", "status": int(parts[1]), "headers": headers})
+        while True:
+            chunk = await reader.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _send_error(send, status: int, detail: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(detail)).encode())]
+        })
+        await send({"type": "http.response.body", "body": detail})
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+class WorkerPool:
+    """
+    Supervises uvicorn worker processes, one per Unix socket.
+
+    Workers that exit unexpectedly are restarted on the same socket, so the
+    session-to-worker mapping never changes.
+    """
+
+    def __init__(self, n_workers: int, socket_dir: str, app: str = "app.main:app"):
+        self.app = app
+        self.socket_paths = [os.path.join(socket_dir, f"worker-{i}.sock") for i in range(n_workers)]
+        self._processes: List[Optional[subprocess.Popen]] = [None] * n_workers
+        self._stopping = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def _spawn(self, index: int):
+        socket_path = self.socket_paths[index]
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        env = dict(os.environ)
+        env[WORKER_INDEX_ENV] = str(index)
+        env[WORKER_COUNT_ENV] = str(len(self.socket_paths))
+        self._processes[index] = subprocess.Popen(
+            # h11 never chunks responses to HTTP/1.0 requests, which the router relies on
+            [sys.executable, "-m", "uvicorn", self.app, "--uds", socket_path, "--http", "h11"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env
+        )
+        logger.info("Started worker %d on %s", index, socket_path)
+
+    def start(self, timeout: float = 30.0):
+        """Start all workers and wait for their sockets to appear."""
+        for index in range(len(self.socket_paths)):
+            self._spawn(index)
+
+        deadline = time.monotonic() + timeout
+        while not all(os.path.exists(path) for path in self.socket_paths):
+            if time.monotonic() > deadline:
+                raise RuntimeError("Timed out waiting for workers to start")
+            time.sleep(0.1)
+
+        self._monitor = threading.Thread(target=self._watch, daemon=True)
+        self._monitor.start()
+
+    def _watch(self):
+        while not self._stopping.wait(1.0):
+            for index, process in enumerate(self._processes):
+                if process is not None and process.poll() is not None:
+                    logger.warning("Worker %d exited with code %s, restarting", index, process.returncode)
+                    self._spawn(index)
+
+    def stop(self):
+        """Terminate all workers."""
+        self._stopping.set()
+        for process in self._processes:
+            if process is not None and process.poll() is None:
+                process.terminate()
+        for process in self._processes:
+            if process is not None:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the Event Tagger API on all cores with session affinity")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to bind the front router to")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind the front router to")
+    parser.add_argument("--socket-dir", default=None, help="Directory for worker Unix sockets (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    socket_dir = args.socket_dir or tempfile.mkdtemp(prefix="event-tagger-")
+    owns_socket_dir = args.socket_dir is None
+    os.makedirs(socket_dir, exist_ok=True)
+
+    pool = WorkerPool(max(1, args.workers), socket_dir)
+    pool.start()
+    try:
+        uvicorn.run(SessionAffinityRouter(pool.socket_paths), host=args.host, port=args.port)
+    finally:
+        pool.stop()
+        if owns_socket_dir:
+            shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
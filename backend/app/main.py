@@ -1,13 +1,40 @@
 """
 FastAPI application entry point.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from app.utils.compression import COMPRESSION_MINIMUM_SIZE, GZIP_LEVEL
+from app.services.state_manager import get_state_manager
+from app.services.journal_service import start_journal, stop_journal
+from app.services.materializer_service import start_materializer, stop_materializer
+from app.services.analytics_service import shutdown_pool as shutdown_analytics_pool
+from app.services.render_service import shutdown_render_pool
+from app.services.export_job_service import start_export_queue, stop_export_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Replay journaled sessions before serving (no-op unless EVENT_TAGGER_JOURNAL_DIR is set)
+    start_journal(get_state_manager())
+    start_materializer(get_state_manager())
+    start_export_queue()
+    yield
+    stop_export_queue()
+    stop_materializer()
+    stop_journal()
+    shutdown_analytics_pool()
+    shutdown_render_pool()
+
 
 app = FastAPI(
     title="Event Tagger API",
     description="Backend API for Event Tagger application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS (allow_credentials=True requires explicit origins, not "*")
@@ -23,15 +50,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the events pagination cursor
+    expose_headers=["X-Next-Cursor"],
+)
+
+# Compress large chart and export payloads for clients that accept gzip.
+# Responses that already carry a Content-Encoding (precompressed) pass through.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    compresslevel=GZIP_LEVEL
 )
 
 # Import routers
-from app.api import events, stopwatch, visualization, export
+from app.api import events, stopwatch, visualization, export, imports, sessions, analytics
 
 app.include_router(events.router, prefix="/api/events", tags=["events"])
 app.include_router(stopwatch.router, prefix="/api/stopwatch", tags=["stopwatch"])
 app.include_router(visualization.router, prefix="/api/visualization", tags=["visualization"])
 app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(imports.router, prefix="/api/import", tags=["import"])
+app.include_router(sessions.router, prefix="/api/sessions", tags=["sessions"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 
 
 @app.get("/")
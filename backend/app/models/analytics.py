@@ -0,0 +1,69 @@
+"""
+Models for cross-session analytics.
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List
+
+from app.models.event import EventStats
+
+
+class TeamSeasonStats(EventStats):
+    """
+    Model for event statistics of one team summed over several sessions.
+
+    Attributes:
+        matches: Number of sessions the team appears in
+        shot_conversion: Goals per shot, or None without shots
+        cross_completion: Completed crosses per attempt, or None without crosses
+    """
+    matches: int = Field(ge=0, description="Number of sessions the team appears in")
+    shot_conversion: Optional[float] = Field(default=None, description="Goals per shot")
+    cross_completion: Optional[float] = Field(default=None, description="Completed crosses per attempt")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "team": "Home",
+                "goals": 42,
+                "shots": 310,
+                "shots_on_target": 121,
+                "cross_attempts": 480,
+                "cross_completed": 170,
+                "transitions": 520,
+                "matches": 30,
+                "shot_conversion": 0.1355,
+                "cross_completion": 0.3542
+            }
+        }
+
+
+class SeasonAnalytics(BaseModel):
+    """
+    Model for aggregates over several sessions.
+
+    Attributes:
+        matches: Number of sessions with at least one event
+        session_ids: Sessions included in the aggregate
+        events: Total number of events
+        hot_zones: Zone number -> total count
+        avg_hot_zones: Zone number -> average count per match
+        teams: Summed statistics per team
+    """
+    matches: int = Field(ge=0, description="Number of sessions with events")
+    session_ids: List[str] = Field(description="Sessions included in the aggregate")
+    events: int = Field(ge=0, description="Total number of events")
+    hot_zones: Dict[int, int] = Field(description="Zone number -> total count")
+    avg_hot_zones: Dict[int, float] = Field(description="Zone number -> average count per match")
+    teams: List[TeamSeasonStats] = Field(description="Summed statistics per team")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "matches": 2,
+                "session_ids": ["match-01", "match-02"],
+                "events": 130,
+                "hot_zones": {"5": 14, "8": 9},
+                "avg_hot_zones": {"5": 7.0, "8": 4.5},
+                "teams": []
+            }
+        }
@@ -1,8 +1,9 @@
 """
 Pydantic models for event data validation.
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, Optional, Literal, List
+from typing_extensions import Annotated, NotRequired, TypedDict
 from datetime import datetime
 from enum import Enum
 
@@ -32,23 +33,55 @@ class ShotOutcome(str, Enum):
     SAVED = "Saved"
 
 
+# Outcomes allowed with a shot: a shot can only follow no cross or a completed one
+SHOT_ALLOWED_CROSS_OUTCOMES = frozenset({None, CrossOutcome.NONE.value, CrossOutcome.COMPLETED.value})
+
+# Every valid (cross_outcome, shot_outcome) pair, so consistency is one set lookup
+VALID_OUTCOME_PAIRS = frozenset(
+    (cross, shot)
+    for cross in [None, *(outcome.value for outcome in CrossOutcome)]
+    for shot in [None, *(outcome.value for outcome in ShotOutcome)]
+    if shot in (None, ShotOutcome.NONE.value) or cross in SHOT_ALLOWED_CROSS_OUTCOMES
+)
+
+SHOT_OUTCOME_ERROR = "shot_outcome can only be set when cross_outcome is 'None' or 'Completed'"
+
+# Client-sent event time; omitting all of them has the server stamp the event
+EVENT_TIME_FIELDS = ('minute', 'second', 'time_in_second')
+
+# Latest accepted match time (6 hours covers extra time, penalties and
+# long stoppages); also bounds the per-minute time-series arrays
+MAX_EVENT_SECONDS = 6 * 3600
+MAX_EVENT_MINUTES = MAX_EVENT_SECONDS // 60
+
+EVENT_TIME_ERROR = "minute, second and time_in_second must be sent together, or all omitted for a server timestamp"
+
+
 class EventCreate(BaseModel):
     """
     Input model for creating a new event.
     
+    The event time is either sent by the client (minute, second and
+    time_in_second) or, when all three are omitted, stamped by the server
+    from the session stopwatch when the request arrives.
+    
     Attributes:
-        minute: Minute of the event (>= 0)
+        minute: Minute of the event (0 to MAX_EVENT_MINUTES)
         second: Second of the event (0-59)
-        time_in_second: Total time in seconds (>= 0)
+        time_in_second: Total time in seconds (0 to MAX_EVENT_SECONDS)
         team: Team name (Home or Away)
         event_type: Type of event (e.g., Transition, Corner, Dead-ball, etc.)
         cross_outcome: Cross outcome if applicable (None, Completed, Blocked, Intercepted, Saved)
         shot_outcome: Shot outcome if applicable (None, Goal, Post, Blocked, Out, Saved)
         zone: Zone number on the pitch (optional)
+        latency_ms: Client-measured delay between the tag and the request,
+            subtracted from a server timestamp (optional)
     """
-    minute: float = Field(ge=0, description="Minute of the event")
-    second: float = Field(ge=0, le=59, description="Second of the event (0-59)")
-    time_in_second: float = Field(ge=0, description="Total time elapsed in seconds")
+    minute: Optional[float] = Field(default=None, ge=0, le=MAX_EVENT_MINUTES, description="Minute of the event")
+    second: Optional[float] = Field(default=None, ge=0, le=59, description="Second of the event (0-59)")
+    time_in_second: Optional[float] = Field(
+        default=None, ge=0, le=MAX_EVENT_SECONDS, description="Total time elapsed in seconds"
+    )
     team: Literal["Home", "Away"] = Field(description="Team name")
     event_type: str = Field(min_length=1, description="Type of event")
     cross_outcome: Optional[Literal["None", "Completed", "Blocked", "Intercepted", "Saved"]] = Field(
@@ -60,19 +93,34 @@ class EventCreate(BaseModel):
         description="Shot outcome if applicable"
     )
     zone: Optional[int] = Field(default=None, ge=0, description="Zone number on the pitch")
+    latency_ms: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=10000,
+        description="Delay between the tag and the request, subtracted from a server timestamp"
+    )
 
     @field_validator('shot_outcome')
     @classmethod
     def validate_shot_outcome_with_cross(cls, v, info):
         """Validate that shot_outcome can only be set when cross_outcome is None or Completed."""
-        if v and v != "None":
-            cross_outcome = info.data.get('cross_outcome')
-            if cross_outcome and cross_outcome not in ["None", "Completed"]:
-                raise ValueError(
-                    "shot_outcome can only be set when cross_outcome is 'None' or 'Completed'"
-                )
+        if (info.data.get('cross_outcome'), v) not in VALID_OUTCOME_PAIRS:
+            raise ValueError(SHOT_OUTCOME_ERROR)
         return v
 
+    @model_validator(mode='after')
+    def validate_event_time(self):
+        """Validate that the event time is sent complete or not at all."""
+        sent = sum(getattr(self, field) is not None for field in EVENT_TIME_FIELDS)
+        if sent not in (0, len(EVENT_TIME_FIELDS)):
+            raise ValueError(EVENT_TIME_ERROR)
+        return self
+
+    @property
+    def server_timestamp(self) -> bool:
+        """Whether the server stamps the event time."""
+        return self.time_in_second is None
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -88,6 +136,25 @@ class EventCreate(BaseModel):
         }
 
 
+class EventCreateDict(TypedDict):
+    """
+    EventCreate as a plain dict, for the ingestion fast path.
+    
+    Validated with a TypeAdapter straight from JSON bytes into a dict,
+    without building a model instance. The outcome and event time
+    consistency rules are checked by the caller.
+    """
+    minute: NotRequired[Optional[Annotated[float, Field(ge=0, le=MAX_EVENT_MINUTES)]]]
+    second: NotRequired[Optional[Annotated[float, Field(ge=0, le=59)]]]
+    time_in_second: NotRequired[Optional[Annotated[float, Field(ge=0, le=MAX_EVENT_SECONDS)]]]
+    team: Literal["Home", "Away"]
+    event_type: Annotated[str, Field(min_length=1)]
+    cross_outcome: NotRequired[Optional[Literal["None", "Completed", "Blocked", "Intercepted", "Saved"]]]
+    shot_outcome: NotRequired[Optional[Literal["None", "Goal", "Post", "Blocked", "Out", "Saved"]]]
+    zone: NotRequired[Optional[Annotated[int, Field(ge=0)]]]
+    latency_ms: NotRequired[Optional[Annotated[float, Field(ge=0, le=10000)]]]
+
+
 class EventResponse(BaseModel):
     """
     Output model for event data.
@@ -102,6 +169,7 @@ class EventResponse(BaseModel):
         cross_outcome: Cross outcome if applicable
         shot_outcome: Shot outcome if applicable
         zone: Zone number on the pitch
+        period: Match period, stamped from the stopwatch (None if it has no period)
         created_at: Timestamp when the event was created
     """
     id: int = Field(ge=0, description="Unique event identifier")
@@ -113,6 +181,7 @@ class EventResponse(BaseModel):
     cross_outcome: Optional[str] = Field(default=None, description="Cross outcome if applicable")
     shot_outcome: Optional[str] = Field(default=None, description="Shot outcome if applicable")
     zone: Optional[int] = Field(default=None, ge=0, description="Zone number on the pitch")
+    period: Optional[str] = Field(default=None, description="Match period the event was tagged in")
     created_at: datetime = Field(description="Timestamp when the event was created")
 
     class Config:
@@ -128,6 +197,7 @@ class EventResponse(BaseModel):
                 "cross_outcome": "None",
                 "shot_outcome": "Goal",
                 "zone": 5,
+                "period": "1H",
                 "created_at": "2024-01-01T12:00:00"
             }
         }
@@ -166,3 +236,38 @@ class EventStats(BaseModel):
                 "transitions": 15
             }
         }
+
+
+class EventDelta(BaseModel):
+    """
+    Model for incremental event sync.
+    
+    Attributes:
+        cursor: Version to send as `since` on the next sync
+        epoch: Session epoch to send with the cursor
+        reset: True if the client must replace its events with `appended`
+        appended: Events created since the cursor (all events on reset)
+        deleted: IDs of events deleted since the cursor
+        stats: Updated statistics, or None if nothing changed
+        hot_zones: Updated zone number -> event count, or None if nothing changed
+    """
+    cursor: int = Field(ge=0, description="Version to send as `since` on the next sync")
+    epoch: str = Field(description="Session epoch to send as `epoch` with the cursor")
+    reset: bool = Field(description="True if the client must replace its event list")
+    appended: List[EventResponse] = Field(description="Events created since the cursor")
+    deleted: List[int] = Field(description="IDs of events deleted since the cursor")
+    stats: Optional[List[EventStats]] = Field(default=None, description="Updated statistics if anything changed")
+    hot_zones: Optional[Dict[int, int]] = Field(default=None, description="Updated hot zones if anything changed")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "cursor": 12,
+                "epoch": "3f2b9c0e8d7a4e1f9b6c5d4a3e2f1a0b",
+                "reset": False,
+                "appended": [],
+                "deleted": [3],
+                "stats": None,
+                "hot_zones": None
+            }
+        }
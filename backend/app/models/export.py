@@ -0,0 +1,88 @@
+"""
+Models for background export jobs.
+"""
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+from datetime import datetime
+
+
+class ExportJobState(str, Enum):
+    """Export job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+ExportFormat = Literal["csv", "xml", "zip", "parquet"]
+
+
+class ExportJobRequest(BaseModel):
+    """
+    Model for submitting an export job.
+
+    Attributes:
+        format: Output format (zip holds CSV and XML)
+        session_ids: Sessions to export (defaults to the X-Session-ID session)
+        filename: Optional base filename for download (without extension)
+    """
+    format: ExportFormat = Field(default="zip", description="Output format")
+    session_ids: Optional[List[str]] = Field(
+        default=None,
+        min_length=1,
+        max_length=200,
+        description="Sessions to export; several sessions are bundled in one ZIP"
+    )
+    filename: Optional[str] = Field(
+        default=None,
+        max_length=100,
+        pattern=r"^[\w\-. ]+$",
+        description="Base filename for download (without extension)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "format": "zip",
+                "session_ids": ["matchday-12-home", "matchday-12-away"],
+                "filename": "matchday-12"
+            }
+        }
+
+
+class ExportJobStatus(BaseModel):
+    """
+    Model for export job status.
+
+    Attributes:
+        job_id: Job identifier
+        state: Lifecycle state
+        format: Output format
+        session_ids: Sessions being exported
+        sessions_done: Sessions written so far
+        progress: Fraction of sessions written (0-1)
+        created_at: Submission time
+        started_at: Time a worker picked the job up
+        finished_at: Completion time
+        expires_at: Time the result is deleted
+        size: Result size in bytes
+        filename: Download filename
+        error: Failure reason
+        download_url: Result URL once the job is done
+    """
+    job_id: str
+    state: ExportJobState
+    format: ExportFormat
+    session_ids: List[str]
+    sessions_done: int = Field(ge=0)
+    progress: float = Field(ge=0, le=1)
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    size: Optional[int] = None
+    filename: str
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,233 @@
+"""
+Compact in-memory records for session state.
+
+These are the internal storage representations used by the state manager;
+the pydantic models in event.py and session.py remain the API contract.
+Records use __slots__ (no per-instance __dict__), and category strings
+(team, event type, outcomes) are interned so every event shares one copy
+of e.g. "Home" instead of holding the string parsed from its request.
+"""
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.models.session import PERIOD_LENGTH_SECONDS, PERIOD_START_SECONDS, StopwatchStatus
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+@dataclass(slots=True)
+class EventRecord:
+    """
+    A stored event.
+
+    Field order matches EventResponse, which validates records directly
+    (from_attributes) and serializes them in the same order.
+    """
+    id: Optional[int]
+    minute: float
+    second: float
+    time_in_second: float
+    team: str
+    event_type: str
+    cross_outcome: Optional[str]
+    shot_outcome: Optional[str]
+    zone: Optional[int]
+    period: Optional[str]
+    created_at: datetime
+
+    @classmethod
+    def create(
+        cls,
+        minute: float,
+        second: float,
+        time_in_second: float,
+        team: str,
+        event_type: str,
+        cross_outcome: Optional[str] = None,
+        shot_outcome: Optional[str] = None,
+        zone: Optional[int] = None,
+        period: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+        id: Optional[int] = None
+    ) -> 'EventRecord':
+        """
+        Build a record, interning its category strings.
+
+        Args:
+            minute: Minute of the event
+            second: Second of the event
+            time_in_second: Total time in seconds
+            team: Team name
+            event_type: Type of event
+            cross_outcome: Cross outcome if applicable
+            shot_outcome: Shot outcome if applicable
+            zone: Zone number on the pitch
+            period: Match period the event was tagged in
+            created_at: Creation time (defaults to now)
+            id: Existing event ID (None to have the session assign one)
+
+        Returns:
+            EventRecord: New record
+        """
+        return cls(
+            id,
+            float(minute),
+            float(second),
+            float(time_in_second),
+            sys.intern(team),
+            sys.intern(event_type),
+            _intern(cross_outcome),
+            _intern(shot_outcome),
+            int(zone) if zone is not None else None,
+            _intern(period),
+            created_at or datetime.now()
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EventRecord':
+        """
+        Build a record from an event dict (journal, snapshot or import row).
+
+        Args:
+            data: Event fields; unknown keys are ignored
+
+        Returns:
+            EventRecord: New record
+        """
+        return cls.create(
+            data['minute'],
+            data['second'],
+            data['time_in_second'],
+            data['team'],
+            data['event_type'],
+            data.get('cross_outcome'),
+            data.get('shot_outcome'),
+            data.get('zone'),
+            data.get('period'),
+            data.get('created_at'),
+            data.get('id')
+        )
+
+    def to_dict(self) -> Dict:
+        """
+        Get the record as an event dict.
+
+        Returns:
+            Dict: Field name -> value
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class StopwatchState:
+    """
+    Mutable stopwatch state of a session.
+
+    Time is measured on time.monotonic(), so wall-clock adjustments (NTP)
+    never move the clock. While running, `epoch` is the monotonic time at
+    which the current period read zero, so the elapsed time is a single
+    subtraction; while stopped, `elapsed_time` holds it. `start_time` is the
+    wall-clock start of the current run, kept for display and to rebuild
+    the epoch after a restart.
+    """
+    running: bool = False
+    elapsed_time: float = 0.0
+    start_time: Optional[datetime] = None
+    period: Optional[str] = None
+    epoch: float = 0.0
+
+    def period_elapsed(self, now: Optional[float] = None) -> float:
+        """
+        Get the seconds elapsed in the current period.
+
+        Args:
+            now: time.monotonic() reading (defaults to now)
+
+        Returns:
+            float: Elapsed seconds
+        """
+        if not self.running:
+            return self.elapsed_time
+        return (time.monotonic() if now is None else now) - self.epoch
+
+    def match_time(self, now: Optional[float] = None) -> float:
+        """
+        Get the match clock: the period's kick-off time plus its elapsed time.
+
+        Args:
+            now: time.monotonic() reading (defaults to now)
+
+        Returns:
+            float: Match clock in seconds
+        """
+        return PERIOD_START_SECONDS.get(self.period, 0.0) + self.period_elapsed(now)
+
+    def start(self, now: float):
+        """Start counting from the current period elapsed time."""
+        self.epoch = now - self.elapsed_time
+        self.start_time = datetime.now()
+        self.running = True
+
+    def stop(self, now: float):
+        """Stop counting, keeping the period elapsed time."""
+        self.elapsed_time = now - self.epoch
+        self.start_time = None
+        self.running = False
+
+    def to_dict(self) -> Dict:
+        """
+        Get the persistent state as a JSON-compatible dict.
+
+        Returns:
+            Dict: running, elapsed_time (stopped part), start_time and period
+        """
+        return {
+            'running': self.running,
+            'elapsed_time': self.elapsed_time,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'period': self.period
+        }
+
+    def load(self, data: Dict):
+        """
+        Restore state written by to_dict.
+
+        A running stopwatch's epoch is rebuilt from its wall-clock start,
+        since monotonic readings do not survive a restart.
+
+        Args:
+            data: Output of to_dict
+        """
+        self.running = data['running']
+        self.elapsed_time = data['elapsed_time']
+        self.start_time = datetime.fromisoformat(data['start_time']) if data.get('start_time') else None
+        self.period = data.get('period')
+        self.epoch = 0.0
+        if self.running:
+            run_time = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0.0
+            self.epoch = time.monotonic() - self.elapsed_time - run_time
+
+    def to_status(self) -> StopwatchStatus:
+        """
+        Get a snapshot of the state as the API model.
+
+        Returns:
+            StopwatchStatus: Copy of the current state
+        """
+        period_elapsed = self.period_elapsed()
+        stoppage_time = 0.0
+        if self.period is not None:
+            stoppage_time = max(0.0, period_elapsed - PERIOD_LENGTH_SECONDS[self.period])
+        return StopwatchStatus(
+            running=self.running,
+            elapsed_time=PERIOD_START_SECONDS.get(self.period, 0.0) + period_elapsed,
+            start_time=self.start_time,
+            period=self.period,
+            period_elapsed=period_elapsed,
+            stoppage_time=stoppage_time
+        )
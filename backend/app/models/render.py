@@ -0,0 +1,75 @@
+"""
+Models for static image rendering.
+"""
+from matplotlib.colors import is_color_like
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, List, Optional
+
+
+class PizzaRenderRequest(BaseModel):
+    """
+    Model for a pizza plot.
+
+    Attributes:
+        labels: Parameter labels
+        percentiles: Percentile (0-100) of each parameter
+        title: Plot title
+        subtitle: Plot subtitle
+    """
+    labels: List[str] = Field(min_length=1, max_length=40, description="Parameter labels")
+    percentiles: List[float] = Field(description="Percentile of each parameter")
+    title: str = Field(default="", max_length=200, description="Plot title")
+    subtitle: str = Field(default="", max_length=200, description="Plot subtitle")
+
+    @model_validator(mode='after')
+    def check_lengths(self) -> 'PizzaRenderRequest':
+        """Validate one percentile per label, within 0-100."""
+        if len(self.percentiles) != len(self.labels):
+            raise ValueError("percentiles must have one value per label")
+        if any(not 0 <= value <= 100 for value in self.percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        return self
+
+
+class RadarTrace(BaseModel):
+    """
+    Model for one polygon of a radar chart.
+
+    Attributes:
+        percentiles: Percentile (0-100) on each axis
+        color: Optional fill color
+    """
+    percentiles: List[float] = Field(description="Percentile on each axis")
+    color: Optional[str] = Field(default=None, max_length=32, description="Fill color")
+
+    @field_validator('color')
+    @classmethod
+    def check_color(cls, v):
+        """Validate that the color is one matplotlib can draw."""
+        if v is not None and not is_color_like(v):
+            raise ValueError(f"Unknown color: {v}")
+        return v
+
+
+class RadarRenderRequest(BaseModel):
+    """
+    Model for a radar chart (same traces and labels as create_radar_chart).
+
+    Attributes:
+        labels: Axis labels
+        traces: Trace name -> trace
+        title: Chart title
+    """
+    labels: List[str] = Field(min_length=3, max_length=40, description="Axis labels")
+    traces: Dict[str, RadarTrace] = Field(min_length=1, max_length=8, description="Trace name -> trace")
+    title: str = Field(default="", max_length=200, description="Chart title")
+
+    @model_validator(mode='after')
+    def check_lengths(self) -> 'RadarRenderRequest':
+        """Validate one percentile per label in every trace, within 0-100."""
+        for name, trace in self.traces.items():
+            if len(trace.percentiles) != len(self.labels):
+                raise ValueError(f"Trace {name} must have one percentile per label")
+            if any(not 0 <= value <= 100 for value in trace.percentiles):
+                raise ValueError(f"Trace {name} percentiles must be between 0 and 100")
+        return self
@@ -1,16 +1,57 @@
 """
 Models for session state management.
 """
-from pydantic import BaseModel
-from typing import Optional, Dict
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List
 from datetime import datetime
 
+from app.models.event import EventResponse, EventStats
+
+
+class Period(str, Enum):
+    """Match periods."""
+    FIRST_HALF = "1H"
+    SECOND_HALF = "2H"
+    EXTRA_TIME_FIRST = "ET1"
+    EXTRA_TIME_SECOND = "ET2"
+
+
+# Match clock (seconds) at which each period kicks off
+PERIOD_START_SECONDS = {
+    Period.FIRST_HALF.value: 0.0,
+    Period.SECOND_HALF.value: 45 * 60.0,
+    Period.EXTRA_TIME_FIRST.value: 90 * 60.0,
+    Period.EXTRA_TIME_SECOND.value: 105 * 60.0,
+}
+
+# Regulation length of each period; time past it is stoppage time
+PERIOD_LENGTH_SECONDS = {
+    Period.FIRST_HALF.value: 45 * 60.0,
+    Period.SECOND_HALF.value: 45 * 60.0,
+    Period.EXTRA_TIME_FIRST.value: 15 * 60.0,
+    Period.EXTRA_TIME_SECOND.value: 15 * 60.0,
+}
+
 
 class StopwatchStatus(BaseModel):
-    """Model for stopwatch status."""
+    """
+    Model for stopwatch status.
+    
+    Attributes:
+        running: Whether the stopwatch is running
+        elapsed_time: Match clock in seconds (period start + period elapsed)
+        start_time: Wall-clock start of the current run
+        period: Current period, or None if the stopwatch is not period-based
+        period_elapsed: Seconds elapsed in the current period
+        stoppage_time: Seconds played past the period's regulation length
+    """
     running: bool
     elapsed_time: float
     start_time: Optional[datetime] = None
+    period: Optional[Period] = None
+    period_elapsed: float = Field(default=0.0, description="Seconds elapsed in the current period")
+    stoppage_time: float = Field(default=0.0, description="Seconds played past the period's regulation length")
 
 
 class SessionState(BaseModel):
@@ -19,3 +60,28 @@ class SessionState(BaseModel):
     stopwatch: StopwatchStatus
     hot_zone: Dict[int, int] = {}
     created_at: datetime
+
+
+class SessionOverview(BaseModel):
+    """
+    Model for the aggregated state of a session, read in one request.
+    
+    Fields left out of the request's field selection are omitted.
+    
+    Attributes:
+        session_id: Session identifier
+        version: Event data version (usable as the delta sync cursor)
+        epoch: Session epoch to send with the cursor (None if the session
+            does not exist yet)
+        events: Events sorted by match time
+        stats: Statistics for each team
+        stopwatch: Stopwatch status
+        hot_zones: Zone number -> event count
+    """
+    session_id: str
+    version: int
+    epoch: Optional[str] = None
+    events: Optional[List[EventResponse]] = None
+    stats: Optional[List[EventStats]] = None
+    stopwatch: Optional[StopwatchStatus] = None
+    hot_zones: Optional[Dict[int, int]] = None
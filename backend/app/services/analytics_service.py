@@ -0,0 +1,328 @@
+"""
+Business logic for analytics across several sessions.
+
+Each session (a live session or an archived Arrow snapshot) is reduced to a
+small partial aggregate: event count, zone counts and the EventStats fields
+per team. Partials are cached per session under its version (the session
+version for live sessions, file size and mtime for archives), so a query
+only scans sessions that changed since the last one. Uncached archives are
+scanned on a process pool, started on first need, when there are enough of
+them to pay for the dispatch. Merged results are cached under the set of (session, version)
+pairs they were built from.
+"""
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from app.models.analytics import SeasonAnalytics, TeamSeasonStats
+from app.services.state_manager import get_state_manager
+from app.services.stats_service import count_metrics, metric_columns, metric_names
+from app.services.snapshot_service import (
+    archive_path,
+    get_archive_dir,
+    list_archived_sessions,
+    session_to_table
+)
+
+# EventStats counters, in the order they are stored in partials
+STAT_FIELDS = tuple(metric_names())
+
+AGGREGATE_COLUMNS = ['team', 'event_type', 'cross_outcome', 'shot_outcome', 'zone']
+
+# Below this many uncached archives, scanning in-process beats pool dispatch
+# (one archive takes well under a millisecond to reduce)
+PARALLEL_MIN_ARCHIVES = 64
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+PARTIAL_CACHE_SIZE = 4096
+RESULT_CACHE_SIZE = 64
+
+_cache_lock = threading.Lock()
+_partials: 'OrderedDict[Tuple, Tuple]' = OrderedDict()
+_results: 'OrderedDict[frozenset, SeasonAnalytics]' = OrderedDict()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _codes(table: pa.Table, column: str) -> tuple:
+    """
+    Get a dictionary column's codes and the value of each code.
+
+    Nulls get the last code, whose value is None.
+    """
+    array = table.column(column).combine_chunks()
+    if not pa.types.is_dictionary(array.type):
+        array = array.dictionary_encode()
+    dictionary = array.dictionary.to_pylist()
+    codes = array.indices.to_numpy(zero_copy_only=False)
+    if array.null_count:
+        # Integer arrays with nulls convert to float with NaN
+        codes = np.nan_to_num(codes, nan=len(dictionary))
+    return codes.astype(np.intp), dictionary + [None]
+
+
+def aggregate_table(table: pa.Table) -> Dict:
+    """
+    Reduce one session's events to a partial aggregate.
+
+    Feeds the snapshot's dictionary codes straight into the stats engine
+    (stats_service.count_metrics), so counters follow the same rules as
+    get_event_stats.
+
+    Args:
+        table: Events with at least the AGGREGATE_COLUMNS columns
+
+    Returns:
+        dict: {'events': n, 'hot_zones': {zone: n}, 'teams': {team: [counts in STAT_FIELDS order]}}
+    """
+    if table.num_rows == 0:
+        return {'events': 0, 'hot_zones': {}, 'teams': {}}
+
+    table = table.select(AGGREGATE_COLUMNS).unify_dictionaries()
+    team_codes, teams = _codes(table, 'team')
+    columns = {column: _codes(table, column) for column in metric_columns()}
+    per_team = count_metrics(team_codes, len(teams), columns)
+
+    zones = table.column('zone').drop_null().to_numpy()
+    zone_counts = np.bincount(zones) if len(zones) else np.zeros(0, dtype=np.int64)
+
+    return {
+        'events': table.num_rows,
+        'hot_zones': {int(zone): int(zone_counts[zone]) for zone in np.flatnonzero(zone_counts)},
+        'teams': {team: per_team[i].tolist() for i, team in enumerate(teams[:-1])}
+    }
+
+
+def aggregate_archive(path: str) -> Dict:
+    """
+    Reduce an archived snapshot to a partial aggregate (runs in pool workers).
+
+    Only the aggregated columns are read from the memory-mapped file.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        dict: Partial aggregate, see aggregate_table
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return aggregate_table(table)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: children do not inherit the server's threads and
+            # locks; preloading this module lets workers fork with pyarrow
+            # already imported
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload([__name__])
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=context)
+        return _pool
+
+
+def _noop():
+    return None
+
+
+def _start_pool():
+    """
+    Start the worker processes without waiting for them.
+
+    Worker startup takes a few seconds, so the query that triggers it is
+    scanned in-process and later large queries use the warm pool.
+    """
+    pool = _get_pool()
+    for _ in range(MAX_WORKERS):
+        pool.submit(_noop)
+
+
+def shutdown_pool():
+    """Stop the analytics worker processes, if started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _cached_partial(key: Tuple, version) -> Optional[Dict]:
+    with _cache_lock:
+        entry = _partials.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        _partials.move_to_end(key)
+        return entry[1]
+
+
+def _store_partial(key: Tuple, version, partial: Dict):
+    with _cache_lock:
+        _partials[key] = (version, partial)
+        _partials.move_to_end(key)
+        while len(_partials) > PARTIAL_CACHE_SIZE:
+            _partials.popitem(last=False)
+
+
+def _collect_sources(
+    session_ids: Optional[Iterable[str]],
+    include_live: bool,
+    include_archived: bool
+) -> Dict[str, Tuple]:
+    """
+    Resolve sessions to scan as session_id -> (cache key, version, source).
+
+    A live session shadows an archive with the same ID.
+    """
+    wanted = set(session_ids) if session_ids is not None else None
+    sources: Dict[str, Tuple] = {}
+
+    directory = get_archive_dir() if include_archived else None
+    if directory:
+        for archive in list_archived_sessions(directory):
+            session_id = archive['session_id']
+            if wanted is not None and session_id not in wanted:
+                continue
+            path = archive_path(directory, session_id)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            sources[session_id] = (('archive', path), (stat.st_size, stat.st_mtime_ns), path)
+
+    if include_live:
+        state_manager = get_state_manager()
+        for session_id in state_manager.list_sessions():
+            if wanted is not None and session_id not in wanted:
+                continue
+            session_state = state_manager.get_session(session_id)
+            if session_state is None or not session_state.events:
+                continue
+            sources[session_id] = (('live', session_id), session_state.version, session_state)
+
+    return sources
+
+
+def _merge(partials: Dict[str, Dict]) -> SeasonAnalytics:
+    hot_zones: Dict[int, int] = {}
+    teams: Dict[str, List[int]] = {}
+    team_matches: Dict[str, int] = {}
+    session_ids = []
+    n_events = 0
+
+    for session_id in sorted(partials):
+        partial = partials[session_id]
+        if not partial['events']:
+            continue
+        session_ids.append(session_id)
+        n_events += partial['events']
+        for zone, count in partial['hot_zones'].items():
+            hot_zones[zone] = hot_zones.get(zone, 0) + count
+        for team, counts in partial['teams'].items():
+            totals = teams.setdefault(team, [0] * len(STAT_FIELDS))
+            for i, count in enumerate(counts):
+                totals[i] += count
+            team_matches[team] = team_matches.get(team, 0) + 1
+
+    n_matches = len(session_ids)
+    team_stats = []
+    for team, counts in teams.items():
+        stats = dict(zip(STAT_FIELDS, counts))
+        team_stats.append(TeamSeasonStats(
+            team=team,
+            matches=team_matches[team],
+            shot_conversion=round(stats['goals'] / stats['shots'], 4) if stats['shots'] else None,
+            cross_completion=(
+                round(stats['cross_completed'] / stats['cross_attempts'], 4)
+                if stats['cross_attempts'] else None
+            ),
+            **stats
+        ))
+
+    return SeasonAnalytics(
+        matches=n_matches,
+        session_ids=session_ids,
+        events=n_events,
+        hot_zones=dict(sorted(hot_zones.items())),
+        avg_hot_zones={zone: round(count / n_matches, 4) for zone, count in sorted(hot_zones.items())},
+        teams=team_stats
+    )
+
+
+def get_season_analytics(
+    session_ids: Optional[List[str]] = None,
+    include_live: bool = True,
+    include_archived: bool = True
+) -> SeasonAnalytics:
+    """
+    Aggregate hot zones and team statistics over several sessions.
+
+    Args:
+        session_ids: Sessions to include (defaults to every available session)
+        include_live: Include sessions held in memory
+        include_archived: Include snapshots in the configured archive directory
+
+    Returns:
+        SeasonAnalytics: Merged aggregates
+
+    Raises:
+        KeyError: If a requested session ID is neither live nor archived
+    """
+    sources = _collect_sources(session_ids, include_live, include_archived)
+    if session_ids is not None:
+        missing = set(session_ids) - set(sources)
+        # Requested live sessions that exist but are empty are not an error
+        state_manager = get_state_manager()
+        missing = {s for s in missing if not (include_live and state_manager.get_session(s))}
+        if missing:
+            raise KeyError(sorted(missing))
+
+    result_key = frozenset((key, version) for key, version, _ in sources.values())
+    with _cache_lock:
+        cached = _results.get(result_key)
+        if cached is not None:
+            _results.move_to_end(result_key)
+            return cached
+
+    partials: Dict[str, Dict] = {}
+    pending_archives: Dict[str, Tuple] = {}
+    for session_id, (key, version, source) in sources.items():
+        partial = _cached_partial(key, version)
+        if partial is not None:
+            partials[session_id] = partial
+        elif key[0] == 'archive':
+            pending_archives[session_id] = (key, version, source)
+        else:
+            partial = aggregate_table(session_to_table(source))
+            _store_partial(key, version, partial)
+            partials[session_id] = partial
+
+    use_pool = len(pending_archives) >= PARALLEL_MIN_ARCHIVES
+    if use_pool and _pool is None:
+        _start_pool()
+        use_pool = False
+    if use_pool:
+        paths = [source for _, _, source in pending_archives.values()]
+        chunksize = max(1, len(paths) // (MAX_WORKERS * 4))
+        computed = _get_pool().map(aggregate_archive, paths, chunksize=chunksize)
+    else:
+        computed = (aggregate_archive(source) for _, _, source in pending_archives.values())
+
+    for (session_id, (key, version, _)), partial in zip(pending_archives.items(), computed):
+        _store_partial(key, version, partial)
+        partials[session_id] = partial
+
+    result = _merge(partials)
+    with _cache_lock:
+        _results[result_key] = result
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
@@ -1,136 +1,411 @@
 """
 Business logic for event management.
 """
-from typing import List, Dict, Optional
-from collections import defaultdict
+import time
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
-from datetime import datetime
 
-from app.models.event import EventCreate, EventResponse, EventStats
+from pydantic import TypeAdapter, ValidationError
+from fastapi.exceptions import RequestValidationError
+
+from app.models.event import (
+    EventCreateDict,
+    EventResponse,
+    EventStats,
+    EventDelta,
+    EVENT_TIME_ERROR,
+    EVENT_TIME_FIELDS,
+    SHOT_OUTCOME_ERROR,
+    VALID_OUTCOME_PAIRS
+)
+from app.models.records import EventRecord
 from app.utils.data_manipulation import create_event_dataframe
-from app.services.state_manager import get_state_manager
+from app.services.state_manager import SessionState, get_state_manager
+from app.services.index_service import EventFilter, bitmap_positions, get_event_index
+from app.services.stats_service import compute_team_stats, metric_names
+from app.services.stopwatch_service import get_elapsed_time, stamp_event
+
+# Session view holding event ID -> pre-encoded EventResponse JSON
+JSON_VIEW_KEY = 'event_json'
+
+_create_adapter = TypeAdapter(EventCreateDict)
+# Serializes an EventRecord exactly like EventResponse, without building one
+_record_adapter = TypeAdapter(EventRecord)
+_record_list_adapter = TypeAdapter(List[EventRecord])
+
+# Fields a projection can select, in EventResponse order
+EVENT_FIELDS = tuple(EventResponse.model_fields)
+
+
+def _get_json_fragments(session_state: SessionState) -> Dict[int, bytes]:
+    fragments = session_state.views.get(JSON_VIEW_KEY)
+    if fragments is None:
+        fragments = session_state.views[JSON_VIEW_KEY] = {}
+    return fragments
+
+
+def _on_change(session_state: SessionState, change: Dict):
+    """State manager listener dropping fragments of deleted events."""
+    fragments = session_state.views.get(JSON_VIEW_KEY)
+    if fragments is None:
+        return
+    if change['op'] == 'delete':
+        fragments.pop(change['event_id'], None)
+    elif change['op'] == 'clear':
+        fragments.clear()
+
 
+get_state_manager().add_listener(_on_change)
 
-def create_event(session_id: str, event_data: EventCreate) -> EventResponse:
+
+def parse_event_create(body: bytes) -> Tuple[EventRecord, Optional[float]]:
     """
-    Create a new event for a session.
+    Validate an EventCreate JSON body straight into a storable event record.
+    
+    Same rules as EventCreate, but parsed and validated in one pass by
+    pydantic-core with no model instance, and with the cross/shot rule
+    checked as a single lookup in VALID_OUTCOME_PAIRS. The result is the
+    record the session stores.
     
     Args:
-        session_id: Session identifier
-        event_data: Event data to create
+        body: Raw JSON request body
         
     Returns:
-        EventResponse: Created event with ID
+        Tuple[EventRecord, Optional[float]]: New event without an ID, and the
+        latency in seconds to stamp it with, or None if the client sent the
+        event time
+        
+    Raises:
+        RequestValidationError: If the body is invalid (answered with 422)
     """
-    # #region agent log
-    print(f'[DEBUG] create_event called: zone={event_data.zone}, type={type(event_data.zone)}')
-    # #endregion
-    state_manager = get_state_manager()
-    session_state = state_manager.get_or_create_session(session_id)
+    try:
+        fields = _create_adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)
+        ])
     
-    # Generate event ID (simple increment)
-    event_id = len(session_state.events)
+    cross_outcome = fields.get('cross_outcome')
+    shot_outcome = fields.get('shot_outcome')
+    if (cross_outcome, shot_outcome) not in VALID_OUTCOME_PAIRS:
+        raise RequestValidationError([{
+            'type': 'value_error',
+            'loc': ('body', 'shot_outcome'),
+            'msg': f"Value error, {SHOT_OUTCOME_ERROR}",
+            'input': shot_outcome,
+            'ctx': {'error': {}}
+        }])
+    sent = sum(fields.get(field) is not None for field in EVENT_TIME_FIELDS)
+    if sent not in (0, len(EVENT_TIME_FIELDS)):
+        raise RequestValidationError([{
+            'type': 'value_error',
+            'loc': ('body',),
+            'msg': f"Value error, {EVENT_TIME_ERROR}",
+            'input': {field: fields.get(field) for field in EVENT_TIME_FIELDS},
+            'ctx': {'error': {}}
+        }])
+    event = EventRecord.create(
+        fields.get('minute') or 0.0,
+        fields.get('second') or 0.0,
+        fields.get('time_in_second') or 0.0,
+        fields['team'],
+        fields['event_type'],
+        cross_outcome,
+        shot_outcome,
+        fields.get('zone')
+    )
+    latency = (fields.get('latency_ms') or 0.0) / 1000 if not sent else None
+    return event, latency
+
+
+def ingest_event(session_id: str, body: bytes) -> bytes:
+    """
+    Create an event from a raw JSON body.
     
-    # Create event dict
-    event_dict = {
-        'id': event_id,
-        'minute': event_data.minute,
-        'second': event_data.second,
-        'time_in_second': event_data.time_in_second,
-        'team': event_data.team,
-        'event_type': event_data.event_type,
-        'cross_outcome': event_data.cross_outcome,
-        'shot_outcome': event_data.shot_outcome,
-        'zone': event_data.zone,
-        'created_at': datetime.now()
-    }
+    The validated record is stamped from the stopwatch (its period, and its
+    time if the client sent none), stored as is and the response is encoded
+    from it directly; the same bytes are kept as the event's JSON fragment.
     
-    # #region agent log
-    print(f'[DEBUG] event_dict created: zone={event_dict["zone"]}, type={type(event_dict["zone"])}')
-    # #endregion
+    Args:
+        session_id: Session identifier
+        body: Raw EventCreate JSON body
+        
+    Returns:
+        bytes: Created event as EventResponse JSON
+        
+    Raises:
+        RequestValidationError: If the body is invalid
+    """
+    received_at = time.monotonic()
+    event, latency = parse_event_create(body)
     
-    # Store event
-    session_state.events.append(event_dict)
+    session_state = get_state_manager().get_or_create_session(session_id)
+    with session_state.lock:
+        if latency is not None:
+            stamp_event(session_state, event, received_at, latency)
+        else:
+            event.period = session_state.stopwatch.period
+        session_state.add_event(event)
+        fragment = _record_adapter.dump_json(event)
+        _get_json_fragments(session_state)[event.id] = fragment
+    return fragment
+
+
+def resolve_time_window(
+    session_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    last_seconds: Optional[float] = None
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Resolve time filter parameters into a [start, end) window in seconds.
     
-    # Update hot zone if zone is provided
-    if event_data.zone is not None:
-        session_state.hot_zones[event_data.zone] += 1
+    `last_seconds` selects the window ending at the current match time: the
+    stopwatch elapsed time, or the latest event if the stopwatch never ran.
+    It overrides `start_time` and `end_time`.
     
-    session_state.update_timestamp()
-    result = EventResponse(**event_dict)
-    # #region agent log
-    print(f'[DEBUG] EventResponse created: zone={result.zone}, type={type(result.zone)}')
-    # #endregion
-    return result
+    Args:
+        session_id: Session identifier
+        start_time: Window start in seconds
+        end_time: Window end in seconds (exclusive)
+        last_seconds: Length of the window ending now
+        
+    Returns:
+        Tuple[Optional[float], Optional[float]]: (start, end), None for unbounded
+    """
+    if last_seconds is None:
+        return start_time, end_time
+    
+    now = get_elapsed_time(session_id)
+    if now <= 0:
+        session_state = get_state_manager().get_or_create_session(session_id)
+        with session_state.lock:
+            now = session_state.events[-1].time_in_second if session_state.events else 0.0
+    # The end is exclusive, so nudge it past events tagged at exactly `now`
+    return max(0.0, now - last_seconds), now + 1e-6
 
 
-def get_events(session_id: str) -> List[EventResponse]:
+def get_events(
+    session_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> List[EventResponse]:
     """
-    Get all events for a session.
+    Get events for a session, sorted by match time.
     
     Args:
         session_id: Session identifier
+        start_time: Optional window start in seconds
+        end_time: Optional window end in seconds (exclusive)
         
     Returns:
         List[EventResponse]: List of events
     """
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
-    return [EventResponse(**event) for event in session_state.events]
+    events = session_state.events_in_window(start_time, end_time)
+    return [EventResponse.model_validate(event) for event in events]
 
 
-def delete_event(session_id: str, event_id: int) -> bool:
+def get_events_json(
+    session_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> bytes:
     """
-    Delete an event by ID.
+    Get events for a session as a JSON array, sorted by match time.
+    
+    Each event is encoded once (at creation, or on its first read for
+    imported and replayed events) and the fragment is kept in the session.
+    A read only joins the fragments.
     
     Args:
         session_id: Session identifier
-        event_id: Event ID to delete
+        start_time: Optional window start in seconds
+        end_time: Optional window end in seconds (exclusive)
         
     Returns:
-        bool: True if deleted, False if not found
+        bytes: JSON array of EventResponse objects
     """
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
+    with session_state.lock:
+        return encode_events(session_state, session_state.events_in_window(start_time, end_time))
+
+
+def parse_event_fields(fields: str) -> Optional[List[str]]:
+    """
+    Parse a comma-separated event field projection.
     
-    if event_id >= len(session_state.events):
-        return False
+    The event ID is always included, since it identifies rows and pages.
     
-    # Get event to check zone
-    event = session_state.events[event_id]
+    Args:
+        fields: e.g. "time_in_second,team,event_type" (empty for every field)
+        
+    Returns:
+        List[str]: Selected fields in EventResponse order, or None for all
+        
+    Raises:
+        ValueError: If a field is unknown
+    """
+    selected = {name.strip() for name in fields.split(',') if name.strip()}
+    if not selected:
+        return None
+    unknown = selected.difference(EVENT_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))} (valid: {', '.join(EVENT_FIELDS)})"
+        )
+    selected.add('id')
+    return [name for name in EVENT_FIELDS if name in selected]
+
+
+def encode_page_cursor(event: EventRecord) -> str:
+    """
+    Encode the keyset cursor pointing after an event.
     
-    # Remove from storage
-    del session_state.events[event_id]
+    Args:
+        event: Last event of a page
+        
+    Returns:
+        str: Cursor for the next page
+    """
+    return f"{event.time_in_second!r}:{event.id}"
+
+
+def decode_page_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a keyset cursor.
     
-    # Reindex remaining events
-    for i, evt in enumerate(session_state.events):
-        evt['id'] = i
+    Args:
+        cursor: Cursor returned with a previous page
+        
+    Returns:
+        Tuple[float, int]: (time_in_second, id) of the last event returned
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    time_part, separator, id_part = cursor.rpartition(':')
+    if not separator:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return float(time_part), int(id_part)
+
+
+def get_events_page_json(
+    session_id: str,
+    after: Optional[Tuple[float, int]] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+    fields: Optional[List[str]] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    event_filter: Optional[EventFilter] = None
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Get a page of events as a JSON array, by keyset on (time_in_second, id).
+    
+    Only the page is located (binary search) and encoded. Full events are
+    joined from their cached fragments; projected events are encoded with
+    just the selected fields. With a filter, the matching positions come
+    from the session's bitmap index.
+    
+    Args:
+        session_id: Session identifier
+        after: Decoded cursor of the previous page (None for the first page)
+        limit: Maximum number of events (None for no limit)
+        descending: Latest events first
+        fields: Fields to include (None for every field)
+        start_time: Optional window start in seconds
+        end_time: Optional window end in seconds (exclusive)
+        event_filter: Optional filter on indexed fields
+        
+    Returns:
+        Tuple[bytes, Optional[str]]: JSON array, and the cursor of the next
+        page (None on the last page)
+    """
+    session_state = get_state_manager().get_or_create_session(session_id)
+    with session_state.lock:
+        if event_filter is None:
+            page, has_more = session_state.events_page(after, limit, descending, start_time, end_time)
+        else:
+            lo, hi = session_state.page_bounds(after, descending, start_time, end_time)
+            positions = bitmap_positions(get_event_index(session_state).match(event_filter, lo, hi))
+            if descending:
+                positions = positions[::-1]
+            has_more = limit is not None and len(positions) > limit
+            page = [session_state.events[i] for i in positions[:limit]]
+        if fields is None:
+            content = encode_events(session_state, page)
+        else:
+            content = _record_list_adapter.dump_json(page, include={'__all__': set(fields)})
+    next_cursor = encode_page_cursor(page[-1]) if has_more else None
+    return content, next_cursor
+
+
+def encode_events(session_state: SessionState, events: List[EventRecord]) -> bytes:
+    """
+    Encode events of a session as a JSON array from their cached fragments.
+    
+    Must be called with the session lock held.
+    
+    Args:
+        session_state: Session the events belong to
+        events: Events to encode, in output order
+        
+    Returns:
+        bytes: JSON array of EventResponse objects
+    """
+    fragments = _get_json_fragments(session_state)
+    parts = []
+    for event in events:
+        fragment = fragments.get(event.id)
+        if fragment is None:
+            fragment = fragments[event.id] = _record_adapter.dump_json(event)
+        parts.append(fragment)
+    return b'[' + b','.join(parts) + b']'
+
+
+def delete_event(session_id: str, event_id: int) -> bool:
+    """
+    Delete an event by ID.
     
-    # Update hot zone if zone was set
-    if event.get('zone') is not None:
-        zone = event['zone']
-        if session_state.hot_zones.get(zone, 0) > 0:
-            session_state.hot_zones[zone] -= 1
+    Args:
+        session_id: Session identifier
+        event_id: Event ID to delete
+        
+    Returns:
+        bool: True if deleted, False if not found
+    """
+    state_manager = get_state_manager()
+    session_state = state_manager.get_or_create_session(session_id)
     
-    session_state.update_timestamp()
-    return True
+    return session_state.remove_event(event_id) is not None
 
 
-def get_events_dataframe(session_id: str) -> pd.DataFrame:
+def get_events_dataframe(
+    session_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> pd.DataFrame:
     """
     Get events as a DataFrame.
     
     Args:
         session_id: Session identifier
+        start_time: Optional window start in seconds
+        end_time: Optional window end in seconds (exclusive)
         
     Returns:
         pd.DataFrame: Events as DataFrame
     """
-    events = get_events(session_id)
+    session_state = get_state_manager().get_or_create_session(session_id)
+    events = session_state.events_in_window(start_time, end_time)
     if not events:
         return pd.DataFrame(columns=[
             'minute', 'second', 'time_in_second', 'team', 'event_type',
-            'cross_outcome', 'shot_outcome', 'zone'
+            'cross_outcome', 'shot_outcome', 'zone', 'period'
         ])
     
     return pd.DataFrame([{
@@ -141,49 +416,80 @@ def get_events_dataframe(session_id: str) -> pd.DataFrame:
         'event_type': e.event_type,
         'cross_outcome': e.cross_outcome,
         'shot_outcome': e.shot_outcome,
-        'zone': e.zone
+        'zone': e.zone,
+        'period': e.period
     } for e in events])
 
 
-def get_event_stats(session_id: str) -> List[EventStats]:
+def get_event_stats(
+    session_id: str,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    event_filter: Optional[EventFilter] = None
+) -> List[EventStats]:
     """
     Calculate event statistics per team.
     
+    Filtered stats are counted on the session's bitmap index.
+    
     Args:
         session_id: Session identifier
+        start_time: Optional window start in seconds
+        end_time: Optional window end in seconds (exclusive)
+        event_filter: Optional filter on indexed fields
         
     Returns:
-        List[EventStats]: Statistics for each team
+        List[EventStats]: Statistics for each team, in order of first appearance
     """
-    df = get_events_dataframe(session_id)
-    
-    if df.empty:
-        return []
-    
-    stats_list = []
-    for team in df['team'].unique():
-        team_df = df.loc[df['team'] == team, :]
-        stats = EventStats(
-            team=team,
-            goals=team_df['shot_outcome'].isin(['Goal']).sum(),
-            shots=len(team_df.loc[team_df['shot_outcome'] != 'None']),
-            shots_on_target=team_df['shot_outcome'].isin(['Goal', 'Save', 'Post']).sum(),
-            cross_attempts=len(team_df.loc[team_df['cross_outcome'] != 'None']),
-            cross_completed=len(team_df[team_df['cross_outcome'] == 'Completed']),
-            transitions=len(team_df[team_df['event_type'] == 'Transition'])
-        )
-        stats_list.append(stats)
+    session_state = get_state_manager().get_or_create_session(session_id)
+    if event_filter is None:
+        return build_event_stats(session_state.events_in_window(start_time, end_time))
+    with session_state.lock:
+        lo, hi = session_state.window_bounds(start_time, end_time)
+        index = get_event_index(session_state)
+        teams, counts = index.team_stats(index.match(event_filter, lo, hi))
+    return _event_stats(teams, counts)
+
+
+def build_event_stats(events: List[EventRecord]) -> List[EventStats]:
+    """
+    Calculate event statistics per team for a list of events.
     
-    return stats_list
+    Args:
+        events: Events to count
+        
+    Returns:
+        List[EventStats]: Statistics for each team, in order of first appearance
+    """
+    return _event_stats(*compute_team_stats(events))
+
+
+def _event_stats(teams: List[str], counts: np.ndarray) -> List[EventStats]:
+    fields = [(i, name) for i, name in enumerate(metric_names()) if name in EventStats.model_fields]
+    return [
+        EventStats(team=team, **{name: int(counts[row, i]) for i, name in fields})
+        for row, team in enumerate(teams)
+    ]
 
 
-def get_hot_zone(session_id: str, event_type: Optional[str] = None) -> Dict[int, int]:
+def get_hot_zone(
+    session_id: str,
+    event_type: Optional[str] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    event_filter: Optional[EventFilter] = None
+) -> Dict[int, int]:
     """
-    Get hot zone counts for a session, optionally filtered by event type.
+    Get hot zone counts for a session, optionally filtered by event type and time.
+    
+    Filtered counts are popcounts on the session's bitmap index.
     
     Args:
         session_id: Session identifier
         event_type: Optional event type filter (e.g., 'Transition', 'Corner', etc.)
+        start_time: Optional window start in seconds
+        end_time: Optional window end in seconds (exclusive)
+        event_filter: Optional filter on indexed fields
         
     Returns:
         Dict[int, int]: Zone number -> count mapping
@@ -191,17 +497,18 @@ def get_hot_zone(session_id: str, event_type: Optional[str] = None) -> Dict[int,
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
     
-    if event_type is None:
+    if event_type is None and start_time is None and end_time is None and event_filter is None:
         # Return all hot zones
         return dict(session_state.hot_zones)
     
-    # Filter by event type
-    hot_zones_filtered: Dict[int, int] = defaultdict(int)
-    for event in session_state.events:
-        if event.get('event_type') == event_type and event.get('zone') is not None:
-            hot_zones_filtered[event['zone']] += 1
-    
-    return dict(hot_zones_filtered)
+    if event_type is not None:
+        event_filter = (event_filter or EventFilter()).where('event_type', event_type)
+    with session_state.lock:
+        lo, hi = session_state.window_bounds(start_time, end_time)
+        index = get_event_index(session_state)
+        counts = index.value_counts('zone', index.match(event_filter, lo, hi))
+    counts.pop(None, None)
+    return counts
 
 
 def clear_session(session_id: str) -> None:
@@ -214,6 +521,69 @@ def clear_session(session_id: str) -> None:
     state_manager = get_state_manager()
     session_state = state_manager.get_session(session_id)
     if session_state:
-        session_state.events.clear()
-        session_state.hot_zones.clear()
-        session_state.update_timestamp()
+        session_state.clear_events()
+
+
+def get_event_changes(session_id: str, cursor: int, epoch: Optional[str] = None) -> EventDelta:
+    """
+    Get event changes since a client-supplied cursor.
+    
+    Creates and deletes in the window are collapsed, so an event created and
+    deleted after the cursor appears in neither list. If the cursor is no
+    longer covered by the retained change log, belongs to another epoch of
+    the session (it was recreated, e.g. after a restart), or the session was
+    cleared, the delta is a reset carrying the full event list.
+    
+    Args:
+        session_id: Session identifier
+        cursor: Last version seen by the client (0 for a fresh client)
+        epoch: Session epoch the cursor was issued in (None to skip the check)
+        
+    Returns:
+        EventDelta: Appended events, deleted IDs, stats, hot zones and the new cursor
+    """
+    state_manager = get_state_manager()
+    session_state = state_manager.get_or_create_session(session_id)
+    
+    with session_state.lock:
+        version = session_state.version
+        if epoch is not None and epoch != session_state.epoch:
+            changes = None
+        else:
+            changes = session_state.changes_since(cursor)
+        
+        if changes is None or any(change['op'] == 'clear' for change in changes):
+            return EventDelta(
+                cursor=version,
+                epoch=session_state.epoch,
+                reset=True,
+                appended=[EventResponse.model_validate(event) for event in session_state.events],
+                deleted=[],
+                stats=get_event_stats(session_id),
+                hot_zones=dict(session_state.hot_zones)
+            )
+        
+        if not changes:
+            return EventDelta(cursor=version, epoch=session_state.epoch, reset=False, appended=[], deleted=[], stats=None)
+        
+        appended: Dict[int, EventRecord] = {}
+        deleted: List[int] = []
+        for change in changes:
+            if change['op'] == 'create':
+                appended[change['event_id']] = change['event']
+            elif change['op'] == 'bulk':
+                for event in change['events']:
+                    appended[event.id] = event
+            elif change['op'] == 'delete':
+                if appended.pop(change['event_id'], None) is None:
+                    deleted.append(change['event_id'])
+        
+        return EventDelta(
+            cursor=version,
+            epoch=session_state.epoch,
+            reset=False,
+            appended=[EventResponse.model_validate(event) for event in appended.values()],
+            deleted=deleted,
+            stats=get_event_stats(session_id),
+            hot_zones=dict(session_state.hot_zones)
+        )
@@ -0,0 +1,481 @@
+"""
+Background export jobs.
+
+Submitting an export returns a job ID at once; a small, bounded pool of
+worker threads builds the file on local disk and reports progress per
+session. Workers run at a lower scheduling priority (Linux nice values are
+per thread), and the queue is bounded, so a batch export of a whole
+matchday cannot starve request handling during live tagging.
+
+Finished results are kept for RESULT_TTL_SECONDS and then deleted by a
+sweeper thread, together with their job. Files are written under a
+temporary name and renamed when complete, so a download never sees a
+partial file.
+"""
+import logging
+import os
+import tempfile
+import threading
+import uuid
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.models.export import ExportJobState, ExportJobStatus
+from app.services.event_service import get_events_dataframe
+from app.services.export_service import (
+    PARQUET_MEDIA_TYPE,
+    export_to_csv,
+    export_to_parquet,
+    export_to_xml
+)
+from app.services.snapshot_service import events_to_table
+from app.services.state_manager import get_state_manager
+from app.utils.worker_affinity import owner_key
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR_ENV = 'EVENT_TAGGER_EXPORT_DIR'
+
+EXPORT_WORKERS = 2
+
+# Jobs waiting or running at once; further submissions are refused
+MAX_PENDING_JOBS = 32
+
+# How long a finished result stays downloadable
+RESULT_TTL_SECONDS = 3600
+
+CLEANUP_INTERVAL_SECONDS = 60
+
+# Nice increment for worker threads (0 disables)
+WORKER_NICENESS = 10
+
+RESULT_SUFFIX = '.export'
+PARTIAL_SUFFIX = '.part'
+
+MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'xml': 'application/xml',
+    'zip': 'application/zip',
+    'parquet': PARQUET_MEDIA_TYPE,
+}
+
+FINISHED_STATES = frozenset({ExportJobState.DONE, ExportJobState.FAILED, ExportJobState.CANCELLED})
+
+
+class ExportQueueFullError(RuntimeError):
+    """Too many export jobs are pending."""
+
+
+class ExportCancelled(Exception):
+    """Raised inside a worker when its job was cancelled."""
+
+
+@dataclass
+class ExportJob:
+    """
+    An export job and its result.
+
+    Attributes:
+        job_id: Job identifier
+        format: Output format of each session
+        session_ids: Sessions to export (several are bundled in one ZIP)
+        filename: Download filename
+        path: Result file path (set when done)
+        cancel_requested: Set by cancel; workers stop at the next session
+    """
+    job_id: str
+    format: str
+    session_ids: List[str]
+    filename: str
+    state: ExportJobState = ExportJobState.QUEUED
+    sessions_done: int = 0
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+    path: Optional[str] = None
+    cancel_requested: bool = False
+    future: Optional[Future] = None
+
+    @property
+    def bundled(self) -> bool:
+        """Whether the result is a ZIP of several sessions."""
+        return len(self.session_ids) > 1
+
+    @property
+    def media_type(self) -> str:
+        """Media type of the result."""
+        return MEDIA_TYPES['zip' if self.bundled else self.format]
+
+    def to_status(self) -> ExportJobStatus:
+        """
+        Convert to the API status model.
+
+        Returns:
+            ExportJobStatus: Current status
+        """
+        return ExportJobStatus(
+            job_id=self.job_id,
+            state=self.state,
+            format=self.format,
+            session_ids=self.session_ids,
+            sessions_done=self.sessions_done,
+            progress=self.sessions_done / len(self.session_ids),
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            expires_at=self.expires_at,
+            size=self.size,
+            filename=self.filename,
+            error=self.error,
+            download_url=f"/api/export/jobs/{self.job_id}/download" if self.state == ExportJobState.DONE else None
+        )
+
+
+def _lower_priority():
+    """Worker initializer: make export threads yield the CPU to request handling."""
+    if not WORKER_NICENESS:
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), WORKER_NICENESS)
+    except (AttributeError, OSError):
+        # Not supported on this platform: run at normal priority
+        pass
+
+
+def _session_files(session_id: str, fmt: str, base_name: str) -> Dict[str, bytes]:
+    """
+    Build the export files of one session.
+
+    Args:
+        session_id: Session identifier
+        fmt: Output format
+        base_name: File name without extension
+
+    Returns:
+        Dict[str, bytes]: File name -> content (empty if the session has no events)
+    """
+    if fmt == 'parquet':
+        session_state = get_state_manager().get_session(session_id)
+        if session_state is None or not session_state.events:
+            return {}
+        with session_state.lock:
+            events = list(session_state.events)
+        return {f'{base_name}.parquet': export_to_parquet(events_to_table(events)).to_pybytes()}
+
+    df = get_events_dataframe(session_id)
+    if df.empty:
+        return {}
+    files = {}
+    if fmt in ('csv', 'zip'):
+        files[f'{base_name}.csv'] = export_to_csv(df).encode('utf-8')
+    if fmt in ('xml', 'zip'):
+        files[f'{base_name}_LiveTagProFormat.xml'] = export_to_xml(df).encode('utf-8')
+    return files
+
+
+class ExportJobQueue:
+    """
+    Bounded queue of export jobs with on-disk results.
+
+    Jobs live in memory; results are files in the export directory,
+    removed with their job once they expire.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        workers: int = EXPORT_WORKERS,
+        max_pending: int = MAX_PENDING_JOBS,
+        ttl: float = RESULT_TTL_SECONDS
+    ):
+        self.directory = directory
+        self.max_pending = max_pending
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+        self._remove_stale_files()
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ExportJob] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="export", initializer=_lower_priority
+        )
+        self._stopping = threading.Event()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="export-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _remove_stale_files(self):
+        """Delete results of a previous run (their jobs were not kept)."""
+        # Cluster workers share the directory; each removes only its own jobs
+        own_prefix = owner_key('')
+        for name in os.listdir(self.directory):
+            if not name.startswith(own_prefix):
+                continue
+            if name.endswith(RESULT_SUFFIX) or name.endswith(PARTIAL_SUFFIX):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def submit(self, session_ids: List[str], fmt: str, filename: Optional[str] = None) -> ExportJob:
+        """
+        Queue an export.
+
+        Args:
+            session_ids: Sessions to export (several are bundled in one ZIP)
+            fmt: Output format (csv, xml, zip or parquet)
+            filename: Base download filename (without extension)
+
+        Returns:
+            ExportJob: Queued job
+
+        Raises:
+            ExportQueueFullError: If MAX_PENDING_JOBS jobs are pending
+        """
+        session_ids = list(dict.fromkeys(session_ids))
+        bundled = len(session_ids) > 1
+        extension = 'zip' if bundled else fmt
+        base_name = filename or ('export' if bundled else 'events')
+        job = ExportJob(
+            job_id=owner_key(uuid.uuid4().hex),
+            format=fmt,
+            session_ids=session_ids,
+            filename=f'{base_name}.{extension}'
+        )
+        with self._lock:
+            pending = sum(1 for other in self._jobs.values() if other.state not in FINISHED_STATES)
+            if pending >= self.max_pending:
+                raise ExportQueueFullError(f"{pending} export jobs are pending; try again later")
+            self._jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            ExportJob or None if unknown or expired
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[ExportJob]:
+        """
+        Get every known job, oldest first.
+
+        Returns:
+            List[ExportJob]: Jobs
+        """
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job and delete its result.
+
+        A running job stops after the session it is writing.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            bool: True if the job existed
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            job.cancel_requested = True
+            if job.state not in FINISHED_STATES:
+                job.state = ExportJobState.CANCELLED
+                job.finished_at = datetime.now()
+        if job.future is not None:
+            job.future.cancel()
+        self._remove_result(job)
+        return True
+
+    def _run(self, job: ExportJob):
+        with self._lock:
+            if job.cancel_requested:
+                return
+            job.state = ExportJobState.RUNNING
+            job.started_at = datetime.now()
+
+        path = os.path.join(self.directory, job.job_id + RESULT_SUFFIX)
+        partial = path + PARTIAL_SUFFIX
+        try:
+            if job.bundled:
+                self._write_bundle(job, partial)
+            else:
+                self._write_single(job, partial)
+            os.replace(partial, path)
+        except ExportCancelled:
+            self._remove_file(partial)
+            return
+        except ValueError as e:
+            # Nothing to export
+            logger.warning("Export job failed: job_id=%s: %s", job.job_id, e)
+            self._remove_file(partial)
+            self._finish(job, ExportJobState.FAILED, error=str(e))
+            return
+        except Exception as e:
+            logger.exception("Export job failed: job_id=%s", job.job_id)
+            self._remove_file(partial)
+            self._finish(job, ExportJobState.FAILED, error=str(e))
+            return
+
+        if not self._finish(job, ExportJobState.DONE, path=path, size=os.path.getsize(path)):
+            # Cancelled while the file was being renamed
+            self._remove_file(path)
+
+    def _check_cancelled(self, job: ExportJob):
+        if job.cancel_requested or self._stopping.is_set():
+            raise ExportCancelled()
+
+    def _write_single(self, job: ExportJob, partial: str):
+        base_name = os.path.splitext(job.filename)[0]
+        files = _session_files(job.session_ids[0], job.format, base_name)
+        if not files:
+            raise ValueError("No events found for this session")
+        self._check_cancelled(job)
+        with open(partial, 'wb') as f:
+            if job.format == 'zip':
+                with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    for name, content in files.items():
+                        archive.writestr(name, content)
+            else:
+                f.write(next(iter(files.values())))
+        job.sessions_done = 1
+
+    def _write_bundle(self, job: ExportJob, partial: str):
+        written = 0
+        with zipfile.ZipFile(partial, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for session_id in job.session_ids:
+                self._check_cancelled(job)
+                # Session IDs become file names inside the archive
+                base_name = os.path.basename(session_id) or 'session'
+                for name, content in _session_files(session_id, job.format, base_name).items():
+                    archive.writestr(name, content)
+                    written += 1
+                job.sessions_done += 1
+        if not written:
+            raise ValueError("No events found in the requested sessions")
+
+    def _finish(self, job: ExportJob, state: ExportJobState, **fields) -> bool:
+        with self._lock:
+            if job.cancel_requested:
+                return False
+            now = datetime.now()
+            job.state = state
+            job.finished_at = now
+            job.expires_at = now + timedelta(seconds=self.ttl)
+            for name, value in fields.items():
+                setattr(job, name, value)
+            return True
+
+    def _remove_result(self, job: ExportJob):
+        if job.path is not None:
+            self._remove_file(job.path)
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """
+        Delete jobs (and results) past their expiry time.
+
+        Args:
+            now: Current time (defaults to now)
+
+        Returns:
+            int: Number of jobs removed
+        """
+        now = now or datetime.now()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.expires_at is not None and job.expires_at <= now
+            ]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            self._remove_result(job)
+        return len(expired)
+
+    def _sweep_loop(self):
+        while not self._stopping.wait(CLEANUP_INTERVAL_SECONDS):
+            try:
+                self.expire()
+            except Exception:
+                logger.exception("Export cleanup failed")
+
+    def close(self):
+        """Stop the workers and sweeper and delete every result."""
+        self._stopping.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._sweeper.join(timeout=10)
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            self._remove_result(job)
+
+
+# Global export queue instance (None until started)
+_export_queue: Optional[ExportJobQueue] = None
+
+
+def get_export_dir() -> str:
+    """
+    Get the directory export results are written to.
+
+    Returns:
+        str: EVENT_TAGGER_EXPORT_DIR, or a directory under the system temp dir
+    """
+    return os.environ.get(EXPORT_DIR_ENV) or os.path.join(tempfile.gettempdir(), 'event-tagger-exports')
+
+
+def start_export_queue(directory: Optional[str] = None) -> ExportJobQueue:
+    """
+    Start the background export queue.
+
+    Args:
+        directory: Results directory (defaults to get_export_dir())
+
+    Returns:
+        ExportJobQueue: Running queue
+    """
+    global _export_queue
+    _export_queue = ExportJobQueue(directory or get_export_dir())
+    return _export_queue
+
+
+def stop_export_queue():
+    """Stop the global export queue, if running."""
+    global _export_queue
+    if _export_queue is not None:
+        _export_queue.close()
+        _export_queue = None
+
+
+def get_export_queue() -> Optional[ExportJobQueue]:
+    """
+    Get the global export queue instance.
+
+    Returns:
+        ExportJobQueue or None if it is not running
+    """
+    return _export_queue
@@ -2,11 +2,23 @@
 Business logic for data export.
 """
 import pandas as pd
-from typing import Optional
+from typing import Iterator, Optional
 import io
 
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 from app.utils.data_manipulation import df_to_xml, save_df_to_csv, create_zip_file
 
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Formats that are already compressed and must not be gzipped again in transit
+PRECOMPRESSED_MEDIA_TYPES = frozenset({PARQUET_MEDIA_TYPE, "application/zip"})
+
+# Size of the slices a columnar export is streamed in
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 def export_to_csv(df: pd.DataFrame) -> str:
     """
@@ -46,3 +58,65 @@ def export_to_zip(df: pd.DataFrame, file_name: str) -> io.BytesIO:
         io.BytesIO: ZIP file as BytesIO buffer
     """
     return create_zip_file(df, file_name)
+
+
+def export_to_arrow(table: pa.Table) -> pa.Buffer:
+    """
+    Export an event table to an Arrow IPC file.
+    
+    Dictionary-encoded columns (team, event type, outcomes) are written as
+    dictionaries, so readers get categoricals without parsing strings.
+    
+    Args:
+        table: Event table (see snapshot_service.session_to_table)
+        
+    Returns:
+        pa.Buffer: Arrow IPC file content
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def export_to_parquet(table: pa.Table) -> pa.Buffer:
+    """
+    Export an event table to a Parquet file.
+    
+    Dictionary columns are written with Parquet dictionary encoding and the
+    Arrow schema is stored, so they read back as dictionary/categorical.
+    
+    Args:
+        table: Event table (see snapshot_service.session_to_table)
+        
+    Returns:
+        pa.Buffer: Parquet file content
+    """
+    dictionary_columns = [
+        field.name for field in table.schema if pa.types.is_dictionary(field.type)
+    ]
+    sink = pa.BufferOutputStream()
+    pq.write_table(
+        table,
+        sink,
+        compression='zstd',
+        use_dictionary=dictionary_columns,
+        store_schema=True
+    )
+    return sink.getvalue()
+
+
+def iter_buffer(buffer: pa.Buffer, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Yield a buffer in chunks without copying it.
+    
+    Args:
+        buffer: Buffer to stream
+        chunk_size: Maximum chunk length in bytes
+        
+    Yields:
+        memoryview: Consecutive slices of the buffer
+    """
+    view = memoryview(buffer)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
@@ -0,0 +1,196 @@
+"""
+Business logic for importing CSV and LiveTagPRO XML exports into a session.
+
+Files are parsed incrementally (chunked CSV, iterparse XML), validated as
+whole columns with the same rules as EventCreate, and stored with a single
+bulk insert, so hot zones are updated and listeners notified once.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.models.event import MAX_EVENT_MINUTES, MAX_EVENT_SECONDS, Team, CrossOutcome, ShotOutcome
+from app.models.session import Period
+from app.models.records import EventRecord
+from app.services.state_manager import get_state_manager
+from app.utils.data_manipulation import EVENT_COLUMNS, read_csv_chunks, split_time, xml_to_df
+
+REQUIRED_COLUMNS = ['time_in_second', 'team', 'event_type']
+
+# Number of invalid rows listed in a validation error
+MAX_REPORTED_ERRORS = 20
+
+CSV_CHUNK_ROWS = 5000
+
+TEAMS = [team.value for team in Team]
+CROSS_OUTCOMES = [outcome.value for outcome in CrossOutcome]
+SHOT_OUTCOMES = [outcome.value for outcome in ShotOutcome]
+PERIODS = [period.value for period in Period]
+
+
+def _blank(values: pd.Series) -> pd.Series:
+    return values.isna() | (values.astype(str).str.strip() == '')
+
+
+def validate_events(df: pd.DataFrame, first_row: int = 1) -> pd.DataFrame:
+    """
+    Validate and normalize imported events.
+
+    Args:
+        df: Parsed events; minute and second are derived from time_in_second
+            when missing
+        first_row: Row number of the first row, used in error messages
+
+    Returns:
+        pd.DataFrame: Events with the CSV export columns and clean dtypes
+
+    Raises:
+        ValueError: If columns are missing or any row is invalid
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+    time = pd.to_numeric(df['time_in_second'], errors='coerce')
+    if 'minute' in df.columns and 'second' in df.columns:
+        minute = pd.to_numeric(df['minute'], errors='coerce')
+        second = pd.to_numeric(df['second'], errors='coerce')
+    else:
+        minute, second = split_time(time)
+    team = df['team']
+    event_type = df['event_type']
+    cross = df['cross_outcome'] if 'cross_outcome' in df.columns else pd.Series(None, index=df.index)
+    shot = df['shot_outcome'] if 'shot_outcome' in df.columns else pd.Series(None, index=df.index)
+    raw_zone = df['zone'] if 'zone' in df.columns else pd.Series(None, index=df.index)
+    zone = pd.to_numeric(raw_zone, errors='coerce')
+    period = df['period'] if 'period' in df.columns else pd.Series(None, index=df.index)
+
+    shot_set = shot.notna() & (shot != 'None')
+    cross_set = cross.notna() & ~cross.isin(['None', 'Completed'])
+    checks = [
+        (time.isna() | (time < 0) | (time > MAX_EVENT_SECONDS), f"time_in_second must be a number between 0 and {MAX_EVENT_SECONDS}"),
+        (minute.isna() | (minute < 0) | (minute > MAX_EVENT_MINUTES), f"minute must be a number between 0 and {MAX_EVENT_MINUTES}"),
+        (second.isna() | (second < 0) | (second > 59), "second must be between 0 and 59"),
+        (~team.isin(TEAMS), f"team must be one of {', '.join(TEAMS)}"),
+        (_blank(event_type), "event_type is required"),
+        (cross.notna() & ~cross.isin(CROSS_OUTCOMES), f"cross_outcome must be one of {', '.join(CROSS_OUTCOMES)}"),
+        (shot.notna() & ~shot.isin(SHOT_OUTCOMES), f"shot_outcome must be one of {', '.join(SHOT_OUTCOMES)}"),
+        (shot_set & cross_set, "shot_outcome can only be set when cross_outcome is 'None' or 'Completed'"),
+        (~_blank(raw_zone) & (zone.isna() | (zone < 0) | (zone % 1 != 0)), "zone must be an integer >= 0"),
+        (period.notna() & ~period.isin(PERIODS), f"period must be one of {', '.join(PERIODS)}"),
+    ]
+
+    errors = []
+    for mask, message in checks:
+        for index in np.flatnonzero(mask.to_numpy())[:MAX_REPORTED_ERRORS]:
+            errors.append((int(index), message))
+    if errors:
+        errors.sort()
+        details = '; '.join(f"row {index + first_row}: {message}" for index, message in errors[:MAX_REPORTED_ERRORS])
+        raise ValueError(f"Invalid events: {details}")
+
+    return pd.DataFrame({
+        'minute': minute.astype(float),
+        'second': second.astype(float),
+        'time_in_second': time.astype(float),
+        'team': team.astype(object),
+        'event_type': event_type.astype(object),
+        'cross_outcome': cross.astype(object).where(cross.notna(), None),
+        'shot_outcome': shot.astype(object).where(shot.notna(), None),
+        'zone': zone.astype('Int64'),
+        'period': period.astype(object).where(period.notna(), None)
+    })[EVENT_COLUMNS]
+
+
+def parse_csv(source) -> pd.DataFrame:
+    """
+    Parse and validate a CSV export in chunks.
+
+    Args:
+        source: Path or file object
+
+    Returns:
+        pd.DataFrame: Validated events
+
+    Raises:
+        ValueError: If the file cannot be parsed or any row is invalid
+    """
+    chunks = []
+    first_row = 2  # Line 1 is the header
+    try:
+        for chunk in read_csv_chunks(source, chunksize=CSV_CHUNK_ROWS):
+            chunks.append(validate_events(chunk, first_row))
+            first_row += len(chunk)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid CSV: {e}")
+    if not chunks:
+        return validate_events(pd.DataFrame(columns=EVENT_COLUMNS))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def parse_xml(source, default_team: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parse and validate a LiveTagPRO XML export.
+
+    Args:
+        source: Path or binary file object
+        default_team: Team for instances without a Team label
+
+    Returns:
+        pd.DataFrame: Validated events
+
+    Raises:
+        ValueError: If the file cannot be parsed or any instance is invalid
+    """
+    from xml.etree.ElementTree import ParseError
+
+    try:
+        df = xml_to_df(source, default_team)
+    except ParseError as e:
+        raise ValueError(f"Invalid XML: {e}")
+    return validate_events(df)
+
+
+def dataframe_to_events(df: pd.DataFrame) -> List[EventRecord]:
+    """
+    Convert validated events to records ready for storage.
+
+    Args:
+        df: Output of validate_events
+
+    Returns:
+        List[EventRecord]: Events without IDs, all stamped with the import time
+    """
+    created_at = datetime.now()
+    columns = {
+        column: df[column].astype(object).where(df[column].notna(), None).tolist()
+        for column in EVENT_COLUMNS
+    }
+    return [
+        EventRecord.create(*values, created_at=created_at)
+        for values in zip(*(columns[column] for column in EVENT_COLUMNS))
+    ]
+
+
+def import_events(session_id: str, df: pd.DataFrame, replace: bool = False) -> int:
+    """
+    Load validated events into a session in one bulk insert.
+
+    Args:
+        session_id: Session identifier
+        df: Output of validate_events
+        replace: Clear the session's events first
+
+    Returns:
+        int: Number of events imported
+    """
+    events = dataframe_to_events(df)
+    session_state = get_state_manager().get_or_create_session(session_id)
+    with session_state.lock:
+        if replace:
+            session_state.clear_events()
+        session_state.add_events(events)
+    return len(events)
@@ -0,0 +1,331 @@
+"""
+Per-session bitmap indexes over the categorical event fields.
+
+For every indexed field (team, event_type, outcomes, zone, period) each
+distinct value has a bitmap with bit i set when events[i] holds the value,
+i being the position in the session's time-sorted events. A filter is then
+resolved with bitwise operations: OR across the values of one clause, AND
+across clauses, and the time window is a contiguous run of bits found by
+binary search. Counting (stats, hot zones) is a popcount of the result
+ANDed with another bitmap; no event is visited.
+
+Bitmaps are plain Python integers, which are arbitrary-length bitsets with
+C-speed AND/OR/popcount. The index is kept in session_state.views, extended
+in place when an event is appended at the end of the match timeline (live
+tagging), and rebuilt on its next use after any other change.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.records import EventRecord
+from app.services.state_manager import SessionState, get_state_manager
+from app.services.stats_service import METRICS, factorize, metric_columns
+
+# Session view holding the EventIndex
+VIEW_KEY = 'event_index'
+
+# Event fields a filter can select on
+INDEXED_FIELDS = ('team', 'event_type', 'cross_outcome', 'shot_outcome', 'zone', 'period')
+
+# Filter token matching a missing value
+NULL_TOKEN = 'null'
+
+# Filter syntax, for API parameter descriptions
+FILTER_SYNTAX = (
+    f"Comma-separated field:value clauses, all required ({', '.join(INDEXED_FIELDS)}); "
+    f"'|' between alternative values, leading '-' to exclude them, '{NULL_TOKEN}' for a missing value"
+)
+
+
+@dataclass(frozen=True)
+class FilterClause:
+    """
+    One condition of an event filter.
+
+    Attributes:
+        field: Indexed event field
+        values: Accepted values (None for a missing value)
+        negate: Match events whose value is not one of `values`
+    """
+    field: str
+    values: FrozenSet[Any]
+    negate: bool = False
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """
+    A conjunction of clauses over indexed event fields.
+
+    Attributes:
+        clauses: Conditions an event must all satisfy
+    """
+    clauses: Tuple[FilterClause, ...] = ()
+
+    def where(self, field: str, value: Any) -> 'EventFilter':
+        """
+        Add an equality clause.
+
+        Args:
+            field: Indexed event field
+            value: Required value
+
+        Returns:
+            EventFilter: Filter with the extra clause
+        """
+        return EventFilter(self.clauses + (FilterClause(field, frozenset([value])),))
+
+    @property
+    def key(self) -> str:
+        """Canonical text of the filter, equal for equivalent filters (cache keys)."""
+        parts = sorted(
+            ('-' if clause.negate else '') + clause.field + ':'
+            + '|'.join(sorted(NULL_TOKEN if v is None else str(v) for v in clause.values))
+            for clause in self.clauses
+        )
+        return ','.join(parts)
+
+
+def _parse_value(field: str, token: str) -> Any:
+    if token == NULL_TOKEN:
+        return None
+    if field == 'zone':
+        try:
+            return int(token)
+        except ValueError:
+            raise ValueError(f"Invalid zone in filter: {token}") from None
+    return token
+
+
+def parse_event_filter(text: str) -> Optional[EventFilter]:
+    """
+    Parse a filter expression.
+
+    Clauses are comma-separated and all must hold. A clause is
+    `field:value`, with `|` between alternative values and a leading `-`
+    to exclude them; `null` matches a missing value. For example
+    `team:Home,event_type:Shot|Corner,-shot_outcome:None|null`.
+
+    Args:
+        text: Filter expression (empty for no filter)
+
+    Returns:
+        EventFilter: Parsed filter, or None if the expression is empty
+
+    Raises:
+        ValueError: If a clause is malformed or names an unknown field
+    """
+    clauses = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        negate = part.startswith('-')
+        field, separator, values = part.lstrip('-').partition(':')
+        field = field.strip()
+        if not separator or not values:
+            raise ValueError(f"Invalid filter clause: {part} (expected field:value)")
+        if field not in INDEXED_FIELDS:
+            raise ValueError(
+                f"Unknown filter field: {field} (valid: {', '.join(INDEXED_FIELDS)})"
+            )
+        tokens = frozenset(_parse_value(field, token.strip()) for token in values.split('|'))
+        clauses.append(FilterClause(field, tokens, negate))
+    return EventFilter(tuple(clauses)) if clauses else None
+
+
+def _bitmap(mask: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+def range_mask(lo: int, hi: int) -> int:
+    """
+    Get the bitmap of positions lo <= i < hi.
+
+    Args:
+        lo: First position
+        hi: End position (exclusive)
+
+    Returns:
+        int: Bitmap
+    """
+    if hi <= lo:
+        return 0
+    return ((1 << (hi - lo)) - 1) << lo
+
+
+def bitmap_positions(bitmap: int) -> np.ndarray:
+    """
+    Get the positions of the set bits of a bitmap.
+
+    Args:
+        bitmap: Bitmap
+
+    Returns:
+        np.ndarray: Positions in increasing order
+    """
+    if not bitmap:
+        return np.zeros(0, dtype=np.intp)
+    raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder='little'))
+
+
+def _lowest_bit(bitmap: int) -> int:
+    return (bitmap & -bitmap).bit_length()
+
+
+class EventIndex:
+    """
+    Value bitmaps of one session's events, by position in session_state.events.
+
+    Attributes:
+        version: Session version the index reflects
+        size: Number of indexed events
+        bitmaps: Field -> value -> bitmap
+    """
+    __slots__ = ('version', 'size', 'bitmaps')
+
+    def __init__(self, events: List[EventRecord], version: int):
+        self.version = version
+        self.size = len(events)
+        self.bitmaps: Dict[str, Dict[Any, int]] = {}
+        for field in index_fields():
+            codes, values = factorize([getattr(event, field) for event in events])
+            self.bitmaps[field] = {value: _bitmap(codes == code) for code, value in enumerate(values)}
+
+    def append(self, event: EventRecord, version: int):
+        """
+        Index an event stored after every indexed event.
+
+        Args:
+            event: Event at position `size`
+            version: Session version after the event was stored
+        """
+        bit = 1 << self.size
+        for field, bitmaps in self.bitmaps.items():
+            value = getattr(event, field)
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+        self.size += 1
+        self.version = version
+
+    def match(self, event_filter: Optional[EventFilter], lo: int = 0, hi: Optional[int] = None) -> int:
+        """
+        Get the bitmap of events matching a filter within a position range.
+
+        Args:
+            event_filter: Filter (None matches every event)
+            lo: First position
+            hi: End position, exclusive (None for the end)
+
+        Returns:
+            int: Bitmap of matching positions
+        """
+        result = range_mask(lo, self.size if hi is None else min(hi, self.size))
+        if event_filter is None:
+            return result
+        for clause in event_filter.clauses:
+            bitmaps = self.bitmaps[clause.field]
+            selected = 0
+            for value in clause.values:
+                selected |= bitmaps.get(value, 0)
+            if clause.negate:
+                result &= ~selected
+            else:
+                result &= selected
+            if not result:
+                break
+        return result
+
+    def value_counts(self, field: str, bitmap: int) -> Dict[Any, int]:
+        """
+        Count the events of a bitmap per value of a field.
+
+        Args:
+            field: Indexed field
+            bitmap: Events to count
+
+        Returns:
+            Dict[Any, int]: Value -> count, for values with events
+        """
+        counts = {}
+        for value, bits in self.bitmaps[field].items():
+            count = (bits & bitmap).bit_count()
+            if count:
+                counts[value] = count
+        return counts
+
+    def team_stats(self, bitmap: int) -> Tuple[List[str], np.ndarray]:
+        """
+        Count every registered metric per team for the events of a bitmap.
+
+        Args:
+            bitmap: Events to count
+
+        Returns:
+            Tuple[List[str], np.ndarray]: Teams in order of first appearance,
+            and their (n_teams, n_metrics) counts in METRICS order (as
+            stats_service.compute_team_stats)
+        """
+        team_bits = [(team, bits & bitmap) for team, bits in self.bitmaps['team'].items()]
+        team_bits = sorted([item for item in team_bits if item[1]], key=lambda item: _lowest_bit(item[1]))
+        counts = np.zeros((len(team_bits), len(METRICS)), dtype=np.int64)
+        for i, metric in enumerate(METRICS):
+            metric_bits = 0
+            for value, bits in self.bitmaps[metric.column].items():
+                if metric.predicate(value):
+                    metric_bits |= bits
+            for row, (_, bits) in enumerate(team_bits):
+                counts[row, i] = (bits & metric_bits).bit_count()
+        return [team for team, _ in team_bits], counts
+
+
+def index_fields() -> List[str]:
+    """
+    Get the fields the index covers.
+
+    Returns:
+        List[str]: INDEXED_FIELDS, then any other column read by a metric
+    """
+    return list(dict.fromkeys(INDEXED_FIELDS + tuple(metric_columns())))
+
+
+def get_event_index(session_state: SessionState) -> EventIndex:
+    """
+    Get a session's event index, building it if it is missing or stale.
+
+    Must be called with the session lock held.
+
+    Args:
+        session_state: Session state
+
+    Returns:
+        EventIndex: Index of session_state.events
+    """
+    index = session_state.views.get(VIEW_KEY)
+    if index is None or index.version != session_state.version:
+        index = session_state.views[VIEW_KEY] = EventIndex(session_state.events, session_state.version)
+    return index
+
+
+def _on_change(session_state: SessionState, change: Dict):
+    """State manager listener extending the index with appended events."""
+    index = session_state.views.get(VIEW_KEY)
+    if index is None or change['op'] == 'stopwatch':
+        return
+    events = session_state.events
+    appended = (
+        change['op'] == 'create'
+        and index.version == change['version'] - 1
+        and index.size == len(events) - 1
+        and events[-1] is change['event']
+    )
+    if appended:
+        index.append(change['event'], change['version'])
+    else:
+        # Positions shifted; rebuild on next use and free the stale bitmaps now
+        del session_state.views[VIEW_KEY]
+
+
+get_state_manager().add_listener(_on_change)
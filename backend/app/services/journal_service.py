@@ -0,0 +1,416 @@
+"""
+Write-ahead journal for crash recovery.
+
+Every event mutation and stopwatch transition is appended as one NDJSON line
+to a per-session journal file. Appends only serialize the record and queue it,
+so the request path stays in the sub-millisecond range. A single writer thread
+drains the queue, writes each batch and fsyncs every touched file once (group
+commit), bounding the window of unsynced records to one fsync.
+
+Every SNAPSHOT_INTERVAL records the session is written to a snapshot file and
+its journal is truncated, which bounds replay time on startup.
+
+The journal is enabled by setting EVENT_TAGGER_JOURNAL_DIR (see app/main.py).
+"""
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from app.models.records import EventRecord, StopwatchState
+from app.services.state_manager import SessionState, StateManager
+from app.utils.worker_affinity import owns_session
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_DIR_ENV = "EVENT_TAGGER_JOURNAL_DIR"
+
+JOURNAL_SUFFIX = ".journal.ndjson"
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+# Journal records per session before it is compacted into a snapshot
+SNAPSHOT_INTERVAL = 1000
+
+
+def _encode_event(event: EventRecord) -> Dict:
+    encoded = event.to_dict()
+    if isinstance(encoded.get('created_at'), datetime):
+        encoded['created_at'] = encoded['created_at'].isoformat()
+    return encoded
+
+
+def _decode_event(event: Dict) -> EventRecord:
+    decoded = dict(event)
+    if decoded.get('created_at'):
+        decoded['created_at'] = datetime.fromisoformat(decoded['created_at'])
+    return EventRecord.from_dict(decoded)
+
+
+def _encode_stopwatch(stopwatch: StopwatchState) -> Dict:
+    return stopwatch.to_dict()
+
+
+def _apply_stopwatch(session_state: SessionState, data: Dict):
+    session_state.stopwatch.load(data)
+
+
+def _copy_session(session_state: SessionState) -> Tuple[Dict, List[EventRecord]]:
+    """Copy a session's fields and event list; the caller holds its lock."""
+    fields = {
+        'session_id': session_state.session_id,
+        'version': session_state.version,
+        'epoch': session_state.epoch,
+        'next_event_id': session_state.next_event_id,
+        'created_at': session_state.created_at.isoformat(),
+        'stopwatch': _encode_stopwatch(session_state.stopwatch)
+    }
+    return fields, list(session_state.events)
+
+
+def session_to_dict(session_state: SessionState) -> Dict:
+    """
+    Serialize a session to a JSON-compatible dict.
+
+    Only the copy of the session is taken under its lock; the events are
+    encoded after releasing it.
+
+    Args:
+        session_state: Session to serialize
+
+    Returns:
+        dict: Session snapshot
+    """
+    with session_state.lock:
+        snapshot, events = _copy_session(session_state)
+    snapshot['events'] = [_encode_event(event) for event in events]
+    return snapshot
+
+
+def apply_record(session_state: SessionState, record: Dict):
+    """
+    Apply one journal record to a session.
+
+    Args:
+        session_state: Session being rebuilt
+        record: Decoded journal record
+    """
+    op = record['op']
+    if op == 'create':
+        session_state.add_event(_decode_event(record['event']))
+    elif op == 'bulk':
+        session_state.add_events([_decode_event(event) for event in record['events']])
+    elif op == 'delete':
+        session_state.remove_event(record['event_id'])
+    elif op == 'clear':
+        session_state.clear_events()
+    elif op == 'stopwatch':
+        _apply_stopwatch(session_state, record['stopwatch'])
+    else:
+        logger.warning("Unknown journal record op: %s", op)
+
+
+class Journal:
+    """
+    Append-only, group-committed journal of session changes.
+
+    Register it with StateManager.add_listener (see attach) to journal every
+    change; records are written by a background thread.
+    """
+
+    def __init__(self, directory: str, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._pending: Deque[Tuple[str, bytes]] = deque()
+        self._cond = threading.Condition()
+        self._appended = 0
+        self._written = 0
+        self._files: Dict[str, object] = {}
+        self._record_counts: Dict[str, int] = {}
+        # Last journal record sequence number per session
+        self._sequences: Dict[str, int] = {}
+        self._sessions: Dict[str, SessionState] = {}
+        self._state_manager: Optional[StateManager] = None
+        self._recovering = False
+        self._stopping = False
+        self._writer = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def _path(self, session_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, quote(session_id, safe='') + suffix)
+
+    def attach(self, state_manager: StateManager):
+        """
+        Start journaling changes of a state manager.
+
+        Args:
+            state_manager: State manager to observe
+        """
+        self._state_manager = state_manager
+        state_manager.add_listener(self.on_change)
+
+    def on_change(self, session_state: SessionState, change: Dict):
+        """
+        State manager listener: serialize the change and queue it.
+
+        Args:
+            session_state: Changed session (its lock is held)
+            change: Change log entry
+        """
+        if self._recovering:
+            return
+
+        op = change['op']
+        # Stopwatch records do not bump the version, so snapshots mark the
+        # records they cover by this sequence number instead
+        sequence = self._sequences.get(session_state.session_id, 0) + 1
+        self._sequences[session_state.session_id] = sequence
+        record = {'op': op, 'v': change['version'], 's': sequence}
+        if op == 'create':
+            record['event'] = _encode_event(change['event'])
+        elif op == 'bulk':
+            record['events'] = [_encode_event(event) for event in change['events']]
+        elif op == 'delete':
+            record['event_id'] = change['event_id']
+        elif op == 'stopwatch':
+            record['stopwatch'] = _encode_stopwatch(session_state.stopwatch)
+
+        line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self._cond:
+            self._sessions[session_state.session_id] = session_state
+            self._pending.append((session_state.session_id, line))
+            self._appended += 1
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued record is written and fsynced.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if the journal caught up
+        """
+        with self._cond:
+            target = self._appended
+            return self._cond.wait_for(lambda: self._written >= target, timeout=timeout)
+
+    def close(self):
+        """Flush pending records and stop the writer thread."""
+        self.flush(timeout=10)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._writer.join(timeout=10)
+        for handle in self._files.values():
+            handle.close()
+        self._files.clear()
+        if self._state_manager is not None:
+            self._state_manager.remove_listener(self.on_change)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending and self._stopping:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+
+            # Group commit: one write and one fsync per session per batch
+            lines_by_session: Dict[str, list] = {}
+            for session_id, line in batch:
+                lines_by_session.setdefault(session_id, []).append(line)
+
+            to_snapshot = []
+            for session_id, lines in lines_by_session.items():
+                try:
+                    handle = self._files.get(session_id)
+                    if handle is None:
+                        handle = open(self._path(session_id, JOURNAL_SUFFIX), 'ab')
+                        self._files[session_id] = handle
+                    handle.write(b''.join(lines))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                except OSError:
+                    logger.exception("Journal write failed: session_id=%s", session_id)
+                    continue
+                count = self._record_counts.get(session_id, 0) + len(lines)
+                self._record_counts[session_id] = count
+                if count >= self.snapshot_interval:
+                    to_snapshot.append(session_id)
+
+            for session_id in to_snapshot:
+                self._snapshot(session_id)
+
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+    def _snapshot(self, session_id: str):
+        """Write a session snapshot and truncate its journal."""
+        session_state = self._sessions.get(session_id)
+        if session_state is None:
+            return
+
+        # Records are numbered under the session lock, so the sequence read
+        # with the session copy marks exactly the records the snapshot covers.
+        # Covered records still queued are written to the fresh journal and
+        # skipped on recovery; only this thread writes, so none are lost.
+        with session_state.lock:
+            snapshot, events = _copy_session(session_state)
+            snapshot['sequence'] = self._sequences.get(session_id, 0)
+        snapshot['events'] = [_encode_event(event) for event in events]
+
+        snapshot_path = self._path(session_id, SNAPSHOT_SUFFIX)
+        tmp_path = snapshot_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, snapshot_path)
+
+            handle = self._files.pop(session_id, None)
+            if handle is not None:
+                handle.close()
+            with open(self._path(session_id, JOURNAL_SUFFIX), 'wb') as f:
+                os.fsync(f.fileno())
+        except OSError:
+            logger.exception("Journal snapshot failed: session_id=%s", session_id)
+            return
+        self._record_counts[session_id] = 0
+
+    def recover(self, state_manager: StateManager) -> int:
+        """
+        Rebuild sessions from snapshots and journals on disk.
+
+        In multi-worker mode the workers share the journal directory and
+        each recovers only the sessions routed to it.
+
+        Args:
+            state_manager: State manager to load sessions into
+
+        Returns:
+            int: Number of sessions recovered
+        """
+        session_ids = set()
+        for name in os.listdir(self.directory):
+            for suffix in (JOURNAL_SUFFIX, SNAPSHOT_SUFFIX):
+                if name.endswith(suffix):
+                    session_id = unquote(name[:-len(suffix)])
+                    if owns_session(session_id):
+                        session_ids.add(session_id)
+
+        self._recovering = True
+        try:
+            for session_id in sorted(session_ids):
+                self._recover_session(state_manager, session_id)
+        finally:
+            self._recovering = False
+
+        logger.info("Recovered %d sessions from %s", len(session_ids), self.directory)
+        return len(session_ids)
+
+    def _recover_session(self, state_manager: StateManager, session_id: str):
+        session_state = state_manager.get_or_create_session(session_id)
+        count = 0
+        snapshot_version = 0
+        snapshot_sequence = None
+        with session_state.lock:
+            snapshot_path = self._path(session_id, SNAPSHOT_SUFFIX)
+            if os.path.exists(snapshot_path):
+                with open(snapshot_path, encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                snapshot_version = snapshot['version']
+                snapshot_sequence = snapshot.get('sequence')
+                session_state.created_at = datetime.fromisoformat(snapshot['created_at'])
+                # Keep the epoch so clients' delta cursors stay valid
+                session_state.epoch = snapshot.get('epoch', session_state.epoch)
+                session_state.add_events([_decode_event(event) for event in snapshot['events']])
+                session_state.next_event_id = max(session_state.next_event_id, snapshot['next_event_id'])
+                _apply_stopwatch(session_state, snapshot['stopwatch'])
+
+            version = snapshot_version
+            sequence = snapshot_sequence or 0
+            journal_path = self._path(session_id, JOURNAL_SUFFIX)
+            if os.path.exists(journal_path):
+                with open(journal_path, 'rb') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # Torn write at the tail from a crash mid-append
+                            logger.warning("Skipping corrupt journal record: session_id=%s", session_id)
+                            break
+                        count += 1
+                        # Records already covered by the snapshot survive if a
+                        # crash hit between writing it and truncating the journal
+                        if snapshot_sequence is not None and 's' in record:
+                            covered = record['s'] <= snapshot_sequence
+                        else:
+                            # Written before records were numbered
+                            covered = record['op'] != 'stopwatch' and record['v'] <= snapshot_version
+                        sequence = max(sequence, record.get('s', 0))
+                        if covered:
+                            continue
+                        apply_record(session_state, record)
+                        version = max(version, record['v'])
+
+            # Continue the original version sequence; clients holding older
+            # cursors get a full resync since the change log starts empty
+            session_state.version = max(session_state.version, version)
+            session_state.change_log.clear()
+            self._sessions[session_id] = session_state
+            self._record_counts[session_id] = count
+            self._sequences[session_id] = sequence
+
+
+# Global journal instance (None when journaling is disabled)
+_journal: Optional[Journal] = None
+
+
+def start_journal(state_manager: StateManager, directory: Optional[str] = None) -> Optional[Journal]:
+    """
+    Recover sessions and start journaling if a journal directory is configured.
+
+    Args:
+        state_manager: State manager to recover into and observe
+        directory: Journal directory (defaults to $EVENT_TAGGER_JOURNAL_DIR)
+
+    Returns:
+        Journal or None if journaling is disabled
+    """
+    global _journal
+    directory = directory or os.environ.get(JOURNAL_DIR_ENV)
+    if not directory:
+        return None
+
+    _journal = Journal(directory)
+    _journal.recover(state_manager)
+    _journal.attach(state_manager)
+    return _journal
+
+
+def stop_journal():
+    """Flush and close the global journal, if running."""
+    global _journal
+    if _journal is not None:
+        _journal.close()
+        _journal = None
+
+
+def get_journal() -> Optional[Journal]:
+    """
+    Get the global journal instance.
+
+    Returns:
+        Journal or None if journaling is disabled
+    """
+    return _journal
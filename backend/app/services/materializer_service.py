@@ -0,0 +1,257 @@
+"""
+Background materialization of session stats and charts.
+
+A StateManager listener marks a session dirty on every event mutation; the
+listener only records a deadline, so writes stay cheap. A worker thread
+waits for the session to settle (trailing debounce, bounded by a maximum
+delay under continuous tagging), then rebuilds its stats, divergent chart
+and default-grid heatmap and stores them as encoded JSON in the session's
+views. The endpoints serve those bytes while they match the session
+version, and fall back to computing on demand (through the same
+single-flight functions the worker uses) when they do not.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from plotly.io.json import to_json_plotly
+from pydantic import TypeAdapter
+
+from app.models.event import EventStats
+from app.services.event_service import get_event_stats
+from app.services.state_manager import SessionState, StateManager, get_state_manager
+from app.services.visualization_service import get_divergent_chart, get_heatmap
+
+logger = logging.getLogger(__name__)
+
+# Session view holding the materialized payloads and the version they cover
+VIEW_KEY = 'materialized'
+
+# Quiet time after the last mutation before a session is rebuilt
+DEBOUNCE_SECONDS = 0.5
+
+# Longest a dirty session waits while mutations keep arriving
+MAX_DELAY_SECONDS = 2.0
+
+# Heatmap parameters of the default pitch view (rows, columns, field dimensions)
+DEFAULT_HEATMAP = (3, 3, (120.0, 80.0))
+
+MATERIALIZED_OPS = frozenset({'create', 'bulk', 'delete', 'clear'})
+
+_stats_adapter = TypeAdapter(List[EventStats])
+
+
+def _encode_figure(figure: Optional[Dict]) -> Optional[bytes]:
+    return to_json_plotly(figure).encode('utf-8') if figure is not None else None
+
+
+def _build_stats(session_id: str) -> bytes:
+    return _stats_adapter.dump_json(get_event_stats(session_id))
+
+
+def _build_divergent_chart(session_id: str) -> Optional[bytes]:
+    return _encode_figure(get_divergent_chart(session_id))
+
+
+def _build_heatmap(session_id: str) -> Optional[bytes]:
+    rows, columns, field_dimen = DEFAULT_HEATMAP
+    return _encode_figure(get_heatmap(session_id, rows, columns, field_dimen))
+
+
+# View name -> builder returning the encoded payload (None: no data to show)
+BUILDERS: Dict[str, Callable[[str], Optional[bytes]]] = {
+    'stats': _build_stats,
+    'divergent_chart': _build_divergent_chart,
+    'heatmap': _build_heatmap,
+}
+
+
+def is_default_heatmap(rows: int, columns: int, field_length: float, field_width: float) -> bool:
+    """
+    Check whether heatmap parameters match the materialized default view.
+
+    Args:
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        field_length: Field length in meters
+        field_width: Field width in meters
+
+    Returns:
+        bool: True if the heatmap is materialized in the background
+    """
+    return (rows, columns, (field_length, field_width)) == DEFAULT_HEATMAP
+
+
+def get_materialized(session_id: str, name: str) -> Tuple[bool, Optional[bytes]]:
+    """
+    Get a materialized payload if it is current.
+
+    Args:
+        session_id: Session identifier
+        name: View name (see BUILDERS)
+
+    Returns:
+        Tuple[bool, Optional[bytes]]: Whether the view is materialized for the
+        session's current version, and its JSON (None if there was no data)
+    """
+    session_state = get_state_manager().get_session(session_id)
+    if session_state is None:
+        return False, None
+    entry = session_state.views.get(VIEW_KEY)
+    if entry is None or entry['version'] != session_state.version or name not in entry:
+        return False, None
+    return True, entry[name]
+
+
+class Materializer:
+    """
+    Debounced background rebuilder of session stats and charts.
+
+    Register it with StateManager.add_listener (see attach); rebuilds run
+    on a single worker thread.
+    """
+
+    def __init__(self, debounce: float = DEBOUNCE_SECONDS, max_delay: float = MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        # Session ID -> (first dirty time, rebuild deadline)
+        self._dirty: Dict[str, Tuple[float, float]] = {}
+        self._sessions: Dict[str, SessionState] = {}
+        self._state_manager: Optional[StateManager] = None
+        self._stopping = False
+        self._worker = threading.Thread(target=self._run, name="materializer", daemon=True)
+        self._worker.start()
+
+    def attach(self, state_manager: StateManager):
+        """
+        Start materializing sessions of a state manager.
+
+        Args:
+            state_manager: State manager to observe
+        """
+        self._state_manager = state_manager
+        state_manager.add_listener(self.on_change)
+
+    def on_change(self, session_state: SessionState, change: Dict):
+        """
+        State manager listener: schedule a rebuild of the session.
+
+        Args:
+            session_state: Changed session (its lock is held)
+            change: Change log entry
+        """
+        if change['op'] not in MATERIALIZED_OPS:
+            return
+        now = time.monotonic()
+        with self._cond:
+            first = self._dirty[session_state.session_id][0] if session_state.session_id in self._dirty else now
+            self._dirty[session_state.session_id] = (first, min(now + self.debounce, first + self.max_delay))
+            self._sessions[session_state.session_id] = session_state
+            self._cond.notify()
+
+    def pending(self) -> int:
+        """
+        Get the number of sessions waiting to be rebuilt.
+
+        Returns:
+            int: Dirty session count
+        """
+        with self._cond:
+            return len(self._dirty)
+
+    def close(self):
+        """Stop the worker thread; pending rebuilds are dropped."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._worker.join(timeout=10)
+        if self._state_manager is not None:
+            self._state_manager.remove_listener(self.on_change)
+
+    def _next_session(self) -> Optional[SessionState]:
+        with self._cond:
+            while not self._stopping:
+                if not self._dirty:
+                    self._cond.wait()
+                    continue
+                session_id, (_, deadline) = min(self._dirty.items(), key=lambda item: item[1][1])
+                wait = deadline - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                del self._dirty[session_id]
+                return self._sessions.pop(session_id)
+            return None
+
+    def _run(self):
+        while True:
+            session_state = self._next_session()
+            if session_state is None:
+                return
+            self.materialize(session_state)
+
+    def materialize(self, session_state: SessionState):
+        """
+        Rebuild and store every materialized view of a session.
+
+        A view whose builder fails is left out, so its endpoint computes it
+        on demand (and reports the error) instead.
+
+        Args:
+            session_state: Session to rebuild
+        """
+        session_id = session_state.session_id
+        # Read before the data: the views are at least as new as this version
+        version = session_state.version
+        entry = {'version': version}
+        for name, build in BUILDERS.items():
+            try:
+                entry[name] = build(session_id)
+            except Exception:
+                logger.exception("Materializing %s failed: session_id=%s", name, session_id)
+
+        with session_state.lock:
+            current = session_state.views.get(VIEW_KEY)
+            if current is None or current['version'] <= version:
+                session_state.views[VIEW_KEY] = entry
+
+
+# Global materializer instance (None until started)
+_materializer: Optional[Materializer] = None
+
+
+def start_materializer(state_manager: StateManager) -> Materializer:
+    """
+    Start materializing stats and charts in the background.
+
+    Args:
+        state_manager: State manager to observe
+
+    Returns:
+        Materializer: Running materializer
+    """
+    global _materializer
+    _materializer = Materializer()
+    _materializer.attach(state_manager)
+    return _materializer
+
+
+def stop_materializer():
+    """Stop the global materializer, if running."""
+    global _materializer
+    if _materializer is not None:
+        _materializer.close()
+        _materializer = None
+
+
+def get_materializer() -> Optional[Materializer]:
+    """
+    Get the global materializer instance.
+
+    Returns:
+        Materializer or None if it is not running
+    """
+    return _materializer
@@ -0,0 +1,249 @@
+"""
+Static image rendering (PNG / SVG) of the matplotlib charts.
+
+Matplotlib is slow and not thread-safe, so figures are drawn on a
+persistent process pool, started by the first render. Workers fork from a
+forkserver that has already imported matplotlib and mplsoccer, then draw
+one figure of every kind in their initializer, so later requests do not
+pay for font loading or pitch setup.
+
+Rendered images are content-addressed: the key is the SHA-256 of the image
+kind, format, resolution and the chart data itself (canonical JSON), not of
+a session or version. Re-rendering unchanged data (every report build of a
+finished match) is a cache hit, identical concurrent requests share one
+render, and the digest doubles as the image's ETag and permanent URL.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.event_service import get_hot_zone
+from app.services.index_service import EventFilter
+from app.utils.image_render import IMAGE_FORMATS, render_image, warm_worker
+from app.utils.singleflight import SingleFlight
+from app.utils.worker_affinity import owner_key, split_owner_key
+
+RENDER_WORKERS = min(2, os.cpu_count() or 1)
+
+# Longest a request waits for its image
+RENDER_TIMEOUT_SECONDS = 30.0
+
+# Total size of cached images
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_DPI = 100
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+_cache_lock = threading.Lock()
+_cache: 'OrderedDict[str, Tuple[str, bytes]]' = OrderedDict()
+_cache_bytes = 0
+
+_render_flights = SingleFlight()
+
+
+class RenderUnavailableError(RuntimeError):
+    """The render pool failed or did not answer in time."""
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: workers do not inherit the server's threads and
+            # locks; preloading the renderer lets them fork with matplotlib
+            # and mplsoccer already imported
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['app.utils.image_render'])
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS, mp_context=context, initializer=warm_worker
+            )
+        return _pool
+
+
+def _noop():
+    return None
+
+
+def _start_pool():
+    """
+    Start and warm every render worker without waiting for them.
+
+    Called by the first render rather than at startup, so processes that
+    never render (most cluster workers) do not run a pool. The render that
+    starts it queues behind the worker warm-up.
+    """
+    pool = _get_pool()
+    for _ in range(RENDER_WORKERS):
+        pool.submit(_noop)
+
+
+def shutdown_render_pool():
+    """Stop the render worker processes, if started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next render starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def image_digest(kind: str, spec: Dict[str, Any], fmt: str, dpi: int) -> str:
+    """
+    Get the content address of an image.
+
+    Args:
+        kind: Image kind
+        spec: Chart data and options (JSON-compatible)
+        fmt: Output format
+        dpi: Resolution of raster output
+
+    Returns:
+        str: Hex SHA-256 of the canonical JSON of every input
+    """
+    document = {'kind': kind, 'format': fmt, 'dpi': dpi, 'spec': spec}
+    canonical = json.dumps(document, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def get_cached_image(digest: str) -> Optional[Tuple[str, bytes]]:
+    """
+    Get a rendered image by content address.
+
+    Args:
+        digest: Image digest (see image_digest), optionally tagged with its
+            cluster worker
+
+    Returns:
+        Tuple[str, bytes]: Media type and encoded image, or None if the
+        image is not cached
+    """
+    _, digest = split_owner_key(digest)
+    with _cache_lock:
+        entry = _cache.get(digest)
+        if entry is not None:
+            _cache.move_to_end(digest)
+        return entry
+
+
+def _store_image(digest: str, fmt: str, image: bytes):
+    global _cache_bytes
+    if len(image) > CACHE_MAX_BYTES:
+        return
+    with _cache_lock:
+        if digest in _cache:
+            return
+        _cache[digest] = (IMAGE_FORMATS[fmt], image)
+        _cache_bytes += len(image)
+        while _cache_bytes > CACHE_MAX_BYTES:
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def _render(digest: str, kind: str, spec: Dict[str, Any], fmt: str, dpi: int) -> bytes:
+    # Another flight may have finished this image since the caller's lookup
+    entry = get_cached_image(digest)
+    if entry is not None:
+        return entry[1]
+
+    if _pool is None:
+        _start_pool()
+    pool = _get_pool()
+    try:
+        image = pool.submit(render_image, kind, spec, fmt, dpi).result(timeout=RENDER_TIMEOUT_SECONDS)
+    except TimeoutError as e:
+        raise RenderUnavailableError("Image rendering timed out") from e
+    except BrokenProcessPool as e:
+        _discard_pool(pool)
+        raise RenderUnavailableError("Render worker crashed") from e
+
+    _store_image(digest, fmt, image)
+    return image
+
+
+def render(kind: str, spec: Dict[str, Any], fmt: str = 'png', dpi: int = DEFAULT_DPI) -> Tuple[str, bytes]:
+    """
+    Render an image, or get it from the content-addressed cache.
+
+    Blocks until the image is ready; call from a worker thread.
+
+    Args:
+        kind: Image kind (heatmap, pizza or radar)
+        spec: Chart data and options (JSON-compatible)
+        fmt: Output format (png or svg)
+        dpi: Resolution of raster output
+
+    Returns:
+        Tuple[str, bytes]: Image digest and encoded image; in multi-worker
+        mode the digest is tagged with this worker, which holds the cached
+        copy (see app.utils.worker_affinity)
+
+    Raises:
+        ValueError: If the format is not supported
+        RenderUnavailableError: If the pool failed or timed out
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    digest = image_digest(kind, spec, fmt, dpi)
+    entry = get_cached_image(digest)
+    if entry is not None:
+        return owner_key(digest), entry[1]
+    return owner_key(digest), _render_flights.run(digest, _render, digest, kind, spec, fmt, dpi)
+
+
+def build_heatmap_spec(
+    session_id: str,
+    rows: int,
+    columns: int,
+    event_type: Optional[str] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    title: str = '',
+    event_filter: Optional[EventFilter] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the render spec of a session's zone heatmap.
+
+    The spec holds the zone counts rather than the session ID, so the image
+    is cached by what it shows.
+
+    Args:
+        session_id: Session identifier
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        event_type: Optional event type filter
+        start_time: Window start in seconds (already resolved)
+        end_time: Window end in seconds (already resolved)
+        title: Image title
+        event_filter: Optional filter on indexed fields
+
+    Returns:
+        dict: Heatmap spec, or None if no event has a zone
+    """
+    hot_zone = get_hot_zone(
+        session_id, event_type=event_type, start_time=start_time, end_time=end_time, event_filter=event_filter
+    )
+    if not hot_zone:
+        return None
+    return {
+        'rows': rows,
+        'columns': columns,
+        'zones': sorted([int(zone), int(count)] for zone, count in hot_zone.items()),
+        'title': title,
+        'endnote': f"{sum(hot_zone.values())} events"
+    }
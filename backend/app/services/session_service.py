@@ -0,0 +1,103 @@
+"""
+Business logic for reading a session's whole state at once.
+
+Screens that show events, stats, the stopwatch and the pitch used to make
+one request per resource, each looking the session up again. The overview
+reads all of them under one acquisition of the session lock, so the parts
+are consistent with each other (stats and hot zones match the events) and
+the client refreshes in one round trip.
+"""
+import json
+from typing import Iterable, List
+
+from pydantic import TypeAdapter
+
+from app.models.event import EventStats
+from app.models.records import StopwatchState
+from app.services.event_service import build_event_stats, encode_events
+from app.services.materializer_service import VIEW_KEY as MATERIALIZED_VIEW_KEY
+from app.services.state_manager import get_state_manager
+
+# Parts of the overview, in response order
+OVERVIEW_FIELDS = ('events', 'stats', 'stopwatch', 'hot_zones')
+
+_stats_adapter = TypeAdapter(List[EventStats])
+
+
+def parse_fields(fields: str) -> List[str]:
+    """
+    Parse a comma-separated field selection.
+
+    Args:
+        fields: e.g. "events,stats" (empty for every field)
+
+    Returns:
+        List[str]: Selected fields in OVERVIEW_FIELDS order
+
+    Raises:
+        ValueError: If a field is unknown
+    """
+    selected = {name.strip() for name in fields.split(',') if name.strip()}
+    unknown = selected.difference(OVERVIEW_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))} (valid: {', '.join(OVERVIEW_FIELDS)})"
+        )
+    return [name for name in OVERVIEW_FIELDS if not selected or name in selected]
+
+
+def get_session_overview_json(session_id: str, fields: Iterable[str] = OVERVIEW_FIELDS) -> bytes:
+    """
+    Get events, stats, stopwatch status and hot zones of a session as JSON.
+
+    Every part is read under a single acquisition of the session lock.
+    Events come from their cached JSON fragments, and stats from the
+    background-materialized payload when it matches the session version.
+    A session that does not exist reads as empty and is not created.
+
+    Args:
+        session_id: Session identifier
+        fields: Parts to include (see OVERVIEW_FIELDS)
+
+    Returns:
+        bytes: SessionOverview JSON
+    """
+    fields = set(fields)
+    session_state = get_state_manager().get_session(session_id)
+    if session_state is None:
+        parts = {
+            'events': b'[]',
+            'stats': b'[]',
+            'stopwatch': StopwatchState().to_status().model_dump_json().encode('utf-8'),
+            'hot_zones': b'{}',
+        }
+        version = 0
+        epoch = None
+    else:
+        parts = {}
+        with session_state.lock:
+            version = session_state.version
+            epoch = session_state.epoch
+            if 'events' in fields:
+                parts['events'] = encode_events(session_state, session_state.events)
+            if 'stats' in fields:
+                materialized = session_state.views.get(MATERIALIZED_VIEW_KEY)
+                if materialized is not None and materialized['version'] == version and 'stats' in materialized:
+                    parts['stats'] = materialized['stats']
+                else:
+                    parts['stats'] = _stats_adapter.dump_json(build_event_stats(session_state.events))
+            if 'stopwatch' in fields:
+                parts['stopwatch'] = session_state.stopwatch.to_status().model_dump_json().encode('utf-8')
+            if 'hot_zones' in fields:
+                parts['hot_zones'] = json.dumps(dict(session_state.hot_zones)).encode('utf-8')
+
+    body = [
+        b'"session_id":' + json.dumps(session_id).encode('utf-8'),
+        b'"version":' + str(version).encode('ascii'),
+        b'"epoch":' + json.dumps(epoch).encode('ascii'),
+    ]
+    body.extend(
+        b'"' + name.encode('ascii') + b'":' + parts[name]
+        for name in OVERVIEW_FIELDS if name in fields
+    )
+    return b'{' + b','.join(body) + b'}'
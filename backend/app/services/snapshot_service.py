@@ -0,0 +1,259 @@
+"""
+Business logic for session snapshots.
+
+A snapshot is an Arrow IPC file holding one row per event in columnar form,
+with team, event type and outcomes dictionary-encoded. Session-level state
+(stopwatch, hot zones, version) is stored as JSON in the schema metadata.
+Snapshots are written uncompressed so they can be memory-mapped on load.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote
+
+import pyarrow as pa
+
+from app.models.records import EventRecord
+from app.services.state_manager import SessionState, get_state_manager
+
+ARCHIVE_DIR_ENV = "EVENT_TAGGER_ARCHIVE_DIR"
+
+SNAPSHOT_SUFFIX = ".arrow"
+SNAPSHOT_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+
+METADATA_KEY = b"event_tagger.session"
+FORMAT_VERSION = 1
+
+# Column name -> Arrow type; dictionary columns store each distinct string once
+EVENT_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('minute', pa.float64()),
+    ('second', pa.float64()),
+    ('time_in_second', pa.float64()),
+    ('team', pa.dictionary(pa.int8(), pa.string())),
+    ('event_type', pa.dictionary(pa.int16(), pa.string())),
+    ('cross_outcome', pa.dictionary(pa.int8(), pa.string())),
+    ('shot_outcome', pa.dictionary(pa.int8(), pa.string())),
+    ('zone', pa.int32()),
+    ('period', pa.dictionary(pa.int8(), pa.string())),
+    ('created_at', pa.timestamp('us')),
+])
+
+
+def events_to_table(events: List[EventRecord]) -> pa.Table:
+    """
+    Convert events to an Arrow table without any session metadata.
+
+    Args:
+        events: Events to convert
+
+    Returns:
+        pa.Table: One row per event in EVENT_SCHEMA
+    """
+    columns = []
+    for field in EVENT_SCHEMA:
+        values = [getattr(event, field.name) for event in events]
+        if pa.types.is_dictionary(field.type):
+            columns.append(pa.array(values, type=pa.string()).dictionary_encode().cast(field.type))
+        else:
+            columns.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(columns, schema=EVENT_SCHEMA)
+
+
+def session_to_table(session_state: SessionState) -> pa.Table:
+    """
+    Convert a session to an Arrow table.
+
+    Args:
+        session_state: Session to convert
+
+    Returns:
+        pa.Table: One row per event, with session state in the schema metadata
+    """
+    with session_state.lock:
+        events = list(session_state.events)
+        stopwatch = session_state.stopwatch
+        metadata = {
+            'format_version': FORMAT_VERSION,
+            'session_id': session_state.session_id,
+            'version': session_state.version,
+            'next_event_id': session_state.next_event_id,
+            'created_at': session_state.created_at.isoformat(),
+            'hot_zones': {str(k): v for k, v in session_state.hot_zones.items() if v},
+            'stopwatch': stopwatch.to_dict()
+        }
+
+    table = events_to_table(events)
+    return table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata).encode('utf-8')})
+
+
+def table_to_bytes(table: pa.Table) -> bytes:
+    """
+    Serialize a snapshot table to Arrow IPC file bytes.
+
+    Args:
+        table: Snapshot table
+
+    Returns:
+        bytes: Arrow IPC file content
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def table_from_bytes(data: bytes) -> pa.Table:
+    """
+    Read a snapshot table from Arrow IPC file bytes.
+
+    Args:
+        data: Arrow IPC file content
+
+    Returns:
+        pa.Table: Snapshot table
+
+    Raises:
+        ValueError: If the data is not a session snapshot
+    """
+    try:
+        table = pa.ipc.open_file(pa.BufferReader(data)).read_all()
+    except pa.ArrowInvalid as e:
+        raise ValueError(f"Invalid Arrow snapshot: {e}")
+    get_snapshot_metadata(table)
+    return table
+
+
+def get_snapshot_metadata(table: pa.Table) -> Dict:
+    """
+    Get the session-level state stored in a snapshot.
+
+    Args:
+        table: Snapshot table
+
+    Returns:
+        dict: Session metadata (session_id, version, stopwatch, hot_zones, ...)
+
+    Raises:
+        ValueError: If the table has no session metadata
+    """
+    raw = (table.schema.metadata or {}).get(METADATA_KEY)
+    if raw is None:
+        raise ValueError("Arrow file is not an Event Tagger session snapshot")
+    return json.loads(raw)
+
+
+def save_snapshot(session_state: SessionState, path: str) -> int:
+    """
+    Write a session snapshot to disk atomically.
+
+    Args:
+        session_state: Session to save
+        path: Destination file path
+
+    Returns:
+        int: Number of events written
+    """
+    table = session_to_table(session_state)
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return table.num_rows
+
+
+def load_snapshot(path: str) -> pa.Table:
+    """
+    Memory-map a snapshot file.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        pa.Table: Snapshot table backed by the mapped file
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    get_snapshot_metadata(table)
+    return table
+
+
+def restore_session(table: pa.Table, session_id: Optional[str] = None) -> SessionState:
+    """
+    Replace a session's state with the content of a snapshot.
+
+    Args:
+        table: Snapshot table
+        session_id: Target session (defaults to the snapshot's session ID)
+
+    Returns:
+        SessionState: Restored session
+    """
+    metadata = get_snapshot_metadata(table)
+    session_id = session_id or metadata['session_id']
+    session_state = get_state_manager().get_or_create_session(session_id)
+
+    events = [EventRecord.from_dict(row) for row in table.to_pylist()]
+    stopwatch = metadata['stopwatch']
+    with session_state.lock:
+        session_state.clear_events()
+        session_state.add_events(events)
+        session_state.next_event_id = max(session_state.next_event_id, metadata['next_event_id'])
+        session_state.created_at = datetime.fromisoformat(metadata['created_at'])
+
+        session_state.stopwatch.load(stopwatch)
+        session_state.record_stopwatch()
+
+    return session_state
+
+
+def get_archive_dir() -> Optional[str]:
+    """
+    Get the configured archive directory, creating it if needed.
+
+    Returns:
+        str or None if archiving is not configured
+    """
+    directory = os.environ.get(ARCHIVE_DIR_ENV)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def archive_path(directory: str, session_id: str) -> str:
+    """
+    Get the archive file path for a session.
+
+    Args:
+        directory: Archive directory
+        session_id: Session identifier
+
+    Returns:
+        str: Snapshot file path
+    """
+    return os.path.join(directory, quote(session_id, safe='') + SNAPSHOT_SUFFIX)
+
+
+def list_archived_sessions(directory: str) -> List[Dict]:
+    """
+    List archived snapshots with their size and modification time.
+
+    Args:
+        directory: Archive directory
+
+    Returns:
+        List[dict]: One entry per archived session, sorted by session ID
+    """
+    archives = []
+    for name in os.listdir(directory):
+        if not name.endswith(SNAPSHOT_SUFFIX):
+            continue
+        stat = os.stat(os.path.join(directory, name))
+        archives.append({
+            'session_id': unquote(name[:-len(SNAPSHOT_SUFFIX)]),
+            'size_bytes': stat.st_size,
+            'archived_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
+        })
+    return sorted(archives, key=lambda a: a['session_id'])
@@ -4,36 +4,336 @@ Centralized state management service for the backend.
 This service provides a unified interface for managing session state,
 making it easier to migrate from in-memory storage to a database in the future.
 """
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Deque, Callable, Tuple
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+import bisect
 import threading
 import logging
+import uuid
 
-from app.models.event import EventResponse, EventCreate
-from app.models.session import StopwatchStatus
+from app.models.records import EventRecord, StopwatchState
 
 logger = logging.getLogger(__name__)
 
+# Number of event changes retained per session for delta sync
+CHANGE_LOG_RETENTION = 1000
+
+
+def _event_sort_key(event: EventRecord):
+    """Sort key for stored events: match time, then creation order."""
+    return (event.time_in_second, event.id)
+
+
+def _event_time(event: EventRecord) -> float:
+    return event.time_in_second
+
 
 class SessionState:
     """Represents the complete state of a session."""
     
-    def __init__(self, session_id: str):
+    __slots__ = (
+        'session_id', 'events', '_events_by_id', 'hot_zones', 'stopwatch',
+        'created_at', 'updated_at', 'version', 'epoch', 'next_event_id', 'change_log',
+        'lock', '_listeners', 'views'
+    )
+    
+    def __init__(self, session_id: str, listeners: Optional[List[Callable]] = None):
         self.session_id = session_id
-        self.events: List[Dict] = []
+        # Kept sorted by (time_in_second, id), including late-tagged events
+        self.events: List[EventRecord] = []
+        self._events_by_id: Dict[int, EventRecord] = {}
         self.hot_zones: Dict[int, int] = defaultdict(int)
-        self.stopwatch = StopwatchStatus(
-            running=False,
-            elapsed_time=0.0,
-            start_time=None
-        )
+        self.stopwatch = StopwatchState()
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
+        # Event data version, bumped on every event mutation
+        self.version = 0
+        # Identifies this version sequence: a session recreated after a
+        # restart starts again at version 0 under a new epoch, so cursors
+        # from before it are not mistaken for current ones
+        self.epoch = uuid.uuid4().hex
+        self.next_event_id = 0
+        self.change_log: Deque[Dict] = deque(maxlen=CHANGE_LOG_RETENTION)
+        self.lock = threading.RLock()
+        # Shared with the StateManager; called as listener(session_state, change)
+        self._listeners = listeners if listeners is not None else []
+        # Derived per-session structures kept up to date by change listeners
+        self.views: Dict[str, object] = {}
     
     def update_timestamp(self):
         """Update the last modified timestamp."""
         self.updated_at = datetime.now()
+    
+    def record_change(
+        self,
+        op: str,
+        event_id: Optional[int] = None,
+        event: Optional[EventRecord] = None,
+        events: Optional[List[EventRecord]] = None
+    ):
+        """
+        Append an entry to the change log and bump the version.
+        
+        Args:
+            op: Change type ('create', 'delete', 'bulk' or 'clear')
+            event_id: ID of the affected event, if any
+            event: Created or deleted event
+            events: Events created by a 'bulk' change
+        """
+        self.version += 1
+        change = {
+            'version': self.version,
+            'op': op,
+            'event_id': event_id,
+            'event': event
+        }
+        if events is not None:
+            change['events'] = events
+        self.change_log.append(change)
+        self.update_timestamp()
+        self._notify(self.change_log[-1])
+    
+    def record_stopwatch(self):
+        """Notify listeners of a stopwatch transition."""
+        with self.lock:
+            self.update_timestamp()
+            self._notify({'version': self.version, 'op': 'stopwatch', 'event_id': None, 'event': None})
+    
+    def _notify(self, change: Dict):
+        """
+        Call change listeners; must be called with the session lock held.
+        
+        A failing listener may have left its view out of step with the
+        events, so every view is dropped and rebuilt on its next read.
+        """
+        for listener in self._listeners:
+            try:
+                listener(self, change)
+            except Exception:
+                logger.exception("Change listener failed: session_id=%s", self.session_id)
+                self.views.clear()
+    
+    def add_event(self, event: EventRecord) -> EventRecord:
+        """
+        Store an event, assigning it the next stable ID.
+        
+        Args:
+            event: Event record; an existing id is kept (used when replaying)
+            
+        Returns:
+            EventRecord: Stored event
+        """
+        with self.lock:
+            if event.id is None:
+                event.id = self.next_event_id
+            self.next_event_id = max(self.next_event_id, event.id + 1)
+            bisect.insort(self.events, event, key=_event_sort_key)
+            self._events_by_id[event.id] = event
+            if event.zone is not None:
+                self.hot_zones[event.zone] += 1
+            self.record_change('create', event.id, event)
+            return event
+    
+    def add_events(self, events: List[EventRecord]) -> List[EventRecord]:
+        """
+        Store many events as one change.
+        
+        Sorts once and updates hot zones in the same pass, instead of one
+        insert and one change log entry per event. Listeners receive a
+        single 'bulk' change carrying all the events.
+        
+        Args:
+            events: Event records; existing ids are kept
+            
+        Returns:
+            List[EventRecord]: Stored events
+        """
+        if not events:
+            return events
+        with self.lock:
+            for event in events:
+                if event.id is None:
+                    event.id = self.next_event_id
+                self.next_event_id = max(self.next_event_id, event.id + 1)
+                self._events_by_id[event.id] = event
+                if event.zone is not None:
+                    self.hot_zones[event.zone] += 1
+            self.events.extend(events)
+            self.events.sort(key=_event_sort_key)
+            self.record_change('bulk', events=events)
+            return events
+    
+    def remove_event(self, event_id: int) -> Optional[EventRecord]:
+        """
+        Remove an event by ID.
+        
+        Args:
+            event_id: Event ID to remove
+            
+        Returns:
+            EventRecord or None if not found
+        """
+        with self.lock:
+            event = self._events_by_id.pop(event_id, None)
+            if event is None:
+                return None
+            index = bisect.bisect_left(self.events, _event_sort_key(event), key=_event_sort_key)
+            del self.events[index]
+            zone = event.zone
+            if zone is not None and self.hot_zones.get(zone, 0) > 0:
+                self.hot_zones[zone] -= 1
+            self.record_change('delete', event_id, event)
+            return event
+    
+    def clear_events(self):
+        """Remove all events and hot zones."""
+        with self.lock:
+            self.events.clear()
+            self._events_by_id.clear()
+            self.hot_zones.clear()
+            self.record_change('clear')
+    
+    def get_event(self, event_id: int) -> Optional[EventRecord]:
+        """
+        Get a stored event by ID.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            EventRecord or None if not found
+        """
+        return self._events_by_id.get(event_id)
+    
+    def window_bounds(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Get the positions of a time window in the sorted events.
+        
+        Must be called with the session lock held.
+        
+        Args:
+            start_time: Window start in seconds (None for the beginning)
+            end_time: Window end in seconds, exclusive (None for the end)
+            
+        Returns:
+            Tuple[int, int]: events[lo:hi] are the events in the window
+        """
+        lo = 0 if start_time is None else bisect.bisect_left(self.events, start_time, key=_event_time)
+        hi = len(self.events) if end_time is None else bisect.bisect_left(self.events, end_time, key=_event_time)
+        return lo, hi
+    
+    def events_in_window(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> List[EventRecord]:
+        """
+        Get events with start_time <= time_in_second < end_time.
+        
+        Uses binary search over the time-sorted events, so the cost is
+        O(log n) plus the size of the result.
+        
+        Args:
+            start_time: Window start in seconds (None for the beginning)
+            end_time: Window end in seconds, exclusive (None for the end)
+            
+        Returns:
+            List[EventRecord]: Events in the window, sorted by time
+        """
+        with self.lock:
+            lo, hi = self.window_bounds(start_time, end_time)
+            return self.events[lo:hi]
+    
+    def page_bounds(
+        self,
+        after: Optional[Tuple[float, int]] = None,
+        descending: bool = False,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
+    ) -> Tuple[int, int]:
+        """
+        Get the positions of the events a keyset page is taken from.
+        
+        Must be called with the session lock held.
+        
+        Args:
+            after: Key (time_in_second, id) of the last event already returned
+            descending: Latest events first
+            start_time: Window start in seconds (None for the beginning)
+            end_time: Window end in seconds, exclusive (None for the end)
+            
+        Returns:
+            Tuple[int, int]: The page starts at events[lo] (ascending) or at
+            events[hi - 1] (descending); lo may exceed hi when nothing is left
+        """
+        lo, hi = self.window_bounds(start_time, end_time)
+        if after is not None:
+            if descending:
+                hi = min(hi, bisect.bisect_left(self.events, after, key=_event_sort_key))
+            else:
+                lo = max(lo, bisect.bisect_right(self.events, after, key=_event_sort_key))
+        return lo, hi
+    
+    def events_page(
+        self,
+        after: Optional[Tuple[float, int]] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
+    ) -> Tuple[List[EventRecord], bool]:
+        """
+        Get a page of events by keyset, in (time_in_second, id) order.
+        
+        The cursor is the (time_in_second, id) key of the last event of the
+        previous page; events are sorted by that key, so a page is found
+        with binary search and only the page is copied, however deep it is.
+        Events inserted or deleted between requests do not shift pages.
+        
+        Args:
+            after: Key of the last event already returned (None for the first page)
+            limit: Maximum number of events (None for no limit)
+            descending: Latest events first
+            start_time: Window start in seconds (None for the beginning)
+            end_time: Window end in seconds, exclusive (None for the end)
+            
+        Returns:
+            Tuple[List[EventRecord], bool]: The page, and whether more events follow
+        """
+        with self.lock:
+            lo, hi = self.page_bounds(after, descending, start_time, end_time)
+            if limit is None:
+                limit = len(self.events)
+            if descending:
+                first = max(lo, hi - limit)
+                return self.events[first:hi][::-1], first > lo
+            last = min(hi, lo + limit)
+            return self.events[lo:last], last < hi
+    
+    def changes_since(self, cursor: int) -> Optional[List[Dict]]:
+        """
+        Get change log entries newer than a cursor.
+        
+        Args:
+            cursor: Last version seen by the client
+            
+        Returns:
+            List of change entries, or None if the cursor is no longer
+            covered by the retained log and a full resync is required
+        """
+        with self.lock:
+            if cursor == self.version:
+                return []
+            if cursor > self.version or not self.change_log:
+                return None
+            first_version = self.change_log[0]['version']
+            if cursor + 1 < first_version:
+                return None
+            # Walk back from the newest entry so the cost scales with the delta
+            changes = []
+            for change in reversed(self.change_log):
+                if change['version'] <= cursor:
+                    break
+                changes.append(change)
+            changes.reverse()
+            return changes
 
 
 class StateManager:
@@ -47,6 +347,31 @@ class StateManager:
     def __init__(self):
         self._sessions: Dict[str, SessionState] = {}
         self._lock = threading.RLock()  # Reentrant lock for nested calls
+        self._listeners: List[Callable] = []
+    
+    def add_listener(self, listener: Callable):
+        """
+        Register a callback for session changes.
+        
+        The listener is called as listener(session_state, change) with the
+        session lock held, after every event mutation and stopwatch transition.
+        
+        Args:
+            listener: Callback to register
+        """
+        with self._lock:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable):
+        """
+        Unregister a change callback.
+        
+        Args:
+            listener: Callback to remove
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
     
     def get_or_create_session(self, session_id: str) -> SessionState:
         """
@@ -60,7 +385,7 @@ class StateManager:
         """
         with self._lock:
             if session_id not in self._sessions:
-                self._sessions[session_id] = SessionState(session_id)
+                self._sessions[session_id] = SessionState(session_id, self._listeners)
                 logger.info("New session created: session_id=%s", session_id)
                 print(f"[SESSION_DEBUG] New session created: session_id={session_id}")
             else:
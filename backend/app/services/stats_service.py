@@ -0,0 +1,178 @@
+"""
+Vectorized per-team event statistics.
+
+Every statistic is a Metric: a predicate over the values of one category
+column (shot_outcome, cross_outcome or event_type). Columns are coded once
+(value -> small integer), each column is reduced with a single bincount to
+a teams x values contingency table, and the table is multiplied by the
+(values x metrics) predicate lookup. Adding a metric on an existing column
+therefore adds no pass over the events, only a column in the lookup.
+
+The same engine feeds get_event_stats, the divergent chart, the compact
+pitch summary and the cross-session analytics (which passes the Arrow
+dictionary codes of its snapshots directly).
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.records import EventRecord
+
+
+@dataclass(frozen=True)
+class Metric:
+    """
+    A per-team counter.
+
+    Attributes:
+        name: EventStats field name
+        label: Short label used by the divergent chart
+        column: Event column the predicate reads
+        predicate: Whether an event with this column value counts
+    """
+    name: str
+    label: str
+    column: str
+    predicate: Callable[[Optional[str]], bool]
+
+
+# Registered metrics, in EventStats field order. Null outcomes count as
+# "not 'None'", matching the original per-team filters.
+METRICS: List[Metric] = [
+    Metric('goals', 'Goal', 'shot_outcome', lambda v: v == 'Goal'),
+    Metric('shots', 'Shots', 'shot_outcome', lambda v: v != 'None'),
+    Metric('shots_on_target', 'SoT', 'shot_outcome', lambda v: v in ('Goal', 'Save', 'Post')),
+    Metric('cross_attempts', 'CrossAtt', 'cross_outcome', lambda v: v != 'None'),
+    Metric('cross_completed', 'CrossCmpl', 'cross_outcome', lambda v: v == 'Completed'),
+    Metric('transitions', 'Transitions', 'event_type', lambda v: v == 'Transition'),
+]
+
+
+def register_metric(metric: Metric):
+    """
+    Add a metric to every stats computation.
+
+    Metrics whose name is not an EventStats field are still computed (e.g.
+    for the divergent chart) but left out of EventStats responses.
+
+    Args:
+        metric: Metric to add
+
+    Raises:
+        ValueError: If a metric with the same name exists
+    """
+    if any(existing.name == metric.name for existing in METRICS):
+        raise ValueError(f"Metric already registered: {metric.name}")
+    METRICS.append(metric)
+
+
+def get_metric(name: str) -> Metric:
+    """
+    Get a registered metric by name.
+
+    Args:
+        name: Metric name
+
+    Returns:
+        Metric: Registered metric
+
+    Raises:
+        KeyError: If no metric has this name
+    """
+    for metric in METRICS:
+        if metric.name == name:
+            return metric
+    raise KeyError(name)
+
+
+def metric_names() -> List[str]:
+    """
+    Get the registered metric names.
+
+    Returns:
+        List[str]: Names in registration order
+    """
+    return [metric.name for metric in METRICS]
+
+
+def metric_columns() -> List[str]:
+    """
+    Get the event columns read by the registered metrics.
+
+    Returns:
+        List[str]: Column names, each listed once
+    """
+    return list(dict.fromkeys(metric.column for metric in METRICS))
+
+
+def factorize(values: Sequence) -> Tuple[np.ndarray, List]:
+    """
+    Code values by order of first appearance.
+
+    Args:
+        values: Hashable values (None included)
+
+    Returns:
+        Tuple[np.ndarray, List]: Code per value, and the distinct values
+    """
+    index: Dict = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.intp,
+        count=len(values)
+    )
+    return codes, list(index)
+
+
+def count_metrics(
+    team_codes: np.ndarray,
+    n_teams: int,
+    columns: Dict[str, Tuple[np.ndarray, List]]
+) -> np.ndarray:
+    """
+    Count every registered metric per team.
+
+    Args:
+        team_codes: Team code of each event
+        n_teams: Number of team codes
+        columns: Column name -> (code of each event, value of each code)
+
+    Returns:
+        np.ndarray: (n_teams, n_metrics) int64 counts in METRICS order
+    """
+    counts = np.zeros((n_teams, len(METRICS)), dtype=np.int64)
+    for column, (codes, values) in columns.items():
+        indices = [i for i, metric in enumerate(METRICS) if metric.column == column]
+        if not indices or not len(codes):
+            continue
+        n_values = len(values)
+        # One pass over the column: events per (team, value)
+        table = np.bincount(team_codes * n_values + codes, minlength=n_teams * n_values)
+        lookup = np.array(
+            [[METRICS[i].predicate(value) for i in indices] for value in values],
+            dtype=np.int64
+        ).reshape(n_values, len(indices))
+        counts[:, indices] = table.reshape(n_teams, n_values) @ lookup
+    return counts
+
+
+def compute_team_stats(events: Sequence[EventRecord]) -> Tuple[List[str], np.ndarray]:
+    """
+    Count every registered metric per team for a list of events.
+
+    Args:
+        events: Events to count
+
+    Returns:
+        Tuple[List[str], np.ndarray]: Teams in order of first appearance,
+        and their (n_teams, n_metrics) counts in METRICS order
+    """
+    if not events:
+        return [], np.zeros((0, len(METRICS)), dtype=np.int64)
+    team_codes, teams = factorize([event.team for event in events])
+    columns = {
+        column: factorize([getattr(event, column) for event in events])
+        for column in metric_columns()
+    }
+    return teams, count_metrics(team_codes, len(teams), columns)
@@ -1,17 +1,28 @@
 """
 Business logic for stopwatch functionality.
+
+The clock runs on time.monotonic() (see StopwatchState): reads are plain
+arithmetic on the stored epoch, and transitions are the only writes.
 """
-from datetime import datetime
-from app.models.session import StopwatchStatus
-from app.services.state_manager import get_state_manager
+import time
+from typing import Optional
+from app.models.event import MAX_EVENT_SECONDS
+from app.models.records import EventRecord
+from app.models.session import PERIOD_START_SECONDS, Period, StopwatchStatus
+from app.services.state_manager import SessionState, get_state_manager
 
 
-def start_stopwatch(session_id: str) -> StopwatchStatus:
+def start_stopwatch(session_id: str, period: Optional[Period] = None) -> StopwatchStatus:
     """
     Start the stopwatch for a session.
     
+    Starting a different period than the current one restarts the clock at
+    that period's kick-off time (e.g. 45:00 for the second half), whether or
+    not it is running.
+    
     Args:
         session_id: Session identifier
+        period: Period to start (keeps the current one if omitted)
         
     Returns:
         StopwatchStatus: Updated stopwatch status
@@ -19,12 +30,18 @@ def start_stopwatch(session_id: str) -> StopwatchStatus:
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
     
-    if not session_state.stopwatch.running:
-        session_state.stopwatch.running = True
-        session_state.stopwatch.start_time = datetime.now()
-        session_state.update_timestamp()
-    
-    return session_state.stopwatch
+    with session_state.lock:
+        stopwatch = session_state.stopwatch
+        now = time.monotonic()
+        if period is not None and period.value != stopwatch.period:
+            stopwatch.period = period.value
+            stopwatch.elapsed_time = 0.0
+            stopwatch.start(now)
+            session_state.record_stopwatch()
+        elif not stopwatch.running:
+            stopwatch.start(now)
+            session_state.record_stopwatch()
+        return stopwatch.to_status()
 
 
 def stop_stopwatch(session_id: str) -> StopwatchStatus:
@@ -40,16 +57,11 @@ def stop_stopwatch(session_id: str) -> StopwatchStatus:
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
     
-    if session_state.stopwatch.running:
-        # Calculate final elapsed time
-        if session_state.stopwatch.start_time:
-            elapsed = (datetime.now() - session_state.stopwatch.start_time).total_seconds()
-            session_state.stopwatch.elapsed_time += elapsed
-        session_state.stopwatch.running = False
-        session_state.stopwatch.start_time = None
-        session_state.update_timestamp()
-    
-    return session_state.stopwatch
+    with session_state.lock:
+        if session_state.stopwatch.running:
+            session_state.stopwatch.stop(time.monotonic())
+            session_state.record_stopwatch()
+        return session_state.stopwatch.to_status()
 
 
 def get_stopwatch_status(session_id: str) -> StopwatchStatus:
@@ -65,23 +77,13 @@ def get_stopwatch_status(session_id: str) -> StopwatchStatus:
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
     
-    # If running, calculate current elapsed time
-    if session_state.stopwatch.running and session_state.stopwatch.start_time:
-        elapsed = (datetime.now() - session_state.stopwatch.start_time).total_seconds()
-        current_elapsed = session_state.stopwatch.elapsed_time + elapsed
-        # Return a copy with updated elapsed time
-        return StopwatchStatus(
-            running=session_state.stopwatch.running,
-            elapsed_time=current_elapsed,
-            start_time=session_state.stopwatch.start_time
-        )
-    
-    return session_state.stopwatch
+    with session_state.lock:
+        return session_state.stopwatch.to_status()
 
 
 def get_elapsed_time(session_id: str) -> float:
     """
-    Get current elapsed time in seconds.
+    Get current elapsed time (match clock) in seconds.
     
     Args:
         session_id: Session identifier
@@ -89,8 +91,54 @@ def get_elapsed_time(session_id: str) -> float:
     Returns:
         float: Elapsed time in seconds
     """
-    status = get_stopwatch_status(session_id)
-    return status.elapsed_time
+    state_manager = get_state_manager()
+    session_state = state_manager.get_or_create_session(session_id)
+    return session_state.stopwatch.match_time()
+
+
+def stamp_event(
+    session_state: SessionState,
+    event: EventRecord,
+    received_at: float,
+    latency: float = 0.0
+):
+    """
+    Set an event's time and period from the session stopwatch.
+    
+    The time is the match clock when the request arrived minus the
+    client-reported latency, but never before the current period's kick-off
+    nor past MAX_EVENT_SECONDS (a stopwatch left running), so stamped events
+    stay within EventCreate's bounds. Minute and second are floored like the tagging clients do.
+    
+    Args:
+        session_state: Session whose stopwatch is read (caller holds its lock)
+        event: Event to stamp
+        received_at: time.monotonic() reading taken when the request arrived
+        latency: Seconds between the tag and the request
+    """
+    stopwatch = session_state.stopwatch
+    period_start = PERIOD_START_SECONDS.get(stopwatch.period, 0.0)
+    time_in_second = min(float(MAX_EVENT_SECONDS), max(period_start, stopwatch.match_time(received_at) - latency))
+    minute = time_in_second // 60
+    event.minute = minute
+    event.second = float(int(time_in_second - minute * 60))
+    event.time_in_second = time_in_second
+    event.period = stopwatch.period
+
+
+def get_period(session_id: str) -> Optional[str]:
+    """
+    Get the current match period.
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        Optional[str]: Period value, or None if the stopwatch is not period-based
+    """
+    state_manager = get_state_manager()
+    session_state = state_manager.get_or_create_session(session_id)
+    return session_state.stopwatch.period
 
 
 def reset_stopwatch(session_id: str) -> StopwatchStatus:
@@ -106,9 +154,10 @@ def reset_stopwatch(session_id: str) -> StopwatchStatus:
     state_manager = get_state_manager()
     session_state = state_manager.get_or_create_session(session_id)
     
-    session_state.stopwatch.running = False
-    session_state.stopwatch.elapsed_time = 0.0
-    session_state.stopwatch.start_time = None
-    session_state.update_timestamp()
-    
-    return session_state.stopwatch
+    with session_state.lock:
+        session_state.stopwatch.running = False
+        session_state.stopwatch.elapsed_time = 0.0
+        session_state.stopwatch.start_time = None
+        session_state.stopwatch.period = None
+        session_state.record_stopwatch()
+        return session_state.stopwatch.to_status()
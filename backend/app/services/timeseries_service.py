@@ -0,0 +1,264 @@
+"""
+Time-series aggregation of events: per-team counts per time window, rolling
+sums and exponentially weighted momentum.
+
+Each session keeps per-minute counts of shots, crosses and transitions per
+team in a NumPy array. The array is built once from the time-sorted events
+and then updated in place by a StateManager listener on every create and
+delete, so a live momentum query never rescans the events. Coarser windows,
+rolling sums and the momentum line are derived from the per-minute counts
+with vectorized reshapes and cumulative sums.
+"""
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from app.models.event import MAX_EVENT_SECONDS
+from app.models.records import EventRecord
+from app.services.state_manager import SessionState, get_state_manager
+from app.services.stats_service import get_metric
+
+VIEW_KEY = 'momentum'
+
+# Resolution of the maintained counts, in seconds
+BUCKET_SECONDS = 60
+
+# Length of the time axis; later events (stamped by a stopwatch left
+# running, or restored from old data) count in the last bucket
+MAX_BUCKETS = MAX_EVENT_SECONDS // BUCKET_SECONDS
+
+METRICS = ('shots', 'crosses', 'transitions')
+
+# stats_service metric each momentum metric counts, so momentum and the
+# team stats (and divergent chart) share one definition of a shot or cross
+_FLAG_METRICS = [get_metric(name) for name in ('shots', 'cross_attempts', 'transitions')]
+
+# Contribution of each metric to the momentum score
+MOMENTUM_WEIGHTS = {'shots': 1.0, 'crosses': 0.5, 'transitions': 0.5}
+
+
+def _metric_flags(event: EventRecord) -> List[int]:
+    """Return 0/1 per metric for one event, in METRICS order."""
+    return [int(metric.predicate(getattr(event, metric.column))) for metric in _FLAG_METRICS]
+
+
+class MomentumBuckets:
+    """
+    Per-minute metric counts for one session.
+
+    Attributes:
+        teams: Team name -> row index in counts
+        counts: int32 array of shape (n_teams, n_metrics, n_minutes)
+    """
+
+    def __init__(self):
+        self.teams: Dict[str, int] = {}
+        self.counts = np.zeros((0, len(METRICS), 0), dtype=np.int32)
+
+    @classmethod
+    def from_events(cls, events: List[EventRecord]) -> 'MomentumBuckets':
+        """
+        Build counts from a list of events in one vectorized pass.
+
+        Args:
+            events: Stored events
+
+        Returns:
+            MomentumBuckets: Populated buckets
+        """
+        buckets = cls()
+        if not events:
+            return buckets
+
+        team_idx = np.array([buckets._team_index(e.team) for e in events], dtype=np.intp)
+        seconds = np.array([e.time_in_second for e in events], dtype=np.float64)
+        minute_idx = np.minimum(seconds // BUCKET_SECONDS, MAX_BUCKETS - 1).astype(np.intp)
+        flags = np.array([_metric_flags(e) for e in events], dtype=np.int32)
+
+        buckets._grow(len(buckets.teams), int(minute_idx.max()) + 1)
+        for m in range(len(METRICS)):
+            np.add.at(buckets.counts[:, m, :], (team_idx, minute_idx), flags[:, m])
+        return buckets
+
+    def _team_index(self, team: str) -> int:
+        if team not in self.teams:
+            self.teams[team] = len(self.teams)
+        return self.teams[team]
+
+    def _grow(self, n_teams: int, n_minutes: int):
+        cur_teams, _, cur_minutes = self.counts.shape
+        if n_teams <= cur_teams and n_minutes <= cur_minutes:
+            return
+        # Double the time axis so appends stay amortized O(1)
+        new_minutes = max(n_minutes, min(cur_minutes * 2, MAX_BUCKETS) if n_minutes > cur_minutes else cur_minutes)
+        grown = np.zeros((max(n_teams, cur_teams), len(METRICS), new_minutes), dtype=np.int32)
+        grown[:cur_teams, :, :cur_minutes] = self.counts
+        self.counts = grown
+
+    def update(self, event: EventRecord, sign: int = 1):
+        """
+        Add (sign=1) or remove (sign=-1) one event.
+
+        Args:
+            event: Stored event
+            sign: +1 for a create, -1 for a delete
+        """
+        team = self._team_index(event.team)
+        minute = min(int(event.time_in_second // BUCKET_SECONDS), MAX_BUCKETS - 1)
+        self._grow(team + 1, minute + 1)
+        self.counts[team, :, minute] += sign * np.array(_metric_flags(event), dtype=np.int32)
+
+    def n_minutes(self) -> int:
+        """Number of minutes up to the last one with any event."""
+        nonzero = np.flatnonzero(self.counts.any(axis=(0, 1)))
+        return int(nonzero[-1]) + 1 if len(nonzero) else 0
+
+
+def _on_change(session_state: SessionState, change: Dict):
+    """State manager listener keeping materialized buckets in sync."""
+    buckets = session_state.views.get(VIEW_KEY)
+    if buckets is None:
+        return
+    if change['op'] == 'create':
+        buckets.update(change['event'], 1)
+    elif change['op'] == 'delete':
+        buckets.update(change['event'], -1)
+    elif change['op'] == 'bulk':
+        # Rebuilt in one vectorized pass on the next query
+        del session_state.views[VIEW_KEY]
+    elif change['op'] == 'clear':
+        session_state.views[VIEW_KEY] = MomentumBuckets()
+
+
+get_state_manager().add_listener(_on_change)
+
+
+def get_momentum_buckets(session_state: SessionState) -> MomentumBuckets:
+    """
+    Get the session's per-minute buckets, building them on first use.
+
+    Args:
+        session_state: Session state (caller holds its lock)
+
+    Returns:
+        MomentumBuckets: Buckets kept current by the change listener
+    """
+    buckets = session_state.views.get(VIEW_KEY)
+    if buckets is None:
+        buckets = MomentumBuckets.from_events(session_state.events)
+        session_state.views[VIEW_KEY] = buckets
+    return buckets
+
+
+def rolling_sum(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Trailing rolling sum over the last axis (shorter windows at the start).
+
+    Args:
+        values: Array to sum
+        n: Window length
+
+    Returns:
+        np.ndarray: Rolling sums, same shape as values
+    """
+    cumsum = np.cumsum(values, axis=-1, dtype=np.float64)
+    shifted = np.zeros_like(cumsum)
+    if n < cumsum.shape[-1]:
+        shifted[..., n:] = cumsum[..., :-n]
+    return cumsum - shifted
+
+
+def ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean over the last axis (pandas adjust=False).
+
+    Uses the closed form y_t = d^t * (x_0 + alpha * sum_{i=1..t} x_i d^-i)
+    with d = 1 - alpha, evaluated with a cumulative sum. Long series are
+    processed in chunks, carrying the last value, so d^-t cannot overflow.
+
+    Args:
+        values: Array to smooth
+        alpha: Smoothing factor in (0, 1]
+
+    Returns:
+        np.ndarray: Smoothed values, same shape as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    decay = 1.0 - alpha
+    if decay <= 0.0 or values.shape[-1] == 0:
+        return values.copy()
+
+    chunk = max(1, int(600 / -math.log(decay)))
+    out = np.empty_like(values)
+    previous = None
+    for start in range(0, values.shape[-1], chunk):
+        x = values[..., start:start + chunk]
+        t = np.arange(x.shape[-1])
+        weighted = x * (alpha * decay ** -t)
+        if previous is None:
+            weighted[..., 0] = x[..., 0]
+        smoothed = np.cumsum(weighted, axis=-1) * decay ** t
+        if previous is not None:
+            smoothed += previous[..., None] * decay ** (t + 1)
+        out[..., start:start + x.shape[-1]] = smoothed
+        previous = smoothed[..., -1]
+    return out
+
+
+def get_momentum(
+    session_id: str,
+    window_minutes: int = 5,
+    rolling_windows: int = 3,
+    alpha: float = 0.3
+) -> Dict:
+    """
+    Compute per-team metric counts per window, rolling sums and momentum.
+
+    Args:
+        session_id: Session identifier
+        window_minutes: Window length in minutes
+        rolling_windows: Number of windows in each rolling sum
+        alpha: EWM smoothing factor for the momentum line
+
+    Returns:
+        dict: Window start minutes, per-team series and net momentum
+    """
+    session_state = get_state_manager().get_or_create_session(session_id)
+    with session_state.lock:
+        buckets = get_momentum_buckets(session_state)
+        n_minutes = buckets.n_minutes()
+        team_names = list(buckets.teams)
+        counts = buckets.counts[:len(team_names), :, :n_minutes].copy()
+
+    # Sum minute buckets into windows: pad to a multiple, then reshape
+    n_windows = -(-n_minutes // window_minutes)
+    padded = np.zeros((len(team_names), len(METRICS), n_windows * window_minutes), dtype=np.int32)
+    padded[:, :, :n_minutes] = counts
+    windowed = padded.reshape(len(team_names), len(METRICS), n_windows, window_minutes).sum(axis=-1)
+
+    rolling = rolling_sum(windowed, rolling_windows)
+    weights = np.array([MOMENTUM_WEIGHTS[m] for m in METRICS])
+    score = np.tensordot(weights, windowed, axes=([0], [1]))  # (n_teams, n_windows)
+    momentum = ewm(score, alpha)
+
+    result_teams = {}
+    for i, team in enumerate(team_names):
+        result_teams[team] = {
+            'counts': {m: windowed[i, j].tolist() for j, m in enumerate(METRICS)},
+            'rolling': {m: rolling[i, j].tolist() for j, m in enumerate(METRICS)},
+            'momentum': momentum[i].round(4).tolist()
+        }
+
+    net = None
+    if 'Home' in result_teams and 'Away' in result_teams:
+        net = (momentum[team_names.index('Home')] - momentum[team_names.index('Away')]).round(4).tolist()
+
+    return {
+        'window_minutes': window_minutes,
+        'rolling_windows': rolling_windows,
+        'alpha': alpha,
+        'window_start_minutes': (np.arange(n_windows) * window_minutes).tolist(),
+        'teams': result_teams,
+        'net_momentum': net
+    }
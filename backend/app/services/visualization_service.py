@@ -0,0 +1,229 @@
+"""
+Business logic for visualization generation.
+
+Session charts go through a SingleFlight keyed by the session version and
+the request parameters, so concurrent identical requests (many viewers
+refreshing at once) share one figure computation.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+
+from app.models.event import EventStats
+from app.services.event_service import get_event_stats, get_hot_zone
+from app.services.index_service import EventFilter
+from app.services.state_manager import get_state_manager
+from app.services.stats_service import METRICS, compute_team_stats
+from app.utils.data_viz import get_zone_centers, plot_pitch_areas, create_grid
+from app.utils.divergent_chart import make_divergent_chart
+from app.utils.compression import PrecompressedPayload
+from app.utils.singleflight import SingleFlight
+
+_chart_flights = SingleFlight()
+
+# Stats columns of the compact pitch summary, in EventStats field order
+SUMMARY_STAT_FIELDS = [name for name in EventStats.model_fields if name != 'team']
+
+# Decimals kept for geometry and percentages in the compact pitch summary
+SUMMARY_DECIMALS = 2
+
+
+@lru_cache(maxsize=32)
+def get_pitch_template(
+    rows: int,
+    columns: int,
+    field_length: float,
+    field_width: float,
+    show_numbers: bool = True
+) -> PrecompressedPayload:
+    """
+    Get the empty pitch figure for a grid, serialized and precompressed.
+
+    The template does not depend on session data, so it is built once per
+    grid configuration and served from memory afterwards.
+
+    Args:
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        field_length: Field length in meters
+        field_width: Field width in meters
+        show_numbers: Whether to show zone numbers
+
+    Returns:
+        PrecompressedPayload: Plotly figure JSON with compressed variants
+    """
+    fig, _ = plot_pitch_areas(
+        n_rows=rows,
+        n_cols=columns,
+        field_dimen=(field_length, field_width),
+        show_numbers=show_numbers
+    )
+    return PrecompressedPayload(fig.to_json().encode('utf-8'))
+
+
+def _session_version(session_id: str) -> int:
+    return get_state_manager().get_or_create_session(session_id).version
+
+
+def build_divergent_chart(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the divergent bar chart comparing teams.
+    
+    The stats engine's (team x metric) counts go straight into the chart
+    builder, without a long-format DataFrame.
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        dict: Plotly figure dictionary, or None if the session has no events
+    """
+    session_state = get_state_manager().get_or_create_session(session_id)
+    teams, counts = compute_team_stats(session_state.events_in_window())
+    if not teams:
+        return None
+    return make_divergent_chart([metric.label for metric in METRICS], teams, counts)
+
+
+def get_divergent_chart(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the divergent bar chart, sharing concurrent identical computations.
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        dict: Plotly figure dictionary, or None if the session has no events
+    """
+    key = ('divergent', session_id, _session_version(session_id))
+    return _chart_flights.run(key, build_divergent_chart, session_id)
+
+
+def build_heatmap(
+    session_id: str,
+    rows: int,
+    columns: int,
+    field_dimen: Tuple[float, float],
+    event_type: Optional[str] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    event_filter: Optional[EventFilter] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the zone heatmap of a session's events on the pitch.
+    
+    Args:
+        session_id: Session identifier
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        field_dimen: Field (length, width) in meters
+        event_type: Optional event type filter
+        start_time: Window start in seconds
+        end_time: Window end in seconds (exclusive)
+        event_filter: Optional filter on indexed fields
+        
+    Returns:
+        dict: Plotly figure dictionary, or None if no event has a zone
+    """
+    hot_zone = get_hot_zone(
+        session_id, event_type=event_type, start_time=start_time, end_time=end_time, event_filter=event_filter
+    )
+    if not hot_zone:
+        return None
+    
+    fig, zone_dict = plot_pitch_areas(
+        n_rows=rows,
+        n_cols=columns,
+        field_dimen=field_dimen,
+        show_numbers=False
+    )
+    fig = create_grid(
+        cell_centers=zone_dict,
+        hot_dict=hot_zone,
+        rows=rows,
+        columns=columns,
+        field_dimen=field_dimen,
+        fig=fig
+    )
+    return fig.to_dict()
+
+
+def get_heatmap(
+    session_id: str,
+    rows: int,
+    columns: int,
+    field_dimen: Tuple[float, float],
+    event_type: Optional[str] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    event_filter: Optional[EventFilter] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the zone heatmap, sharing concurrent identical computations.
+    
+    Args:
+        session_id: Session identifier
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        field_dimen: Field (length, width) in meters
+        event_type: Optional event type filter
+        start_time: Window start in seconds (already resolved)
+        end_time: Window end in seconds (already resolved)
+        event_filter: Optional filter on indexed fields
+        
+    Returns:
+        dict: Plotly figure dictionary, or None if no event has a zone
+    """
+    key = (
+        'heatmap', session_id, _session_version(session_id),
+        rows, columns, tuple(field_dimen), event_type, start_time, end_time,
+        event_filter.key if event_filter is not None else None
+    )
+    return _chart_flights.run(
+        key, build_heatmap, session_id, rows, columns, field_dimen, event_type, start_time, end_time, event_filter
+    )
+
+
+def get_pitch_summary(
+    session_id: Optional[str],
+    rows: int,
+    columns: int,
+    field_dimen: Tuple[float, float]
+) -> Dict[str, Any]:
+    """
+    Get the data behind the pitch view as flat arrays, without a figure.
+    
+    Clients draw the pitch from the cached pitch template (or their own
+    PitchSelector) and only refresh this summary, which is a few hundred
+    bytes instead of a full Plotly figure.
+    
+    Args:
+        session_id: Session identifier (None for an empty pitch)
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        field_dimen: Field (length, width) in meters
+        
+    Returns:
+        dict: Grid shape, zone centers (zone_x, zone_y indexed by zone
+        number), counts and percentages per zone, and per-team stats as
+        one row of SUMMARY_STAT_FIELDS values per team
+    """
+    centers = get_zone_centers(rows, columns, field_dimen)
+    hot_zone = get_hot_zone(session_id) if session_id else {}
+    total = sum(hot_zone.values())
+    counts = [hot_zone.get(zone, 0) for zone in range(len(centers))]
+    stats = get_event_stats(session_id) if session_id else []
+    
+    return {
+        'version': _session_version(session_id) if session_id else 0,
+        'rows': rows,
+        'columns': columns,
+        'field_dimen': list(field_dimen),
+        'zone_x': [round(centers[zone][0], SUMMARY_DECIMALS) for zone in range(len(centers))],
+        'zone_y': [round(centers[zone][1], SUMMARY_DECIMALS) for zone in range(len(centers))],
+        'counts': counts,
+        'percentages': [round(count / total * 100, SUMMARY_DECIMALS) if total else 0.0 for count in counts],
+        'teams': [team_stats.team for team_stats in stats],
+        'stat_fields': SUMMARY_STAT_FIELDS,
+        'stats': [[getattr(team_stats, name) for name in SUMMARY_STAT_FIELDS] for team_stats in stats]
+    }
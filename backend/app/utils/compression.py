@@ -0,0 +1,121 @@
+"""
+HTTP response compression utilities.
+
+Dynamic responses are gzip-compressed by Starlette's GZipMiddleware (see
+app/main.py). Static payloads that are served many times, such as empty
+pitch templates, are wrapped in a PrecompressedPayload so each encoding is
+computed once instead of on every request.
+"""
+import gzip
+from typing import Dict, Optional
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = 1024
+
+# Level used for dynamic responses (favours speed over ratio)
+GZIP_LEVEL = 6
+
+
+def parse_accept_encoding(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into encoding -> quality values.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        dict: Encoding name -> quality (0.0 - 1.0)
+    """
+    qualities = {}
+    if not accept_encoding:
+        return qualities
+
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """
+    Pick the best content encoding accepted by the client.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        available: Encodings the server can produce, in order of preference
+
+    Returns:
+        str or None: Chosen encoding, or None for identity
+    """
+    qualities = parse_accept_encoding(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class PrecompressedPayload:
+    """
+    Immutable response body stored alongside its compressed variants.
+
+    Attributes:
+        body: Uncompressed body
+        media_type: Content type of the body
+        variants: Encoding name -> compressed body
+    """
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.body = body
+        self.media_type = media_type
+        self.variants: Dict[str, bytes] = {}
+        if len(body) >= COMPRESSION_MINIMUM_SIZE:
+            # Compressed once, so use the highest levels
+            if brotli is not None:
+                self.variants['br'] = brotli.compress(body, quality=11)
+            self.variants['gzip'] = gzip.compress(body, compresslevel=9)
+
+    def to_response(self, accept_encoding: Optional[str], headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Build a response using the best variant accepted by the client.
+
+        Args:
+            accept_encoding: Raw Accept-Encoding header value
+            headers: Extra response headers
+
+        Returns:
+            Response: Response with Content-Encoding set when compressed
+        """
+        response_headers = dict(headers or {})
+        encoding = negotiate_encoding(accept_encoding, list(self.variants))
+        if self.variants:
+            response_headers['Vary'] = 'Accept-Encoding'
+
+        if encoding is None:
+            return Response(content=self.body, media_type=self.media_type, headers=response_headers)
+
+        response_headers['Content-Encoding'] = encoding
+        return Response(
+            content=self.variants[encoding],
+            media_type=self.media_type,
+            headers=response_headers
+        )
@@ -142,6 +142,28 @@ def df_to_xml(df):
             group_shot.text = "ShotOutcome"
             text_shot = ET.SubElement(label_shot, "text")
             text_shot.text = row['shot_outcome']
+        
+        # Team and zone labels make the export loadable by xml_to_df
+        if pd.notna(row['team']):
+            label_team = ET.SubElement(instance, "label")
+            group_team = ET.SubElement(label_team, "group")
+            group_team.text = "Team"
+            text_team = ET.SubElement(label_team, "text")
+            text_team.text = row['team']
+        
+        if pd.notna(row['zone']):
+            label_zone = ET.SubElement(instance, "label")
+            group_zone = ET.SubElement(label_zone, "group")
+            group_zone.text = "Zone"
+            text_zone = ET.SubElement(label_zone, "text")
+            text_zone.text = str(int(row['zone']))
+        
+        if pd.notna(row['period']):
+            label_period = ET.SubElement(instance, "label")
+            group_period = ET.SubElement(label_period, "group")
+            group_period.text = "Period"
+            text_period = ET.SubElement(label_period, "text")
+            text_period.text = row['period']
     
     # ROWS section
     rows = ET.SubElement(file_element, "ROWS")
@@ -171,6 +193,108 @@ def df_to_xml(df):
     return xml_str
 
 
+# Label group -> event column, for labels read back by xml_to_df
+XML_LABEL_COLUMNS = {
+    'CrossOutcome': 'cross_outcome',
+    'ShotOutcome': 'shot_outcome',
+    'Team': 'team',
+    'Zone': 'zone',
+    'Period': 'period'
+}
+
+EVENT_COLUMNS = [
+    'minute', 'second', 'time_in_second', 'team', 'event_type',
+    'cross_outcome', 'shot_outcome', 'zone', 'period'
+]
+
+
+def split_time(time_in_second):
+    """
+    Split times in seconds into minute and second columns.
+    
+    The second is the whole second within the minute, so fractional times
+    such as 59.6 give 59 rather than rounding up to an invalid 60.
+    
+    Args:
+        time_in_second: Series of times in seconds (NaN allowed)
+        
+    Returns:
+        Tuple[pd.Series, pd.Series]: Minutes and seconds (0-59)
+    """
+    minute = time_in_second // 60
+    second = (np.floor(time_in_second) % 60).clip(0, 59)
+    return minute, second
+
+
+def xml_to_df(source, default_team=None):
+    """
+    Parse a LiveTagPRO XML file into an event DataFrame.
+    
+    The inverse of df_to_xml. The file is read incrementally with iterparse
+    and each instance element is freed once read, so memory stays flat for
+    large files. The event time is the midpoint of the instance's start and
+    end. Files without Team labels (e.g. from older exports or other tools)
+    use default_team.
+    
+    Args:
+        source: Path or binary file object
+        default_team: Team for instances without a Team label
+        
+    Returns:
+        pd.DataFrame: One row per instance, with the CSV export columns
+    """
+    columns = {column: [] for column in ['time_in_second', 'event_type', *XML_LABEL_COLUMNS.values()]}
+    for _, element in ET.iterparse(source, events=("end",)):
+        if element.tag != "instance":
+            continue
+        
+        start = element.findtext("start")
+        end = element.findtext("end")
+        try:
+            time = (float(start) + float(end)) / 2
+        except (TypeError, ValueError):
+            time = np.nan
+        
+        labels = {}
+        for label in element.iterfind("label"):
+            labels[label.findtext("group")] = label.findtext("text")
+        
+        columns['time_in_second'].append(time)
+        columns['event_type'].append(element.findtext("code") or labels.get("Event"))
+        for group, column in XML_LABEL_COLUMNS.items():
+            columns[column].append(labels.get(group))
+        if columns['team'][-1] is None:
+            columns['team'][-1] = default_team
+        element.clear()
+    
+    df = pd.DataFrame(columns)
+    df['minute'], df['second'] = split_time(df['time_in_second'])
+    return df[EVENT_COLUMNS]
+
+
+def read_csv_chunks(source, chunksize=5000):
+    """
+    Read a CSV export in chunks.
+    
+    The literal "None" used for empty outcomes is kept as a string; only
+    empty cells are read as missing.
+    
+    Args:
+        source: Path or file object
+        chunksize: Rows per chunk
+        
+    Returns:
+        Iterator[pd.DataFrame]: DataFrames of up to chunksize rows
+    """
+    return pd.read_csv(
+        source,
+        chunksize=chunksize,
+        keep_default_na=False,
+        na_values=[''],
+        dtype={'team': str, 'event_type': str, 'cross_outcome': str, 'shot_outcome': str, 'period': str}
+    )
+
+
 def save_df_to_csv(df):
     """
     Convert DataFrame to CSV string.
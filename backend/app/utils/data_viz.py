@@ -13,9 +13,10 @@ matplotlib.use('Agg')  # Use Anti-Grain Geometry backend (non-interactive)
 
 from matplotlib import cm, pyplot as plt, ticker
 import matplotlib.patheffects as path_effects
-from mplsoccer import PyPizza, add_image, FontManager, Pitch, VerticalPitch
+from mplsoccer import PyPizza, Radar, add_image, FontManager, Pitch, VerticalPitch
 
 import textwrap
+from functools import lru_cache
 
 
 color_discrete_map_presence = pd.Series({
@@ -35,8 +36,15 @@ color_maps = {
 TOOLTIP_SIZE = 25
 
 
+@lru_cache(maxsize=None)
 def get_mpl_pitch():
-    """Get a matplotlib pitch object."""
+    """
+    Get a matplotlib pitch object.
+
+    Pitch objects only hold the pitch geometry and style (figures are
+    created per call by pitch.draw / pitch.grid), so one instance is built
+    per process and shared.
+    """
     return Pitch(pitch_type='statsbomb', line_zorder=2,
                  pitch_color='white', line_color='gray', )
 
@@ -140,6 +148,34 @@ def plot_pitch(field_dimen=(120, 80),
     return fig, field_dimen
 
 
+def get_zone_centers(n_rows=3, n_cols=3, field_dimen=(120, 80)):
+    """
+    Get the center of every zone of a pitch grid.
+    
+    Zones are numbered row by row (left to right) from the top, matching the
+    frontend PitchSelector; in Plotly y=0 is at the bottom, so rows are
+    iterated in reverse to match the HTML canvas (y=0 at top).
+    
+    Args:
+        n_rows: Number of rows in the grid
+        n_cols: Number of columns in the grid
+        field_dimen: Field dimensions (length, width)
+    Returns:
+        dict: Dictionary mapping zone numbers to (x, y) center coordinates
+    """
+    length, width = field_dimen
+    v_step = width / n_rows
+    h_step = length / n_cols
+
+    zone_n = 0
+    zone_dict = {}
+    for v in range(n_rows - 1, -1, -1):  # Iterate rows from top to bottom (reverse order)
+        for h in range(n_cols):  # Then columns left to right
+            zone_dict[zone_n] = (h_step / 2 + h * h_step, v_step / 2 + v * v_step)
+            zone_n += 1
+    return zone_dict
+
+
 def plot_pitch_areas(n_rows=3, n_cols=3, field_dimen=(120, 80), fig=None, show_numbers=True):
     """
     Plot pitch areas with grid lines and zone numbers.
@@ -171,29 +207,21 @@ def plot_pitch_areas(n_rows=3, n_cols=3, field_dimen=(120, 80), fig=None, show_n
                       line=dict(color='gray', width=3), layer="below")
 
     
-    # Plot dots
-    # Number zones row by row (left to right), matching frontend PitchSelector
-    # Note: In Plotly, y=0 is at bottom, so we iterate rows in reverse to match HTML canvas (y=0 at top)
-    zone_n = 0
-    zone_dict = {}
-    for v in range(n_rows - 1, -1, -1):  # Iterate rows from top to bottom (reverse order)
-        for h in range(n_cols):  # Then columns left to right
-            x = h_step / 2 + h * h_step
-            y = v_step / 2 + v * v_step
-            zone_dict[zone_n] = (x, y)
-            if show_numbers:
-                fig.add_trace(go.Scatter(
-                    x=[x],
-                    y=[y],
-                    mode='markers+text',
-                    marker=dict(color='black', size=40),
-                    name='',
-                    text=str(zone_n),
-                    textfont=dict(color='white', size=20),
-                    textposition='middle center',
-                    showlegend=False
-                ))
-            zone_n += 1
+    # Plot dots (zone numbering is shared with the frontend, see get_zone_centers)
+    zone_dict = get_zone_centers(n_rows, n_cols, field_dimen)
+    if show_numbers:
+        for zone_n, (x, y) in zone_dict.items():
+            fig.add_trace(go.Scatter(
+                x=[x],
+                y=[y],
+                mode='markers+text',
+                marker=dict(color='black', size=40),
+                name='',
+                text=str(zone_n),
+                textfont=dict(color='white', size=20),
+                textposition='middle center',
+                showlegend=False
+            ))
 
     fig.update_layout(showlegend=False)
 
@@ -563,6 +591,47 @@ def create_radar_chart(traces, labels, title='', fill=False,
     return fig
 
 
+def create_mpl_radar_chart(traces, labels, title='', figsize=(9, 9)):
+    """
+    Create a radar chart using Matplotlib and mplsoccer.
+
+    Static counterpart of create_radar_chart (same traces and labels), for
+    image rendering where Plotly figures cannot be exported.
+
+    Parameters:
+        traces (dict): Dictionary of traces to plot on the radar chart. Each key is the trace name,
+                       and each value is a dictionary containing 'percentiles' and 'color' (optional).
+        labels (list): List of labels for each axis of the radar chart.
+        title (str): Title of the radar chart.
+        figsize (tuple): Figure size in inches (default: (9, 9)).
+
+    Returns:
+        fig (matplotlib.figure.Figure): Matplotlib figure object containing the radar chart.
+    """
+    # Percentiles share one 0-100 range on every axis
+    radar = Radar([textwrap.fill(label.replace('_', ' '), 15) for label in labels],
+                  min_range=[0] * len(labels), max_range=[100] * len(labels),
+                  round_int=[True] * len(labels), num_rings=4, ring_width=1, center_circle_radius=1)
+
+    fig, ax = radar.setup_axis(figsize=figsize)
+    radar.draw_circles(ax=ax, facecolor='#f3f3f3', edgecolor='#c5c5c5')
+
+    # Draw every trace as a translucent polygon
+    for trace_name, trace in traces.items():
+        color = trace.get('color') or None
+        radar.draw_radar_solid(trace['percentiles'], ax=ax,
+                               kwargs=dict(facecolor=color, alpha=0.4, edgecolor=color, lw=2, label=trace_name))
+
+    radar.draw_range_labels(ax=ax, fontsize=10, color='gray')
+    radar.draw_param_labels(ax=ax, fontsize=12)
+
+    if len(traces) > 1:
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, 1.05), ncol=len(traces), frameon=False)
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
+    return fig
+
+
 def create_pizza_plot(labels, percentiles, title, subtitle):
     """
     Create a pizza plot (radar chart-like) using PyPizza library.
@@ -841,15 +910,16 @@ def create_heat_map(df, x_column, y_column,
     """
 
     # Initialize the pitch using mplsoccer's Pitch class
+    pitch = get_mpl_pitch()
     if axs is None:
-        pitch = get_mpl_pitch()  # Assuming get_mpl_pitch() returns a mplsoccer Pitch instance
-        
         # Create the figure and axes grid for the pitch
         fig, axs = pitch.grid(endnote_height=0.03, endnote_space=0,
                               grid_width=0.88, left=0.025,
                               title_height=0.06, title_space=0,
                               axis=False,
                               grid_height=0.86)
+    else:
+        fig = axs['pitch'].figure
     
     # Define path effects for labels
     path_eff = [path_effects.Stroke(linewidth=1.5, foreground='black'),
@@ -1,92 +1,36 @@
 """
 Divergent chart generation using Plotly.
 Converts Altair divergent chart to Plotly format.
+
+Figures are assembled as plain dicts from aligned (series x variable)
+arrays: one pass builds every bar trace, and the layout (including the
+Plotly template, the bulk of the figure) is built once per bar mode and
+reused.
 """
+import copy
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from typing import Dict, Any
 
 
-def make_divergent_chart_plotly(df: pd.DataFrame) -> Dict[str, Any]:
-    """
-    Create a divergent bar chart using Plotly.
-    
-    This function replicates the Altair divergent chart from the original Streamlit app.
-    
-    Args:
-        df: DataFrame with columns: team, variable, value, fraction
-        
-    Returns:
-        dict: Plotly figure dictionary that can be serialized to JSON
-    """
-    # Separate data by team
-    home_df = df[df['team'] == 'Home'].copy()
-    away_df = df[df['team'] == 'Away'].copy()
-    
-    # Get unique variables/metrics
-    variables = df['variable'].unique()
-    
-    # Create figure
+# Series drawn on the left (negative) and right side of a two-series chart
+LEFT_TEAM = 'Home'
+RIGHT_TEAM = 'Away'
+
+# Colors by series position: Home, Away, then further teams or sessions
+SERIES_COLORS = ['#1f77b4', '#e377c2', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#17becf', '#bcbd22']
+
+
+@lru_cache(maxsize=None)
+def _layout(barmode: str) -> Dict[str, Any]:
+    """Build the chart layout once per bar mode."""
     fig = go.Figure()
-    
-    # Colors
-    home_color = '#1f77b4'
-    away_color = '#e377c2'
-    
-    # Add Home bars (left side, negative)
-    if not home_df.empty:
-        home_values = []
-        home_texts = []
-        for var in variables:
-            var_data = home_df[home_df['variable'] == var]
-            if not var_data.empty:
-                home_values.append(-var_data['fraction'].sum())
-                home_texts.append(str(int(var_data['value'].sum())))
-            else:
-                home_values.append(0)
-                home_texts.append('0')
-        
-        fig.add_trace(go.Bar(
-            y=variables,
-            x=home_values,
-            name='Home',
-            orientation='h',
-            marker=dict(color=home_color),
-            text=home_texts,
-            textposition='outside',
-            textfont=dict(color='white'),
-            hovertemplate='Home<br>%{y}<br>%{text}<extra></extra>'
-        ))
-    
-    # Add Away bars (right side, positive)
-    if not away_df.empty:
-        away_values = []
-        away_texts = []
-        for var in variables:
-            var_data = away_df[away_df['variable'] == var]
-            if not var_data.empty:
-                away_values.append(var_data['fraction'].sum())
-                away_texts.append(str(int(var_data['value'].sum())))
-            else:
-                away_values.append(0)
-                away_texts.append('0')
-        
-        fig.add_trace(go.Bar(
-            y=variables,
-            x=away_values,
-            name='Away',
-            orientation='h',
-            marker=dict(color=away_color),
-            text=away_texts,
-            textposition='outside',
-            textfont=dict(color='white'),
-            hovertemplate='Away<br>%{y}<br>%{text}<extra></extra>'
-        ))
-    
-    # Update layout
     fig.update_layout(
         xaxis=dict(
-            range=[-1, 1],
+            range=[-1, 1] if barmode == 'overlay' else [0, 1],
             showgrid=False,
             zeroline=True,
             zerolinecolor='white',
@@ -99,11 +43,95 @@ def make_divergent_chart_plotly(df: pd.DataFrame) -> Dict[str, Any]:
         ),
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
-        barmode='overlay',
-        showlegend=False,
+        barmode=barmode,
+        showlegend=barmode != 'overlay',
         height=400,
         margin=dict(l=100, r=100, t=50, b=50)
     )
-    
-    # Return as dictionary for JSON serialization
-    return fig.to_dict()
+    return fig.to_dict()['layout']
+
+
+def _order_series(series: Sequence[str]) -> List[int]:
+    """Put Home first and Away second, other series after in their order."""
+    rank = {LEFT_TEAM: 0, RIGHT_TEAM: 1}
+    return sorted(range(len(series)), key=lambda i: (rank.get(series[i], 2), i))
+
+
+def make_divergent_chart(
+    variables: Sequence[str],
+    series: Sequence[str],
+    values: np.ndarray,
+    fractions: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Create a divergent bar chart from aligned arrays.
+
+    With two series (Home and Away) the first is drawn to the left and the
+    second to the right of a shared axis. With more series (teams or
+    comparison sessions) each gets its own grouped bar.
+
+    Args:
+        variables: Metric labels (the y axis)
+        series: Team or session names
+        values: (n_series, n_variables) counts
+        fractions: (n_series, n_variables) share of each series per
+            variable (defaults to values over the per-variable total)
+
+    Returns:
+        dict: Plotly figure dictionary that can be serialized to JSON
+    """
+    values = np.asarray(values)
+    if fractions is None:
+        totals = values.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fractions = values / totals
+    # Variables nobody has (0/0) get empty bars
+    fractions = np.nan_to_num(np.asarray(fractions, dtype=float), nan=0.0)
+
+    order = _order_series(series)
+    divergent = len(order) <= 2
+    variables = list(variables)
+    texts = values.astype(np.int64).astype(str)
+
+    data = []
+    for position, i in enumerate(order):
+        left = divergent and position == 0 and series[i] != RIGHT_TEAM
+        x = -fractions[i] if left else fractions[i]
+        data.append({
+            'type': 'bar',
+            'orientation': 'h',
+            'name': series[i],
+            'x': x.tolist(),
+            'y': variables,
+            'text': texts[i].tolist(),
+            'textposition': 'outside',
+            'textfont': {'color': 'white'},
+            'marker': {'color': SERIES_COLORS[position % len(SERIES_COLORS)]},
+            'hovertemplate': f'{series[i]}<br>%{{y}}<br>%{{text}}<extra></extra>'
+        })
+
+    layout = copy.deepcopy(_layout('overlay' if divergent else 'group'))
+    return {'data': data, 'layout': layout}
+
+
+def make_divergent_chart_plotly(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Create a divergent bar chart using Plotly.
+
+    This function replicates the Altair divergent chart from the original Streamlit app.
+    The long-format stats are pivoted once into (team x variable) arrays.
+
+    Args:
+        df: DataFrame with columns: team, variable, value, fraction
+
+    Returns:
+        dict: Plotly figure dictionary that can be serialized to JSON
+    """
+    team_codes, teams = pd.factorize(df['team'])
+    variable_codes, variables = pd.factorize(df['variable'])
+    shape = (len(teams), len(variables))
+    values = np.zeros(shape)
+    fractions = np.zeros(shape)
+    np.add.at(values, (team_codes, variable_codes), df['value'].to_numpy(dtype=float))
+    np.add.at(fractions, (team_codes, variable_codes), df['fraction'].to_numpy(dtype=float))
+    return make_divergent_chart(variables.tolist(), teams.tolist(), values, fractions)
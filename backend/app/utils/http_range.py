@@ -0,0 +1,94 @@
+"""
+HTTP range request utilities.
+
+Large export results are downloaded over slow links, so downloads honour a
+single byte range (RFC 9110) and clients can resume where they stopped.
+Multi-range requests are answered with the whole file, which the RFC
+allows.
+"""
+from typing import Iterator, Optional, Tuple
+
+# Size of the slices a file is streamed in
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiableError(Exception):
+    """The requested range lies outside the file."""
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header against a file size.
+
+    Args:
+        range_header: Raw Range header value
+        size: File size in bytes
+
+    Returns:
+        Tuple[int, int]: Inclusive (first, last) byte positions, or None to
+        send the whole file (no header, another unit, several ranges, or a
+        malformed value)
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts past the end of the file
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiableError(range_header)
+            start = max(size - length, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(range_header)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_chunks(f, remaining: int, chunk_size: int) -> Iterator[bytes]:
+    with f:
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+def iter_file(path: str, start: int, end: int, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Open a file and yield a byte range of it in chunks.
+
+    The file is opened before this returns, so a file deleted while it is
+    being streamed is still read to the end.
+
+    Args:
+        path: File path
+        start: First byte position
+        end: Last byte position (inclusive)
+        chunk_size: Maximum chunk length in bytes
+
+    Returns:
+        Iterator[bytes]: Consecutive chunks of the range
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    f = open(path, 'rb')
+    f.seek(start)
+    return _iter_chunks(f, end - start + 1, chunk_size)
@@ -0,0 +1,100 @@
+"""
+Static image rendering of the matplotlib / mplsoccer charts.
+
+These functions run in the render service's worker processes. A worker
+imports matplotlib and mplsoccer once, draws a throwaway figure of every
+kind at startup (font cache, text layout, pitch artists), and reuses the
+cached Pitch (get_mpl_pitch) for every heatmap afterwards.
+"""
+import io
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+from matplotlib import pyplot as plt
+
+from app.utils.data_viz import (
+    create_heat_map,
+    create_mpl_radar_chart,
+    create_pizza_plot,
+    get_mpl_pitch,
+    get_zone_centers
+)
+
+# Output format -> media type
+IMAGE_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+# mplsoccer 'statsbomb' pitch dimensions (y grows downwards)
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+
+# Stable SVG element IDs, so identical input renders identical files
+plt.rcParams['svg.hashsalt'] = 'event-tagger'
+
+
+def _heatmap_figure(spec: Dict[str, Any]):
+    """Zone counts -> one point per event at its zone center, binned on the grid."""
+    rows, columns = spec['rows'], spec['columns']
+    centers = get_zone_centers(rows, columns, (PITCH_LENGTH, PITCH_WIDTH))
+    zones = [(zone, count) for zone, count in spec['zones'] if zone in centers]
+    xs = np.array([centers[zone][0] for zone, _ in zones])
+    # Zone centers use y up (Plotly), the mplsoccer pitch y down
+    ys = np.array([PITCH_WIDTH - centers[zone][1] for zone, _ in zones])
+    counts = np.array([count for _, count in zones], dtype=np.int64)
+    df = pd.DataFrame({'x': np.repeat(xs, counts), 'y': np.repeat(ys, counts)})
+    return create_heat_map(df, 'x', 'y', bins=(columns, rows),
+                           title=spec.get('title', ''), endnote=spec.get('endnote', ''))
+
+
+def _pizza_figure(spec: Dict[str, Any]):
+    return create_pizza_plot(spec['labels'], spec['percentiles'], spec.get('title', ''), spec.get('subtitle', ''))
+
+
+def _radar_figure(spec: Dict[str, Any]):
+    return create_mpl_radar_chart(spec['traces'], spec['labels'], title=spec.get('title', ''))
+
+
+# Image kind -> figure builder taking the JSON-compatible render spec
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'heatmap': _heatmap_figure,
+    'pizza': _pizza_figure,
+    'radar': _radar_figure,
+}
+
+# Small specs drawn once per worker at startup
+WARMUP_SPECS: Dict[str, Dict[str, Any]] = {
+    'heatmap': {'rows': 3, 'columns': 3, 'zones': [[0, 1], [4, 2]]},
+    'pizza': {'labels': ['a', 'b', 'c'], 'percentiles': [10, 50, 90]},
+    'radar': {'labels': ['a', 'b', 'c'], 'traces': {'t': {'percentiles': [10, 50, 90]}}},
+}
+
+
+def render_image(kind: str, spec: Dict[str, Any], fmt: str = 'png', dpi: int = 100) -> bytes:
+    """
+    Render a chart to an image.
+
+    Args:
+        kind: Image kind (see RENDERERS)
+        spec: Chart data and options for the kind's builder
+        fmt: Output format (see IMAGE_FORMATS)
+        dpi: Resolution of raster output
+
+    Returns:
+        bytes: Encoded image
+    """
+    fig = RENDERERS[kind](spec)
+    try:
+        buffer = io.BytesIO()
+        # Without a date, identical input renders byte-identical SVG
+        metadata = {'Date': None} if fmt == 'svg' else None
+        fig.savefig(buffer, format=fmt, dpi=dpi, metadata=metadata)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def warm_worker():
+    """Pool initializer: build the pitch and draw every kind once."""
+    get_mpl_pitch()
+    for kind, spec in WARMUP_SPECS.items():
+        render_image(kind, spec)
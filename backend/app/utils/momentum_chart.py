@@ -0,0 +1,76 @@
+"""
+Momentum chart generation using Plotly.
+"""
+import plotly.graph_objects as go
+from typing import Dict, Any
+
+
+def make_momentum_chart_plotly(momentum: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a momentum chart from windowed team series.
+    
+    Home attacking actions per window are drawn as bars above the axis and
+    Away actions below it, with the smoothed net momentum as a line.
+    
+    Args:
+        momentum: Output of timeseries_service.get_momentum
+        
+    Returns:
+        dict: Plotly figure dictionary that can be serialized to JSON
+    """
+    x = momentum['window_start_minutes']
+    teams = momentum['teams']
+    
+    fig = go.Figure()
+    
+    # Colors match the divergent chart
+    colors = {'Home': '#1f77b4', 'Away': '#e377c2'}
+    
+    for team, sign in (('Home', 1), ('Away', -1)):
+        if team not in teams:
+            continue
+        counts = teams[team]['counts']
+        totals = [sum(values) for values in zip(*counts.values())]
+        fig.add_trace(go.Bar(
+            x=x,
+            y=[sign * total for total in totals],
+            name=team,
+            marker=dict(color=colors[team]),
+            customdata=list(zip(counts['shots'], counts['crosses'], counts['transitions'])),
+            hovertemplate=(
+                team + '<br>min %{x}<br>Shots: %{customdata[0]}'
+                '<br>Crosses: %{customdata[1]}<br>Transitions: %{customdata[2]}<extra></extra>'
+            )
+        ))
+    
+    if momentum['net_momentum'] is not None:
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=momentum['net_momentum'],
+            name='Momentum',
+            mode='lines',
+            line=dict(color='white', width=3, shape='spline'),
+            hovertemplate='Momentum<br>min %{x}<br>%{y:.2f}<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        xaxis=dict(
+            title=dict(text='Minute', font=dict(color='white')),
+            showgrid=False,
+            tickfont=dict(color='white')
+        ),
+        yaxis=dict(
+            showgrid=False,
+            zeroline=True,
+            zerolinecolor='white',
+            showticklabels=False
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        barmode='relative',
+        showlegend=False,
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig.to_dict()
@@ -0,0 +1,71 @@
+"""
+Single-flight call coalescing.
+
+When several threads ask for the same computation at once (e.g. every
+viewer of a session refreshing its charts at half time), only the first
+one runs it; the others wait for and share its result or exception.
+Nothing is cached once the call completes: the next request for the key
+starts a new computation.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution.
+
+    Keys must identify the result completely, e.g. a session's version plus
+    every request parameter, so callers only ever share identical results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def run(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identity of the computation
+            fn: Function to call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn (shared by every caller of the same flight)
+
+        Raises:
+            Exception: Whatever fn raised, in every caller of the flight
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        """
+        Get the number of computations currently running.
+
+        Returns:
+            int: Number of distinct keys in flight
+        """
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,105 @@
+"""
+Session ownership in multi-worker mode.
+
+app.cluster runs one process per worker and routes every request for a
+session to the same worker. Each worker learns its index and the worker
+count from the environment. State a worker creates on behalf of a session
+(export jobs, rendered images) lives only in that process, so identifiers
+handed out for it carry the owning worker ("w<index>-<id>"), letting the
+router send follow-up requests (polling a job, fetching an image) back to
+the right process.
+
+In a single process every function here is a no-op: the process owns every
+session and identifiers carry no prefix.
+"""
+import os
+import zlib
+from typing import Optional, Tuple
+
+WORKER_INDEX_ENV = 'EVENT_TAGGER_WORKER_INDEX'
+WORKER_COUNT_ENV = 'EVENT_TAGGER_WORKER_COUNT'
+
+OWNER_PREFIX = 'w'
+OWNER_SEPARATOR = '-'
+
+
+def worker_for_session(session_id: str, n_workers: int) -> int:
+    """
+    Map a session ID to a worker index.
+
+    Uses CRC32 rather than hash() so the mapping is stable across processes
+    and restarts.
+
+    Args:
+        session_id: Session identifier
+        n_workers: Number of workers
+
+    Returns:
+        int: Worker index in [0, n_workers)
+    """
+    return zlib.crc32(session_id.encode("utf-8")) % n_workers
+
+
+def local_worker() -> Optional[Tuple[int, int]]:
+    """
+    Get this process's place in the cluster.
+
+    Returns:
+        Tuple[int, int]: (worker index, worker count), or None when not
+        running as a cluster worker
+    """
+    index = os.environ.get(WORKER_INDEX_ENV)
+    count = os.environ.get(WORKER_COUNT_ENV)
+    if index is None or count is None:
+        return None
+    return int(index), int(count)
+
+
+def owns_session(session_id: str) -> bool:
+    """
+    Check whether requests for a session are routed to this process.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        bool: True if this worker owns the session (always in a single process)
+    """
+    worker = local_worker()
+    if worker is None:
+        return True
+    index, count = worker
+    return worker_for_session(session_id, count) == index
+
+
+def owner_key(key: str) -> str:
+    """
+    Tag an identifier with the worker that holds its state.
+
+    Args:
+        key: Identifier (job ID, image digest)
+
+    Returns:
+        str: "w<index>-<key>" in a cluster worker, else the key unchanged
+    """
+    worker = local_worker()
+    if worker is None:
+        return key
+    return f"{OWNER_PREFIX}{worker[0]}{OWNER_SEPARATOR}{key}"
+
+
+def split_owner_key(key: str) -> Tuple[Optional[int], str]:
+    """
+    Split an identifier into its owning worker and the bare identifier.
+
+    Args:
+        key: Identifier, with or without an owner prefix
+
+    Returns:
+        Tuple[Optional[int], str]: Worker index (None without a prefix) and
+        the bare identifier
+    """
+    prefix, separator, rest = key.partition(OWNER_SEPARATOR)
+    if separator and prefix.startswith(OWNER_PREFIX) and prefix[len(OWNER_PREFIX):].isdecimal():
+        return int(prefix[len(OWNER_PREFIX):]), rest
+    return None, key
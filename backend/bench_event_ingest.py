@@ -0,0 +1,73 @@
+"""Microbenchmark: EventCreate model path vs. the ingestion fast path.
+
+Run from the backend directory:
+    python bench_event_ingest.py
+"""
+import json
+import timeit
+from datetime import datetime
+
+from app.models.event import EventCreate, EventResponse
+from pydantic import TypeAdapter
+
+from app.services.event_service import parse_event_create, _record_adapter
+
+BODY = json.dumps({
+    "minute": 15.0,
+    "second": 30.0,
+    "time_in_second": 930.0,
+    "team": "Home",
+    "event_type": "Transition",
+    "cross_outcome": "Completed",
+    "shot_outcome": "Goal",
+    "zone": 5
+}).encode()
+
+N = 50000
+
+_response_adapter = TypeAdapter(EventResponse)
+
+
+def model_path():
+    """What POST /api/events did before: parse, EventCreate, dict copy, EventResponse, encode."""
+    event_data = EventCreate(**json.loads(BODY))
+    event = {
+        'id': 0,
+        'minute': event_data.minute,
+        'second': event_data.second,
+        'time_in_second': event_data.time_in_second,
+        'team': event_data.team,
+        'event_type': event_data.event_type,
+        'cross_outcome': event_data.cross_outcome,
+        'shot_outcome': event_data.shot_outcome,
+        'zone': event_data.zone,
+        'created_at': datetime.now()
+    }
+    return _response_adapter.dump_json(EventResponse(**event))
+
+
+def fast_path():
+    """POST /api/events now: validate JSON into an EventRecord and encode it."""
+    event, _ = parse_event_create(BODY)
+    event.id = 0
+    return _record_adapter.dump_json(event)
+
+
+def validate_only_model():
+    return EventCreate(**json.loads(BODY))
+
+
+def validate_only_fast():
+    return parse_event_create(BODY)
+
+
+if __name__ == "__main__":
+    assert json.loads(model_path())['zone'] == json.loads(fast_path())['zone'] == 5
+    for name, func in [
+        ("validate: EventCreate", validate_only_model),
+        ("validate: fast path", validate_only_fast),
+        ("ingest:   EventCreate", model_path),
+        ("ingest:   fast path", fast_path),
+    ]:
+        best = min(timeit.repeat(func, number=N, repeat=5))
+        print(f"{name:24s} {best / N * 1e6:6.2f} us/event")
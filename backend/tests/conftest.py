@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the backend tests.
+"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    """API client; the lifespan (journal, pools, queues) is not started."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def session_id():
+    """A fresh session ID, so tests never share state."""
+    return f"test_{uuid.uuid4().hex}"
+
+
+def make_event(time_in_second, team='Home', event_type='Pass', **fields):
+    """EventCreate body for an event at a match time."""
+    return {
+        'minute': time_in_second // 60,
+        'second': time_in_second % 60,
+        'time_in_second': time_in_second,
+        'team': team,
+        'event_type': event_type,
+        **fields
+    }
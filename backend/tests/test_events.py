@@ -0,0 +1,91 @@
+"""
+Tests for the events API: delta sync and keyset paging.
+"""
+import pytest
+
+from app.services.state_manager import get_state_manager
+from tests.conftest import make_event
+
+
+def _tag(client, session_id, time_in_second, **fields):
+    response = client.post('/api/events', json=make_event(time_in_second, **fields), headers={'X-Session-ID': session_id})
+    assert response.status_code == 201
+    return response.json()
+
+
+def _changes(client, session_id, since=0, epoch=None):
+    params = {'since': since}
+    if epoch is not None:
+        params['epoch'] = epoch
+    response = client.get('/api/events/changes', params=params, headers={'X-Session-ID': session_id})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_changes_collapse_create_then_delete(client, session_id):
+    kept = _tag(client, session_id, 10.0)
+    base = _changes(client, session_id)
+
+    removed = _tag(client, session_id, 20.0)
+    added = _tag(client, session_id, 30.0, zone=4)
+    assert client.delete(f"/api/events/{removed['id']}", headers={'X-Session-ID': session_id}).status_code == 204
+
+    delta = _changes(client, session_id, base['cursor'], base['epoch'])
+    assert not delta['reset']
+    assert [e['id'] for e in delta['appended']] == [added['id']]
+    assert delta['deleted'] == []
+    assert delta['hot_zones'] == {'4': 1}
+
+    assert client.delete(f"/api/events/{kept['id']}", headers={'X-Session-ID': session_id}).status_code == 204
+    delta = _changes(client, session_id, delta['cursor'], delta['epoch'])
+    assert delta['appended'] == []
+    assert delta['deleted'] == [kept['id']]
+
+
+def test_changes_reset_when_session_is_recreated(client, session_id):
+    _tag(client, session_id, 10.0)
+    _tag(client, session_id, 20.0)
+    base = _changes(client, session_id)
+
+    # Same as a restart without a journal: the session starts again at version 0
+    get_state_manager().delete_session(session_id)
+    for t in (5.0, 6.0, 7.0):
+        _tag(client, session_id, t)
+
+    delta = _changes(client, session_id, base['cursor'], base['epoch'])
+    assert delta['reset']
+    assert delta['epoch'] != base['epoch']
+    assert [e['time_in_second'] for e in delta['appended']] == [5.0, 6.0, 7.0]
+
+
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_keyset_pages_with_filter(client, session_id, order):
+    for i in range(12):
+        _tag(client, session_id, float(i), team='Home' if i % 3 else 'Away', event_type='Shot' if i % 2 else 'Pass')
+    expected = [
+        e['id'] for e in client.get('/api/events', headers={'X-Session-ID': session_id}).json()
+        if e['team'] == 'Home' and e['event_type'] == 'Shot'
+    ]
+    if order == 'desc':
+        expected.reverse()
+
+    seen, cursor = [], None
+    while True:
+        params = {'limit': 2, 'order': order, 'filter': 'team:Home,event_type:Shot'}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get('/api/events', params=params, headers={'X-Session-ID': session_id})
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(e['id'] for e in page)
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            break
+        # Tagging between pages does not shift the following ones
+        _tag(client, session_id, 100.0, team='Away')
+    assert seen == expected
+
+
+def test_invalid_filter_is_rejected(client, session_id):
+    response = client.get('/api/events', params={'filter': 'colour:red'}, headers={'X-Session-ID': session_id})
+    assert response.status_code == 400
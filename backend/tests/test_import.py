@@ -0,0 +1,64 @@
+"""
+Tests for import validation (import_service).
+"""
+import io
+
+import pandas as pd
+import pytest
+
+from app.services.import_service import parse_csv, parse_xml, validate_events
+
+
+def test_validate_events_reports_invalid_rows():
+    df = pd.DataFrame({
+        'time_in_second': [10.0, -1.0, 30.0, 40.0],
+        'team': ['Home', 'Home', 'Nobody', 'Away'],
+        'event_type': ['Pass', 'Pass', 'Pass', ''],
+    })
+    with pytest.raises(ValueError) as error:
+        validate_events(df, first_row=2)
+    message = str(error.value)
+    assert 'row 3: time_in_second must be a number between 0 and' in message
+    assert 'row 4: team must be one of' in message
+    assert 'row 5: event_type is required' in message
+    assert 'row 2' not in message
+
+
+def test_validate_events_applies_event_time_bounds():
+    df = pd.DataFrame({'time_in_second': [1e12], 'team': ['Home'], 'event_type': ['Pass']})
+    with pytest.raises(ValueError, match='row 1: time_in_second must be a number between 0 and 21600'):
+        validate_events(df)
+
+    df = pd.DataFrame({'minute': [400], 'second': [0], 'time_in_second': [60.0], 'team': ['Home'], 'event_type': ['Pass']})
+    with pytest.raises(ValueError, match='row 1: minute must be a number between 0 and 360'):
+        validate_events(df)
+
+
+def test_validate_events_derives_whole_seconds():
+    df = validate_events(pd.DataFrame({'time_in_second': [59.6, 61.2], 'team': ['Home', 'Away'], 'event_type': ['Pass', 'Shot']}))
+    assert df['minute'].tolist() == [0.0, 1.0]
+    assert df['second'].tolist() == [59.0, 1.0]
+
+
+def test_csv_rows_numbered_from_the_file_line():
+    csv = "time_in_second,team,event_type\n10,Home,Pass\n20,Home,Pass\n30,Home,\n"
+    with pytest.raises(ValueError, match=r'row 4: event_type is required'):
+        parse_csv(io.StringIO(csv))
+
+
+def test_csv_keeps_period():
+    csv = "time_in_second,team,event_type,period\n10,Home,Pass,1H\n2800,Away,Shot,2H\n"
+    assert parse_csv(io.StringIO(csv))['period'].tolist() == ['1H', '2H']
+
+    with pytest.raises(ValueError, match='period must be one of'):
+        parse_csv(io.StringIO("time_in_second,team,event_type,period\n10,Home,Pass,3H\n"))
+
+
+def test_xml_fractional_time_imports():
+    xml = (
+        b"<file><ALL_INSTANCES><instance><ID>1</ID><start>39.6</start><end>79.6</end>"
+        b"<code>Pass</code><label><group>Team</group><text>Home</text></label></instance>"
+        b"</ALL_INSTANCES></file>"
+    )
+    df = parse_xml(io.BytesIO(xml))
+    assert df[['minute', 'second']].values.tolist() == [[0.0, 59.0]]
@@ -0,0 +1,152 @@
+"""
+Tests for journal recovery (journal_service).
+"""
+import json
+import time
+
+import pytest
+
+from app.models.records import EventRecord
+from app.services.journal_service import JOURNAL_SUFFIX, SNAPSHOT_SUFFIX, Journal
+from app.services.state_manager import StateManager
+
+SESSION_ID = 'match'
+
+
+def _event(time_in_second):
+    return EventRecord.create(time_in_second // 60, time_in_second % 60, time_in_second, 'Home', 'Pass', zone=1)
+
+
+@pytest.fixture
+def journaled(tmp_path):
+    """A state manager journaled into tmp_path; the journal is closed after the test."""
+    state_manager = StateManager()
+    journal = Journal(str(tmp_path), snapshot_interval=10_000)
+    journal.attach(state_manager)
+    yield state_manager, journal
+    journal.close()
+
+
+def _recover(directory):
+    state_manager = StateManager()
+    journal = Journal(str(directory))
+    try:
+        journal.recover(state_manager)
+    finally:
+        journal.close()
+    return state_manager.get_session(SESSION_ID)
+
+
+def test_recover_replays_journal(tmp_path, journaled):
+    state_manager, journal = journaled
+    session = state_manager.get_or_create_session(SESSION_ID)
+    with session.lock:
+        session.add_events([_event(t) for t in (30.0, 10.0, 20.0)])
+        session.remove_event(1)
+    journal.close()
+
+    recovered = _recover(tmp_path)
+    assert [e.id for e in recovered.events] == [2, 0]
+    assert recovered.hot_zones[1] == 2
+    assert recovered.version == session.version
+
+
+def test_recover_skips_records_covered_by_snapshot(tmp_path, journaled):
+    # A crash between writing the snapshot and truncating the journal leaves
+    # records the snapshot already covers; they must not be applied twice
+    state_manager, journal = journaled
+    session = state_manager.get_or_create_session(SESSION_ID)
+    with session.lock:
+        session.add_event(_event(10.0))
+        session.add_event(_event(20.0))
+        session.remove_event(0)
+        session.stopwatch.start(time.monotonic())
+        session.record_stopwatch()
+    journal.flush()
+
+    journal_path = tmp_path / f"{SESSION_ID}{JOURNAL_SUFFIX}"
+    covered = journal_path.read_bytes()
+    journal._snapshot(SESSION_ID)
+    assert (tmp_path / f"{SESSION_ID}{SNAPSHOT_SUFFIX}").exists()
+    assert journal_path.read_bytes() == b''
+
+    with session.lock:
+        session.stopwatch.stop(time.monotonic())
+        session.record_stopwatch()
+        session.add_event(_event(30.0))
+    journal.close()
+    journal_path.write_bytes(covered + journal_path.read_bytes())
+
+    recovered = _recover(tmp_path)
+    assert [e.id for e in recovered.events] == [1, 2]
+    assert recovered.version == session.version
+    assert recovered.next_event_id == session.next_event_id
+    assert recovered.epoch == session.epoch
+    # The stop journaled after the snapshot is applied on top of it
+    assert not recovered.stopwatch.running
+
+
+def test_recover_skips_covered_stopwatch_records(tmp_path, journaled):
+    # Stopwatch records do not bump the version; they are matched to the
+    # snapshot by sequence number, so a covered start cannot undo a stop
+    state_manager, journal = journaled
+    session = state_manager.get_or_create_session(SESSION_ID)
+    with session.lock:
+        session.stopwatch.start(time.monotonic())
+        session.record_stopwatch()
+    journal.flush()
+    journal_path = tmp_path / f"{SESSION_ID}{JOURNAL_SUFFIX}"
+    started = journal_path.read_bytes()
+
+    with session.lock:
+        session.stopwatch.stop(time.monotonic())
+        session.record_stopwatch()
+    journal.flush()
+    journal._snapshot(SESSION_ID)
+    journal.close()
+    journal_path.write_bytes(started)
+
+    recovered = _recover(tmp_path)
+    assert not recovered.stopwatch.running
+    assert recovered.stopwatch.to_dict() == session.stopwatch.to_dict()
+
+
+def test_recover_ignores_torn_tail(tmp_path, journaled):
+    state_manager, journal = journaled
+    session = state_manager.get_or_create_session(SESSION_ID)
+    with session.lock:
+        session.add_event(_event(10.0))
+        session.add_event(_event(20.0))
+    journal.close()
+
+    journal_path = tmp_path / f"{SESSION_ID}{JOURNAL_SUFFIX}"
+    record = json.dumps({'op': 'create', 'v': 3, 's': 3, 'event': _event(30.0).to_dict()}, default=str)
+    with open(journal_path, 'ab') as f:
+        f.write(record[:len(record) // 2].encode('utf-8'))
+
+    recovered = _recover(tmp_path)
+    assert [e.id for e in recovered.events] == [0, 1]
+    assert recovered.version == 2
+
+
+def test_recover_continues_versions_and_ids(tmp_path, journaled):
+    state_manager, journal = journaled
+    session = state_manager.get_or_create_session(SESSION_ID)
+    with session.lock:
+        for t in (10.0, 20.0, 30.0):
+            session.add_event(_event(t))
+        # The highest ID is deleted, so it is not in the recovered events
+        session.remove_event(2)
+    journal.flush()
+    journal._snapshot(SESSION_ID)
+    with session.lock:
+        session.add_event(_event(40.0))
+    journal.close()
+
+    recovered = _recover(tmp_path)
+    assert recovered.version == session.version
+    assert recovered.next_event_id == session.next_event_id
+    with recovered.lock:
+        event = recovered.add_event(_event(50.0))
+    assert event.id == session.next_event_id
+    assert recovered.version == session.version + 1
@@ -0,0 +1,27 @@
+"""
+Tests for the momentum time series (timeseries_service).
+"""
+from app.models.records import EventRecord
+from app.services.event_service import get_event_stats
+from app.services.state_manager import get_state_manager
+from app.services.timeseries_service import METRICS, get_momentum_buckets
+
+
+def test_momentum_counts_match_team_stats(session_id):
+    session_state = get_state_manager().get_or_create_session(session_id)
+    with session_state.lock:
+        session_state.add_events([
+            # Tagged from hand control: null outcomes
+            EventRecord.create(0, 10, 10, 'Home', 'Transition'),
+            EventRecord.create(1, 0, 60, 'Home', 'Pass', 'None', 'None'),
+            EventRecord.create(2, 0, 120, 'Away', 'Transition', 'Completed', 'Goal'),
+            EventRecord.create(3, 0, 180, 'Away', 'Cross', 'Blocked', None),
+        ])
+        buckets = get_momentum_buckets(session_state)
+        totals = {team: buckets.counts[row].sum(axis=-1) for team, row in buckets.teams.items()}
+
+    for stats in get_event_stats(session_id):
+        counted = dict(zip(METRICS, totals[stats.team].tolist()))
+        assert counted['shots'] == stats.shots
+        assert counted['crosses'] == stats.cross_attempts
+        assert counted['transitions'] == stats.transitions
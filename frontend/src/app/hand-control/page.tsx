@@ -17,7 +17,7 @@ export default function HandControlPage({
   const sessionId = typeof window !== 'undefined' ? getSessionId() : 'default';
   const { events, addEvent, removeEvent, fetchEvents } = useEvents(sessionId);
   const stopwatchHook = useStopwatch(sessionId);
-  const { running, elapsedTime } = stopwatchHook;
+  const { running } = stopwatchHook;
   const [tags, setTags] = useState<string[]>(['Transition', 'Corner', 'Dead-ball', 'Slow-attack', 'Penalty']);
   const [tagInput, setTagInput] = useState('');
   const [team, setTeam] = useState<'Home' | 'Away'>('Home');
@@ -78,13 +78,9 @@ export default function HandControlPage({
       return;
     }
 
-    const minute = Math.floor(elapsedTime / 60);
-    const second = Math.floor(elapsedTime % 60);  // Ensure second is integer and < 60
-
+    // No time sent: the server stamps the event from its stopwatch, so tags
+    // from every device on the session share one clock
     const eventData: EventCreate = {
-      minute,
-      second,
-      time_in_second: elapsedTime,
       team,
       event_type: tag,
       cross_outcome: null,
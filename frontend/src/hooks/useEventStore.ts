@@ -20,15 +20,16 @@ export function useEvents() {
   const eventsError = useEventStore((state) => state.eventsError);
   const statsError = useEventStore((state) => state.statsError);
   const fetchEvents = useEventStore((state) => state.fetchEvents);
+  const loadSession = useEventStore((state) => state.loadSession);
   const addEvent = useEventStore((state) => state.addEvent);
   const removeEvent = useEventStore((state) => state.removeEvent);
   const fetchStats = useEventStore((state) => state.fetchStats);
   const clearEvents = useEventStore((state) => state.clearEvents);
 
-  // Fetch events on mount
+  // Fetch events, stats and hot zones on mount (one request)
   useEffect(() => {
-    fetchEvents();
-  }, [fetchEvents]);
+    loadSession(['events', 'stats', 'hot_zones']);
+  }, [loadSession]);
 
   return {
     events,
@@ -39,6 +40,7 @@ export function useEvents() {
     eventsError,
     statsError,
     fetchEvents,
+    loadSession,
     addEvent,
     removeEvent,
     fetchStats,
@@ -1,5 +1,15 @@
-import { useState, useEffect, useCallback } from 'react';
-import { createEvent, getEvents, deleteEvent, getEventStats, EventResponse, EventCreate, EventStats } from '@/lib/api';
+import { useState, useEffect, useCallback, useRef } from 'react';
+import {
+  createEvent,
+  getEventChanges,
+  applyEventDelta,
+  mergeEvents,
+  deleteEvent,
+  getEventStats,
+  EventResponse,
+  EventCreate,
+  EventStats,
+} from '@/lib/api';
 
 export function useEvents(sessionId?: string) {
   const [events, setEvents] = useState<EventResponse[]>([]);
@@ -7,13 +17,21 @@ export function useEvents(sessionId?: string) {
   const [error, setError] = useState<Error | null>(null);
   const [stats, setStats] = useState<EventStats[] | null>(null);
   const [statsLoading, setStatsLoading] = useState(false);
+  // Change log version the events reflect (0 loads everything), and the
+  // session epoch it belongs to
+  const cursorRef = useRef(0);
+  const epochRef = useRef<string | null>(null);
 
   const fetchEvents = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const data = await getEvents(sessionId);
-      setEvents(data || []);
+      // Only the events appended and deleted since the last refresh
+      const delta = await getEventChanges(cursorRef.current, epochRef.current, sessionId);
+      cursorRef.current = delta.cursor;
+      epochRef.current = delta.epoch;
+      setEvents((prev) => applyEventDelta(prev, delta));
+      if (delta.stats) setStats(delta.stats);
     } catch (err) {
       const error = err instanceof Error ? err : new Error('Failed to fetch events');
       setError(error);
@@ -27,7 +45,7 @@ export function useEvents(sessionId?: string) {
     try {
       setError(null);
       const newEvent = await createEvent(eventData, sessionId);
-      setEvents((prev) => [...prev, newEvent]);
+      setEvents((prev) => mergeEvents(prev, [newEvent]));
       // Invalidate stats cache when new event is added
       setStats(null);
       return newEvent;
@@ -70,6 +88,8 @@ export function useEvents(sessionId?: string) {
 
   // Fetch events on mount or when sessionId changes
   useEffect(() => {
+    cursorRef.current = 0;
+    epochRef.current = null;
     setEvents([]);
     setStats(null);
     fetchEvents();
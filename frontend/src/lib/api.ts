@@ -9,15 +9,18 @@
 // Types
 // ============================================================================
 
+// Omit minute, second and time_in_second to have the server stamp the event
+// from the session stopwatch; latency_ms is subtracted from that timestamp.
 export interface EventCreate {
-  minute: number;
-  second: number;
-  time_in_second: number;
+  minute?: number;
+  second?: number;
+  time_in_second?: number;
   team: 'Home' | 'Away';
   event_type: string;
   cross_outcome?: 'None' | 'Completed' | 'Blocked' | 'Intercepted' | 'Saved' | null;
   shot_outcome?: 'None' | 'Goal' | 'Post' | 'Blocked' | 'Out' | 'Saved' | null;
   zone?: number | null;
+  latency_ms?: number;
 }
 
 export interface EventResponse {
@@ -30,6 +33,7 @@ export interface EventResponse {
   cross_outcome: string | null;
   shot_outcome: string | null;
   zone: number | null;
+  period: Period | null;
   created_at: string;
 }
 
@@ -43,10 +47,25 @@ export interface EventStats {
   transitions: number;
 }
 
+export interface EventDelta {
+  cursor: number;
+  epoch: string;
+  reset: boolean;
+  appended: EventResponse[];
+  deleted: number[];
+  stats: EventStats[] | null;
+  hot_zones: Record<string, number> | null;
+}
+
+export type Period = '1H' | '2H' | 'ET1' | 'ET2';
+
 export interface StopwatchStatus {
   running: boolean;
   elapsed_time: number;
   start_time: string | null;
+  period: Period | null;
+  period_elapsed: number;
+  stoppage_time: number;
 }
 
 export interface PitchData {
@@ -58,7 +77,24 @@ export interface PitchData {
   field_dimen: number[];
 }
 
-export interface HeatmapOptions {
+export interface TimeWindowOptions {
+  start_time?: number; // seconds, inclusive
+  end_time?: number; // seconds, exclusive
+  last_seconds?: number; // window ending at the current match time
+}
+
+// Filter on indexed event fields: each listed field must hold one of its
+// values (null for a missing value). The string form is passed through,
+// e.g. 'team:Home,-shot_outcome:None|null' ('-' excludes).
+export type EventFilterField = 'team' | 'event_type' | 'cross_outcome' | 'shot_outcome' | 'zone' | 'period';
+export type EventFilterValue = string | number | null;
+export type EventFilter = string | Partial<Record<EventFilterField, EventFilterValue | EventFilterValue[]>>;
+
+export interface EventQueryOptions extends TimeWindowOptions {
+  filter?: EventFilter;
+}
+
+export interface HeatmapOptions extends EventQueryOptions {
   rows?: number;
   columns?: number;
   field_length?: number;
@@ -66,6 +102,22 @@ export interface HeatmapOptions {
   event_type?: string | null;
 }
 
+// Compact pitch view (GET /api/visualization/pitch?mode=data). Arrays are
+// indexed by zone number; stats has one row of stat_fields values per team.
+export interface PitchSummary {
+  version: number;
+  rows: number;
+  columns: number;
+  field_dimen: number[];
+  zone_x: number[];
+  zone_y: number[];
+  counts: number[];
+  percentages: number[];
+  teams: string[];
+  stat_fields: string[];
+  stats: number[][];
+}
+
 export interface PitchDataOptions {
   rows?: number;
   columns?: number;
@@ -91,6 +143,29 @@ function getHeaders(sessionId?: string): HeadersInit {
   return headers;
 }
 
+function appendTimeWindow(params: URLSearchParams, window: TimeWindowOptions): void {
+  if (window.start_time !== undefined) params.append('start_time', window.start_time.toString());
+  if (window.end_time !== undefined) params.append('end_time', window.end_time.toString());
+  if (window.last_seconds !== undefined) params.append('last_seconds', window.last_seconds.toString());
+}
+
+function encodeEventFilter(filter: EventFilter): string {
+  if (typeof filter === 'string') return filter;
+  return Object.entries(filter)
+    .filter(([, values]) => values !== undefined)
+    .map(([field, values]) => {
+      const list = Array.isArray(values) ? values : [values];
+      return `${field}:${list.map((value) => (value === null ? 'null' : String(value))).join('|')}`;
+    })
+    .join(',');
+}
+
+function appendEventQuery(params: URLSearchParams, options: EventQueryOptions): void {
+  appendTimeWindow(params, options);
+  const filter = options.filter !== undefined ? encodeEventFilter(options.filter) : '';
+  if (filter) params.append('filter', filter);
+}
+
 async function handleResponse<T>(response: Response): Promise<T> {
   if (!response.ok) {
     const errorText = await response.text();
@@ -139,15 +214,86 @@ export async function createEvent(
   return handleResponse<EventResponse>(response);
 }
 
-export async function getEvents(sessionId?: string): Promise<EventResponse[]> {
+export async function getEvents(
+  sessionId?: string,
+  window: EventQueryOptions = {}
+): Promise<EventResponse[]> {
   const sid = sessionId || getSessionId();
-  const response = await fetch(`${API_BASE_URL}/api/events`, {
+  const params = new URLSearchParams();
+  appendEventQuery(params, window);
+  const response = await fetch(`${API_BASE_URL}/api/events?${params.toString()}`, {
     method: 'GET',
     headers: getHeaders(sid),
   });
   return handleResponse<EventResponse[]>(response);
 }
 
+export interface EventPageOptions extends EventQueryOptions {
+  limit?: number;
+  cursor?: string;
+  order?: 'asc' | 'desc';
+  fields?: (keyof EventResponse)[];
+}
+
+export async function getEventsPage(
+  options: EventPageOptions,
+  sessionId?: string
+): Promise<{ events: Partial<EventResponse>[]; nextCursor: string | null }> {
+  const sid = sessionId || getSessionId();
+  const params = new URLSearchParams();
+  appendEventQuery(params, options);
+  if (options.limit !== undefined) params.append('limit', options.limit.toString());
+  if (options.cursor) params.append('cursor', options.cursor);
+  if (options.order) params.append('order', options.order);
+  if (options.fields?.length) params.append('fields', options.fields.join(','));
+  const response = await fetch(`${API_BASE_URL}/api/events?${params.toString()}`, {
+    method: 'GET',
+    headers: getHeaders(sid),
+  });
+  const events = await handleResponse<Partial<EventResponse>[]>(response);
+  // Absent on the last page
+  return { events, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
+export async function getEventChanges(
+  since: number,
+  epoch: string | null,
+  sessionId?: string
+): Promise<EventDelta> {
+  // The epoch ties the cursor to one server-side version sequence; after a
+  // server restart it no longer matches and the delta is a full reset
+  const sid = sessionId || getSessionId();
+  const params = new URLSearchParams({ since: since.toString() });
+  if (epoch) params.append('epoch', epoch);
+  const response = await fetch(`${API_BASE_URL}/api/events/changes?${params}`, {
+    method: 'GET',
+    headers: getHeaders(sid),
+    cache: 'no-store',
+  });
+  return handleResponse<EventDelta>(response);
+}
+
+// Server order: match time, ties by event ID
+function compareEvents(a: EventResponse, b: EventResponse): number {
+  return a.time_in_second - b.time_in_second || a.id - b.id;
+}
+
+// Add events to a time-sorted list, skipping ones already present
+export function mergeEvents(events: EventResponse[], added: EventResponse[]): EventResponse[] {
+  const known = new Set(events.map((e) => e.id));
+  const fresh = added.filter((e) => !known.has(e.id));
+  if (fresh.length === 0) return events;
+  return [...events, ...fresh].sort(compareEvents);
+}
+
+// Apply a delta from getEventChanges to the time-sorted event list
+export function applyEventDelta(events: EventResponse[], delta: EventDelta): EventResponse[] {
+  if (delta.reset) return [...delta.appended].sort(compareEvents);
+  const deleted = new Set(delta.deleted);
+  const kept = deleted.size ? events.filter((e) => !deleted.has(e.id)) : events;
+  return mergeEvents(kept, delta.appended);
+}
+
 export async function deleteEvent(
   eventId: number,
   sessionId?: string
@@ -160,9 +306,14 @@ export async function deleteEvent(
   return handleResponse<void>(response);
 }
 
-export async function getEventStats(sessionId?: string): Promise<EventStats[]> {
+export async function getEventStats(
+  sessionId?: string,
+  window: EventQueryOptions = {}
+): Promise<EventStats[]> {
   const sid = sessionId || getSessionId();
-  const response = await fetch(`${API_BASE_URL}/api/events/stats`, {
+  const params = new URLSearchParams();
+  appendEventQuery(params, window);
+  const response = await fetch(`${API_BASE_URL}/api/events/stats?${params.toString()}`, {
     method: 'GET',
     headers: getHeaders(sid),
   });
@@ -182,9 +333,10 @@ export async function clearAllEvents(sessionId?: string): Promise<void> {
 // Stopwatch API
 // ============================================================================
 
-export async function startStopwatch(sessionId?: string): Promise<StopwatchStatus> {
+export async function startStopwatch(sessionId?: string, period?: Period): Promise<StopwatchStatus> {
   const sid = sessionId || getSessionId();
-  const response = await fetch(`${API_BASE_URL}/api/stopwatch/start`, {
+  const query = period ? `?period=${period}` : '';
+  const response = await fetch(`${API_BASE_URL}/api/stopwatch/start${query}`, {
     method: 'POST',
     headers: getHeaders(sid),
   });
@@ -245,6 +397,7 @@ export async function getHeatmap(
   if (options.field_length !== undefined) params.append('field_length', options.field_length.toString());
   if (options.field_width !== undefined) params.append('field_width', options.field_width.toString());
   if (options.event_type) params.append('event_type', options.event_type);
+  appendEventQuery(params, options);
   
   const response = await fetch(`${API_BASE_URL}/api/visualization/heatmap?${params.toString()}`, {
     method: 'POST',
@@ -272,6 +425,70 @@ export async function getPitchData(
   return handleResponse<PitchData>(response);
 }
 
+function pitchParams(options: PitchDataOptions): URLSearchParams {
+  const params = new URLSearchParams();
+  if (options.rows !== undefined) params.append('rows', options.rows.toString());
+  if (options.columns !== undefined) params.append('columns', options.columns.toString());
+  if (options.field_length !== undefined) params.append('field_length', options.field_length.toString());
+  if (options.field_width !== undefined) params.append('field_width', options.field_width.toString());
+  return params;
+}
+
+export async function getPitchSummary(
+  options: PitchDataOptions,
+  sessionId?: string
+): Promise<PitchSummary> {
+  const sid = sessionId || getSessionId();
+  const params = pitchParams(options);
+  params.append('mode', 'data');
+
+  const response = await fetch(`${API_BASE_URL}/api/visualization/pitch?${params.toString()}`, {
+    method: 'GET',
+    headers: getHeaders(sid),
+  });
+  return handleResponse<PitchSummary>(response);
+}
+
+// Empty pitch figure for a grid; session-independent and cached by the browser
+export async function getPitchTemplate(options: PitchDataOptions): Promise<any> {
+  const response = await fetch(`${API_BASE_URL}/api/visualization/pitch-template?${pitchParams(options).toString()}`, {
+    method: 'GET',
+    cache: 'force-cache',
+  });
+  return handleResponse<any>(response);
+}
+
+// ============================================================================
+// Session State API
+// ============================================================================
+
+export type SessionField = 'events' | 'stats' | 'stopwatch' | 'hot_zones';
+
+export interface SessionOverview {
+  session_id: string;
+  version: number;
+  epoch: string | null;
+  events?: EventResponse[];
+  stats?: EventStats[];
+  stopwatch?: StopwatchStatus;
+  hot_zones?: Record<string, number>;
+}
+
+export async function getSessionState(
+  fields: SessionField[] = [],
+  sessionId?: string
+): Promise<SessionOverview> {
+  // Events, stats, stopwatch and hot zones in one round trip (all if no fields)
+  const sid = sessionId || getSessionId();
+  const params = fields.length ? `?fields=${fields.join(',')}` : '';
+  const response = await fetch(`${API_BASE_URL}/api/sessions/state${params}`, {
+    method: 'GET',
+    headers: getHeaders(sid),
+    cache: 'no-store',
+  });
+  return handleResponse<SessionOverview>(response);
+}
+
 // ============================================================================
 // Export API
 // ============================================================================
@@ -343,3 +560,107 @@ export async function exportZIP(
     sid
   );
 }
+
+export async function exportArrow(
+  filename?: string,
+  sessionId?: string
+): Promise<void> {
+  const sid = sessionId || getSessionId();
+  const params = filename ? `?filename=${encodeURIComponent(filename)}` : '';
+  await downloadFile(
+    `${API_BASE_URL}/api/export/arrow${params}`,
+    filename || 'events.arrow',
+    sid
+  );
+}
+
+export async function exportParquet(
+  filename?: string,
+  sessionId?: string
+): Promise<void> {
+  const sid = sessionId || getSessionId();
+  const params = filename ? `?filename=${encodeURIComponent(filename)}` : '';
+  await downloadFile(
+    `${API_BASE_URL}/api/export/parquet${params}`,
+    filename || 'events.parquet',
+    sid
+  );
+}
+
+export type ExportFormat = 'csv' | 'xml' | 'zip' | 'parquet';
+
+export interface ExportJobStatus {
+  job_id: string;
+  state: 'queued' | 'running' | 'done' | 'failed' | 'cancelled';
+  format: ExportFormat;
+  session_ids: string[];
+  sessions_done: number;
+  progress: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  expires_at: string | null;
+  size: number | null;
+  filename: string;
+  error: string | null;
+  download_url: string | null;
+}
+
+export async function submitExportJob(
+  format: ExportFormat,
+  options: { sessionIds?: string[]; filename?: string } = {},
+  sessionId?: string
+): Promise<ExportJobStatus> {
+  const sid = sessionId || getSessionId();
+  const response = await fetch(`${API_BASE_URL}/api/export/jobs`, {
+    method: 'POST',
+    headers: getHeaders(sid),
+    body: JSON.stringify({
+      format,
+      session_ids: options.sessionIds,
+      filename: options.filename,
+    }),
+  });
+  return handleResponse<ExportJobStatus>(response);
+}
+
+export async function getExportJob(jobId: string): Promise<ExportJobStatus> {
+  const response = await fetch(`${API_BASE_URL}/api/export/jobs/${jobId}`);
+  return handleResponse<ExportJobStatus>(response);
+}
+
+export function getExportJobDownloadUrl(job: ExportJobStatus): string | null {
+  // Plain GET link: the browser downloads (and resumes) it natively
+  return job.download_url ? `${API_BASE_URL}${job.download_url}` : null;
+}
+
+// ============================================================================
+// Import API
+// ============================================================================
+
+export interface ImportResult {
+  session_id: string;
+  imported: number;
+  replaced: boolean;
+}
+
+export async function importEvents(
+  file: File,
+  format: 'csv' | 'xml',
+  options: { replace?: boolean; team?: 'Home' | 'Away' } = {},
+  sessionId?: string
+): Promise<ImportResult> {
+  const sid = sessionId || getSessionId();
+  const params = new URLSearchParams();
+  if (options.replace) params.append('replace', 'true');
+  if (options.team) params.append('team', options.team);
+  const body = new FormData();
+  body.append('file', file);
+  // No Content-Type header: the browser sets the multipart boundary
+  const response = await fetch(`${API_BASE_URL}/api/import/${format}?${params.toString()}`, {
+    method: 'POST',
+    headers: { 'X-Session-ID': sid },
+    body,
+  });
+  return handleResponse<ImportResult>(response);
+}
@@ -17,23 +17,41 @@ import {
   EventStats,
   StopwatchStatus,
   createEvent,
-  getEvents,
+  getEventChanges,
+  applyEventDelta,
+  mergeEvents,
   deleteEvent,
   getEventStats,
   startStopwatch,
   stopStopwatch,
   getStopwatchStatus,
   getElapsedTime,
-  getPitchData,
-  PitchData,
+  getPitchSummary,
+  PitchSummary,
   getSessionId,
+  getSessionState,
+  SessionField,
 } from '@/lib/api';
 
+// Stopwatch polling ticks (500 ms) between event syncs
+const SYNC_EVERY_TICKS = 4;
+
+// Zone number -> count for zones with events, from a PitchSummary counts array
+function countsToHotZones(counts: number[]): Record<string, number> {
+  const hotZones: Record<string, number> = {};
+  counts.forEach((count, zone) => {
+    if (count > 0) hotZones[zone.toString()] = count;
+  });
+  return hotZones;
+}
+
 interface EventState {
   // Events
   events: EventResponse[];
   stats: EventStats[] | null;
   hotZones: Record<string, number>;
+  eventsCursor: number;
+  eventsEpoch: string | null;
   
   // Loading states
   eventsLoading: boolean;
@@ -44,7 +62,9 @@ interface EventState {
   statsError: Error | null;
   
   // Actions
+  loadSession: (fields?: SessionField[]) => Promise<void>;
   fetchEvents: () => Promise<void>;
+  syncEvents: () => Promise<void>;
   addEvent: (event: EventCreate) => Promise<EventResponse>;
   removeEvent: (eventId: number) => Promise<void>;
   fetchStats: () => Promise<void>;
@@ -75,7 +95,7 @@ interface StopwatchState {
 
 interface PitchState {
   // Pitch configuration
-  pitchData: PitchData | null;
+  pitchData: PitchSummary | null;
   rows: number;
   columns: number;
   fieldLength: number;
@@ -130,6 +150,8 @@ export const useEventStore = create<AppState>()(
           set({
             sessionId: newId,
             events: [],
+            eventsCursor: 0,
+            eventsEpoch: null,
             stats: null,
             hotZones: {},
             running: false,
@@ -146,22 +168,56 @@ export const useEventStore = create<AppState>()(
         events: [],
         stats: null,
         hotZones: {},
+        eventsCursor: 0,
+        eventsEpoch: null,
         eventsLoading: false,
         statsLoading: false,
         eventsError: null,
         statsError: null,
 
+        loadSession: async (fields = []) => {
+          // One request for events, stats, stopwatch and hot zones
+          try {
+            const overview = await getSessionState(fields, get().sessionId);
+            set((state) => ({
+              events: overview.events ?? state.events,
+              stats: overview.stats ?? state.stats,
+              hotZones: overview.hot_zones ?? state.hotZones,
+              eventsCursor: overview.events ? overview.version : state.eventsCursor,
+              eventsEpoch: overview.events ? overview.epoch : state.eventsEpoch,
+              eventsError: null,
+            }));
+            if (overview.stopwatch) {
+              set({
+                running: overview.stopwatch.running,
+                elapsedTime: overview.stopwatch.elapsed_time,
+                startTime: overview.stopwatch.start_time || null,
+              });
+              if (overview.stopwatch.running) {
+                get()._startPolling();
+              } else {
+                get()._stopPolling();
+              }
+            }
+          } catch (error) {
+            const err = error instanceof Error ? error : new Error('Failed to load session');
+            set({ eventsError: err });
+            console.error('Failed to load session:', err);
+          }
+        },
+
         fetchEvents: async () => {
           set({ eventsLoading: true, eventsError: null });
           try {
-            const events = await getEvents(get().sessionId);
-            set({ events, eventsLoading: false });
-            
-            // Update hot zones from pitch data if available
-            const pitchData = get().pitchData;
-            if (pitchData && pitchData.hot_zone) {
-              set({ hotZones: pitchData.hot_zone });
-            }
+            // Full reload; the version resets the delta cursor to match it
+            const overview = await getSessionState(['events', 'hot_zones'], get().sessionId);
+            set((state) => ({
+              events: overview.events ?? [],
+              hotZones: overview.hot_zones ?? state.hotZones,
+              eventsCursor: overview.version,
+              eventsEpoch: overview.epoch,
+              eventsLoading: false,
+            }));
           } catch (error) {
             const err = error instanceof Error ? error : new Error('Failed to fetch events');
             set({ eventsError: err, eventsLoading: false });
@@ -169,17 +225,36 @@ export const useEventStore = create<AppState>()(
           }
         },
 
+        syncEvents: async () => {
+          // Only the events appended and deleted since eventsCursor
+          try {
+            const delta = await getEventChanges(get().eventsCursor, get().eventsEpoch, get().sessionId);
+            set((state) => ({
+              events: applyEventDelta(state.events, delta),
+              stats: delta.stats ?? state.stats,
+              hotZones: delta.hot_zones ?? state.hotZones,
+              eventsCursor: delta.cursor,
+              eventsEpoch: delta.epoch,
+            }));
+          } catch (error) {
+            const err = error instanceof Error ? error : new Error('Failed to sync events');
+            set({ eventsError: err });
+            console.error('Failed to sync events:', err);
+          }
+        },
+
         addEvent: async (event: EventCreate) => {
           try {
             set({ eventsError: null });
             const newEvent = await createEvent(event, get().sessionId);
             set((state) => ({
-              events: [...state.events, newEvent],
+              events: mergeEvents(state.events, [newEvent]),
               stats: null, // Invalidate stats cache
             }));
             
-            // Refresh pitch data to update hot zones
-            await get().fetchPitchData();
+            // Advance the cursor past this event and pick up other taggers'
+            // changes with stats and hot zones, without holding up the tag
+            get().syncEvents();
             
             return newEvent;
           } catch (error) {
@@ -199,8 +274,7 @@ export const useEventStore = create<AppState>()(
               stats: null, // Invalidate stats cache
             }));
             
-            // Refresh pitch data to update hot zones
-            await get().fetchPitchData();
+            get().syncEvents();
           } catch (error) {
             const err = error instanceof Error ? error : new Error('Failed to delete event');
             set({ eventsError: err });
@@ -226,6 +300,8 @@ export const useEventStore = create<AppState>()(
             events: [],
             stats: null,
             hotZones: {},
+            eventsCursor: 0,
+            eventsEpoch: null,
             eventsError: null,
             statsError: null,
           });
@@ -313,6 +389,7 @@ export const useEventStore = create<AppState>()(
         _startPolling: () => {
           get()._stopPolling(); // Clear any existing interval
           
+          let ticks = 0;
           const interval = setInterval(async () => {
             try {
               const response = await getElapsedTime(get().sessionId);
@@ -321,6 +398,11 @@ export const useEventStore = create<AppState>()(
               console.error('Failed to get elapsed time:', error);
               // Don't set error state here to avoid spamming
             }
+            // Pick up events tagged elsewhere while the match runs
+            ticks += 1;
+            if (ticks % SYNC_EVERY_TICKS === 0) {
+              await get().syncEvents();
+            }
           }, 500);
           
           set({ _intervalRef: interval });
@@ -355,7 +437,8 @@ export const useEventStore = create<AppState>()(
           
           set({ pitchLoading: true, pitchError: null });
           try {
-            const pitchData = await getPitchData(
+            // Compact summary only; the pitch itself is drawn client-side
+            const pitchData = await getPitchSummary(
               {
                 rows: config.rows,
                 columns: config.columns,
@@ -371,7 +454,7 @@ export const useEventStore = create<AppState>()(
               columns: config.columns,
               fieldLength: config.field_length,
               fieldWidth: config.field_width,
-              hotZones: pitchData.hot_zone || {},
+              hotZones: countsToHotZones(pitchData.counts),
               pitchLoading: false,
             });
           } catch (error) {